@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.calendar_data import CalendarData
+from src.tithi import tithi_code
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized vs scalar A.D.->B.S. conversion.")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(sys.stderr):
+        data_manager = CalendarData(args.data_dir)
+    arrays, build_time = _timed(data_manager.get_calendar_arrays)
+
+    rng = np.random.default_rng(args.seed)
+    dates = arrays.base_day + rng.integers(0, arrays.span, size=args.count)
+    date_strings = dates.astype(str).tolist()
+
+    def scalar():
+        years, tithis, holidays = [], [], []
+        for date_str in date_strings:
+            data = data_manager.get_data_for_date(date_str)
+            years.append(data['nepali_year'] if data else 0)
+            tithis.append(tithi_code(data['tithi']) if data else 0)
+            holidays.append(bool(data['is_holiday']) if data else False)
+        return years, tithis, holidays
+
+    (years, tithis, holidays), scalar_time = _timed(scalar)
+    result, vector_time = _timed(lambda: arrays.ad_to_bs(dates))
+    assert result["bs_year"].tolist() == years
+    assert result["tithi"].tolist() == tithis
+    assert result["is_holiday"].tolist() == holidays
+
+    bs_result, reverse_time = _timed(lambda: arrays.bs_to_ad(result["bs_year"], result["bs_month"], result["bs_day"]))
+    assert (bs_result["date"][result["valid"]] == dates[result["valid"]]).all()
+
+    print(f"Column build:            {build_time * 1000:8.1f} ms")
+    print(f"Scalar get_data_for_date: {scalar_time * 1000:8.1f} ms ({args.count / scalar_time:,.0f} dates/sec)")
+    print(f"Vectorized ad_to_bs:      {vector_time * 1000:8.1f} ms ({args.count / vector_time:,.0f} dates/sec)")
+    print(f"Vectorized bs_to_ad:      {reverse_time * 1000:8.1f} ms ({args.count / reverse_time:,.0f} dates/sec)")
+    print(f"Speedup (A.D.->B.S.):     {scalar_time / vector_time:8.1f}x")
+
+if __name__ == "__main__":
+    main()
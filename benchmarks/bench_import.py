@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A headless "convert one date" script, run in a fresh interpreter once through the Qt-free core
+# and once through the Qt DataManager. The child reports its own timings and peak RSS.
+SCRIPT = r"""
+import sys, time, json, contextlib
+start = time.perf_counter()
+if sys.argv[1] == "core":
+    from src.calendar_data import CalendarData as Calendar
+else:
+    from src.data_manager import DataManager as Calendar
+imported = time.perf_counter()
+with contextlib.redirect_stdout(sys.stderr):
+    calendar = Calendar(sys.argv[2])
+loaded = time.perf_counter()
+result = calendar.get_data_for_date(sys.argv[3])
+done = time.perf_counter()
+try:
+    import resource
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+except ImportError:
+    rss = None
+print(json.dumps({
+    "import_ms": (imported - start) * 1000, "load_ms": (loaded - imported) * 1000,
+    "total_ms": (done - start) * 1000, "peak_rss_mb": rss, "result": result["nepali_date"] if result else None,
+    "heavy_modules": sorted(name for name in ("PySide6", "bs4", "requests", "numpy") if name in sys.modules),
+}))
+"""
+
+def run_once(variant, data_dir, date_str):
+    output = subprocess.run([sys.executable, "-c", SCRIPT, variant, data_dir, date_str], cwd=ROOT_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+def measure(variant, data_dir, date_str, repeat):
+    runs = [run_once(variant, data_dir, date_str) for _ in range(repeat)]
+    summary = {key: statistics.median(run[key] for run in runs) for key in ("import_ms", "load_ms", "total_ms")}
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    summary["peak_rss_mb"] = statistics.median(rss) if rss else None
+    summary["result"] = runs[0]["result"]
+    summary["heavy_modules"] = runs[0]["heavy_modules"]
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time and peak RSS of a headless one-date conversion: core vs Qt DataManager.")
+    parser.add_argument("--date", default="2024-04-13")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT_DIR, "data"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="Write the result JSON here.")
+    args = parser.parse_args()
+
+    results = {"date": args.date, "repeat": args.repeat}
+    for variant, label in (("core", "src.calendar_data.CalendarData"), ("qt", "src.data_manager.DataManager")):
+        result = results[variant] = measure(variant, args.data_dir, args.date, args.repeat)
+        rss = f"{result['peak_rss_mb']:.1f} MiB" if result["peak_rss_mb"] is not None else "n/a"
+        print(f"{label:32} import {result['import_ms']:7.1f} ms  load {result['load_ms']:7.1f} ms  "
+              f"total {result['total_ms']:7.1f} ms  peak RSS {rss:>10}  imports: {', '.join(result['heavy_modules']) or '-'}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import argparse
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.calendar_data import CalendarData
+from src.tithi import tithi_code
+from src.calendar_index import tithi, weekday, bs_month, bs_years, holiday, has_events
+
+QUERIES = {
+    "Saturday & Purnima in 2080-2090": (weekday("Saturday") & tithi("Purnima") & bs_years(2080, 2090),
+        lambda d: d['weekday'] == "Saturday" and tithi_code(d['tithi']) == 15 and 2080 <= d['nepali_year'] <= 2090),
+    "Holidays on a Monday": (holiday() & weekday("Monday"),
+        lambda d: d['is_holiday'] and d['weekday'] == "Monday"),
+    "Ekadashi with events, not in Shrawan": (tithi("Ekadashi") & has_events() & ~bs_month(4),
+        lambda d: tithi_code(d['tithi']) == 11 and bool(d['events']) and d['nepali_month_index'] != 3),
+    "Working days in Dashain month (Ashwin)": (bs_month(6) & ~holiday() & ~weekday("Saturday"),
+        lambda d: d['nepali_month_index'] == 5 and not d['is_holiday'] and d['weekday'] != "Saturday"),
+    "Aaunsi or Purnima on a holiday": ((tithi("Aaunsi") | tithi("Purnima")) & holiday(),
+        lambda d: tithi_code(d['tithi']) in (15, 30) and d['is_holiday']),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Bitmap index queries vs a full scan.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(sys.stderr):
+        data_manager = CalendarData(args.data_dir)
+    start = time.perf_counter()
+    index = data_manager.get_calendar_index()
+    print(f"Index build: {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    for name, (query, predicate) in QUERIES.items():
+        expected = [d for d in data_manager.sorted_dates if predicate(data_manager.calendar_data[d])]
+        assert index.dates(query) == expected, name
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            index.evaluate(query)
+        evaluate_time = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat // 10 or 1):
+            index.ranges(query)
+        ranges_time = (time.perf_counter() - start) / (args.repeat // 10 or 1)
+
+        start = time.perf_counter()
+        [d for d in data_manager.sorted_dates if predicate(data_manager.calendar_data[d])]
+        scan_time = time.perf_counter() - start
+
+        print(f"{name}: {len(expected)} days in {len(index.ranges(query))} ranges")
+        print(f"    bitmap evaluate {evaluate_time * 1e6:8.1f} us | with ranges {ranges_time * 1e6:8.1f} us | full scan {scan_time * 1e6:10.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.replay_server import add_server_arguments, server_from_arguments
+from src.scraper import CalendarScraper
+from src.sync_retry import AdaptiveThrottle, RetryPolicy, CircuitBreaker
+
+# End-to-end run_sync against the local replay server: a fresh data directory, force resync of
+# the requested B.S. years, then a check that the written files reproduce the source data.
+SCRAPER_ADDED_EVENTS = {"सुभोजितको जन्मदिन"}
+
+def _comparable(data):
+    # Older data files were written while the scraper still de-duplicated events through a set,
+    # so their event order is arbitrary; the scraper also adds an Ashadh 11 event of its own that
+    # not every synced year has.
+    return dict(data, events=sorted(event for event in data['events'] if event not in SCRAPER_ADDED_EVENTS))
+
+def run(args):
+    from src.calendar_data import CalendarData
+    from src.calendar_sync import CalendarSync
+    server = server_from_arguments(args).start()
+    data_dir = tempfile.mkdtemp(prefix="mititithi-sync-")
+    if args.resync:
+        # Start from the current data, so every written year is diffed against its old file.
+        for year in range(args.start_year, args.end_year + 1):
+            path = os.path.join(args.data_dir, f"calendar_{year}.jsonl")
+            if os.path.exists(path):
+                shutil.copy(path, data_dir)
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            calendar = CalendarData(data_dir)
+            sync = CalendarSync(calendar)
+            sync.throttle = AdaptiveThrottle(min_interval=args.min_interval, max_interval=args.max_interval)
+            sync.retry_policy = RetryPolicy(max_attempts=args.max_attempts, base_delay=args.retry_base_delay)
+            sync.circuit_breaker = CircuitBreaker(args.breaker_threshold, args.breaker_reset, args.breaker_max_reset)
+            sync.BULK_SYNC_MIN_YEARS = float("inf") if args.sequential else 1
+            sync.BULK_FETCH_WORKERS = args.fetch_workers
+            sync.BULK_PARSE_WORKERS = args.parse_workers
+            sync.scraper = CalendarScraper(metrics=sync.sync_metrics, base_url=server.url, request_delay=0)
+            start = time.perf_counter()
+            sync.run_sync(args.start_year, args.end_year, True)
+            elapsed = time.perf_counter() - start
+
+        if server.source.calendar_data is None:
+            server.source.load()
+        source_data = server.source.calendar_data
+        expected = {date_str: data for date_str, data in source_data.items()
+                    if args.start_year <= data['nepali_year'] <= args.end_year}
+        missing = [date_str for date_str in expected if date_str not in calendar.calendar_data]
+        mismatched = [date_str for date_str, data in expected.items()
+                      if date_str in calendar.calendar_data and _comparable(calendar.calendar_data[date_str]) != _comparable(data)]
+        metrics = sync.sync_metrics.to_dict()
+        return {
+            "years": [args.start_year, args.end_year],
+            "mode": "sequential" if args.sequential else "pipeline",
+            "elapsed_s": elapsed,
+            "months_per_s": metrics["counters"]["months_fetched"] / elapsed if elapsed else None,
+            "days_expected": len(expected),
+            "days_missing": len(missing),
+            "days_mismatched": len(mismatched),
+            "counters": metrics["counters"],
+            "stages_p50_ms": {name: stats["p50"] * 1000 if stats["p50"] is not None else None
+                              for name, stats in metrics["stages_seconds"].items()},
+            "server": server.stats,
+        }
+    finally:
+        server.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a full run_sync against the local replay server.")
+    parser.add_argument("start_year", type=int, nargs="?", default=2080)
+    parser.add_argument("end_year", type=int, nargs="?")
+    parser.add_argument("--min-interval", type=float, default=0.0, help="Minimum seconds between requests (the app uses 0.5).")
+    parser.add_argument("--max-interval", type=float, default=1.0, help="Cap on the throttle's interval after 429/503s (the app uses 30).")
+    parser.add_argument("--retry-base-delay", type=float, default=0.05, help="First retry backoff in seconds (the app uses 2).")
+    parser.add_argument("--max-attempts", type=int, default=5)
+    parser.add_argument("--breaker-threshold", type=int, default=5, help="Consecutive failures that open the circuit breaker.")
+    parser.add_argument("--breaker-reset", type=float, default=1.0, help="Seconds the open breaker holds requests (the app uses 30).")
+    parser.add_argument("--breaker-max-reset", type=float, default=4.0, help="Cap on the doubled hold after failed probes (the app uses 600).")
+    parser.add_argument("--resync", action="store_true", help="Seed the scratch directory with the current data files first.")
+    parser.add_argument("--sequential", action="store_true", help="Use the one-month-at-a-time sync instead of the bulk pipeline.")
+    parser.add_argument("--fetch-workers", type=int, default=3)
+    parser.add_argument("--parse-workers", type=int, help="Parser processes (default: one per CPU).")
+    parser.add_argument("-o", "--output", help="Write the result JSON here.")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    if args.end_year is None:
+        args.end_year = args.start_year
+
+    os.chdir(ROOT_DIR)
+    result = run(args)
+    print(f"Synced B.S. {args.start_year}-{args.end_year} ({result['mode']}) in {result['elapsed_s']:.2f}s "
+          f"({result['months_per_s']:.1f} months/s)")
+    print(f"Days: {result['days_expected']} expected, {result['days_missing']} missing, {result['days_mismatched']} mismatched, "
+          f"{result['counters']['days_changed']} changed since the previous data")
+    print("Stage p50 (ms): " + ", ".join(f"{name} {value:.2f}" for name, value in result["stages_p50_ms"].items() if value is not None))
+    print(f"Server: {json.dumps(result['server'])}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.calendar_data import CalendarData
+from src.tithi_engine import cross_check, tithi_codes
+
+def main():
+    parser = argparse.ArgumentParser(description="Computed tithi: throughput and agreement with the scraped data.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--days", type=int, default=100000, help="Days per throughput call.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="Write the agreement statistics (with every mismatching date) here.")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(sys.stderr):
+        data_manager = CalendarData(args.data_dir)
+
+    dates = np.datetime64("1900-01-01") + np.arange(args.days)
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        tithi_codes(dates)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"tithi_codes: {args.days} days in {best * 1000:.1f} ms ({args.days / best:,.0f} days/s)")
+
+    start = time.perf_counter()
+    stats = cross_check(data_manager.calendar_data)
+    print(f"cross_check: {stats['days']} days in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+    print(f"Compared {stats['compared']} days with a recognised tithi: {stats['agreed']} agree ({stats['agreement']:.2%}), "
+          f"{stats['adjacent']} off by one tithi, {stats['other']} otherwise different.")
+    by_decade = Counter(date_str[:3] + "0s" for date_str in stats["mismatches"])
+    print("Mismatches by A.D. decade: " + ", ".join(f"{decade} {count}" for decade, count in sorted(by_decade.items())))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+
+if __name__ == "__main__":
+    main()
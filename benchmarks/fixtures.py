@@ -0,0 +1,79 @@
+import os
+import sys
+import html
+import argparse
+import contextlib
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+WEEKDAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+HOLIDAY_COLOR = "#FF4D00"
+
+def _day_cell(data):
+    events = (data['events'] + ["", "", ""])[:3]
+    style = f' style="color:{HOLIDAY_COLOR}"' if data['is_holiday'] and data['weekday'] != "Saturday" else ""
+    gregorian_day = datetime.strptime(data['gregorian_date'], "%Y-%m-%d").day
+    return (f'<td><div class="event_one">{html.escape(events[0])}</div>'
+            f'<div class="date_np"{style}>{data["nepali_day"]}</div>'
+            f'<div class="tithi">{html.escape(data["tithi"])}</div>'
+            f'<div class="rotate_left">{html.escape(events[1])}</div>'
+            f'<div class="rotate_right">{html.escape(events[2])}</div>'
+            f'<div class="date_en">{gregorian_day}</div></td>')
+
+def render_month_html(month_days):
+    # Renders a month page with the same structure CalendarScraper.parse_month reads from
+    # ashesh.com.np, so parsing can be benchmarked and replayed without the network.
+    first, last = month_days[0], month_days[-1]
+    first_greg = datetime.strptime(first['gregorian_date'], "%Y-%m-%d")
+    last_greg = datetime.strptime(last['gregorian_date'], "%Y-%m-%d")
+    rows = []
+    cells = ["<td></td>"] * WEEKDAYS.index(first['weekday'])
+    for data in month_days:
+        cells.append(_day_cell(data))
+        if len(cells) == 7:
+            rows.append("<tr>" + "".join(cells) + "</tr>")
+            cells = []
+    if cells:
+        rows.append("<tr>" + "".join(cells + ["<td></td>"] * (7 - len(cells))) + "</tr>")
+
+    header_rows = ('<tr><th colspan="7">Nepali Calendar</th></tr>'
+                   "<tr>" + "".join(f"<th>{day[:3]}</th>" for day in WEEKDAYS) + "</tr>")
+    return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Nepali Calendar {first['nepali_year']}</title></head><body>"
+            f'<div class="cal_header"><div class="cal_left">{first["nepali_month"]} {first["nepali_year"]}</div>'
+            f'<div class="cal_right">{first_greg.strftime("%b")}/{last_greg.strftime("%b")} {first_greg.year}</div></div>'
+            f'<table id="calendartable">{header_rows}{"".join(rows)}</table></body></html>')
+
+def fixture_path(fixtures_dir, year, month_index):
+    return os.path.join(fixtures_dir, f"{year}_{month_index + 1:02d}.html")
+
+def write_fixtures(data_manager, years, fixtures_dir=FIXTURES_DIR):
+    os.makedirs(fixtures_dir, exist_ok=True)
+    written = []
+    for year in years:
+        for month_index in range(12):
+            month_days = data_manager.get_data_for_nepali_month(year, month_index)
+            if not month_days:
+                continue
+            path = fixture_path(fixtures_dir, year, month_index)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(render_month_html(month_days))
+            written.append(path)
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the saved month-page HTML fixtures from the calendar data.")
+    parser.add_argument("years", nargs="*", type=int, default=[2080])
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--output", default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    from src.calendar_data import CalendarData
+    with contextlib.redirect_stdout(sys.stderr):
+        data_manager = CalendarData(args.data_dir)
+    for path in write_fixtures(data_manager, args.years, args.output):
+        print(path)
+
+if __name__ == "__main__":
+    main()
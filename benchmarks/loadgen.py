@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _request_mix(rng, batch_size):
+    # Weighted mix of the service's endpoints over dates inside the shipped data range.
+    year, month, day = rng.randint(2000, 2099), rng.randint(1, 12), rng.randint(1, 28)
+    ad = f"{rng.randint(1944, 2042)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    choice = rng.random()
+    if choice < 0.35:
+        return "GET", f"/ad-to-bs?date={ad}", b""
+    if choice < 0.60:
+        return "GET", f"/bs-to-ad?date={year}-{month:02d}-{day:02d}", b""
+    if choice < 0.75:
+        return "GET", f"/month?year={year}&month={month}", b""
+    if choice < 0.85:
+        return "GET", f"/upcoming?from={ad}&limit=10", b""
+    if choice < 0.92:
+        return "GET", f"/holidays?from={ad}&to={ad[:4]}-12-31", b""
+    dates = [f"{rng.randint(1944, 2042)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" for _ in range(batch_size)]
+    return "POST", "/batch/ad-to-bs", json.dumps({"dates": dates}).encode()
+
+async def _send(reader, writer, host, method, target, body):
+    writer.write((f"{method} {target} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _client(host, port, requests_per_client, seed, batch_size, latencies, errors):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests_per_client):
+            method, target, body = _request_mix(rng, batch_size)
+            start = time.perf_counter()
+            status = await _send(reader, writer, host, method, target, body)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+async def run_load(host, port, connections, total_requests, batch_size, seed):
+    latencies, errors = [], []
+    per_client = max(1, total_requests // connections)
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, per_client, seed + i, batch_size, latencies, errors) for i in range(connections)))
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+async def _wait_for_port(host, port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise SystemExit(f"Server on {host}:{port} did not come up.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the MitiTithi query service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent keep-alive connections.")
+    parser.add_argument("--requests", type=int, default=20000, help="Total requests across all connections.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Dates per batch request.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="Start `python -m src.server` for the duration of the run.")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, "-m", "src.server", "--host", args.host, "--port", str(args.port)],
+                                  cwd=ROOT_DIR, stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(_wait_for_port(args.host, args.port))
+        latencies, errors, elapsed = asyncio.run(run_load(args.host, args.port, args.connections, args.requests, args.batch_size, args.seed))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    print(f"Requests:     {len(latencies)} over {args.connections} connections ({len(errors)} errors)")
+    print(f"Throughput:   {len(latencies) / elapsed:,.0f} requests/sec")
+    print(f"Latency p50:  {_percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"Latency p99:  {_percentile(latencies, 99) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
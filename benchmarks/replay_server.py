@@ -0,0 +1,223 @@
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import render_month_html, fixture_path
+from src.scraper import CalendarScraper
+from src.calendar_data import CalendarData
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+MONTHS = CalendarScraper.NEPALI_MONTHS_LIST
+
+# Month pages come from recordings of the live site when present, otherwise they are rendered
+# from the synced calendar data in the same markup, so any year in data/ can be replayed.
+class PageSource:
+    def __init__(self, recordings_dir=RECORDINGS_DIR, data_dir="data"):
+        self.recordings_dir = recordings_dir
+        self.data_dir = data_dir
+        self.calendar_data = None
+        self._months = None
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        calendar = CalendarData(self.data_dir)
+        self.calendar_data, self._months = calendar.calendar_data, calendar.nepali_month_map
+
+    def _rendered(self, year, month_index):
+        if self._months is None:
+            self.load()
+        month_days = self._months.get((year, month_index))
+        return render_month_html(month_days) if month_days else None
+
+    def get(self, year, month_index):
+        with self._lock:
+            key = (year, month_index)
+            if key not in self._pages:
+                path = fixture_path(self.recordings_dir, year, month_index)
+                if os.path.exists(path):
+                    with open(path, encoding="utf-8") as f:
+                        self._pages[key] = f.read()
+                else:
+                    self._pages[key] = self._rendered(year, month_index)
+            return self._pages[key]
+
+class ReplayServer:
+    def __init__(self, source, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, bandwidth=None,
+                 error_rate=0.0, error_statuses=(429, 503), retry_after=None, seed=0):
+        self.source = source
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.seed = seed
+        self.stats = {"requests": 0, "served": 0, "errors": {}, "not_found": 0, "bytes": 0}
+        self._attempts = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/nepali-calendar/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _injected_error(self, year, month):
+        # Decided per (url, attempt number) from the seed, so a run fails the same requests no
+        # matter how the client's threads interleave.
+        with self._lock:
+            attempt = self._attempts[(year, month)] = self._attempts.get((year, month), 0) + 1
+        if not self.error_rate or not self.error_statuses:
+            return None
+        rng = random.Random(f"{self.seed}:{year}:{month}:{attempt}")
+        if rng.random() < self.error_rate:
+            return rng.choice(self.error_statuses)
+        return None
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _count_error(self, status):
+        with self._lock:
+            self.stats["errors"][status] = self.stats["errors"].get(status, 0) + 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body, headers=()):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                if not server.bandwidth:
+                    self.wfile.write(body)
+                    return
+                chunk_size = 16 * 1024
+                for start in range(0, len(body), chunk_size):
+                    chunk = body[start:start + chunk_size]
+                    self.wfile.write(chunk)
+                    time.sleep(len(chunk) / server.bandwidth)
+
+            def do_GET(self):
+                server._count("requests")
+                if server.latency or server.jitter:
+                    time.sleep(max(server.latency + random.uniform(-server.jitter, server.jitter), 0))
+
+                query = parse_qs(urlparse(self.path).query)
+                try:
+                    year = int(query["year"][0])
+                    month_index = MONTHS.index(query["month"][0])
+                except (KeyError, ValueError):
+                    server._count("not_found")
+                    self._send(404, b"Unknown month")
+                    return
+
+                status = server._injected_error(year, month_index)
+                if status:
+                    server._count_error(status)
+                    headers = [("Retry-After", str(server.retry_after))] if server.retry_after is not None else []
+                    self._send(status, f"Injected {status}".encode(), headers)
+                    return
+
+                page = server.source.get(year, month_index)
+                if page is None:
+                    server._count("not_found")
+                    self._send(404, b"No data for this month")
+                    return
+                body = page.encode("utf-8")
+                server._count("served")
+                server._count("bytes", len(body))
+                self._send(200, body)
+
+        return Handler
+
+def record(years, recordings_dir=RECORDINGS_DIR, base_url=None):
+    # Saves the live month pages so later replays serve the site's real markup.
+    os.makedirs(recordings_dir, exist_ok=True)
+    scraper = CalendarScraper(base_url=base_url)
+    saved = []
+    for year in years:
+        for month_index, month_name in enumerate(MONTHS):
+            html = scraper.fetch_page(year, month_name)
+            if not html:
+                continue
+            path = fixture_path(recordings_dir, year, month_index)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+            saved.append(path)
+            print(path)
+    return saved
+
+def add_server_arguments(parser):
+    parser.add_argument("--recordings", default=RECORDINGS_DIR)
+    parser.add_argument("--data-dir", default="data", help="Calendar data to render pages from when no recording exists.")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-kbps", type=float, default=0.0, help="Response bandwidth in KiB/s; 0 for unlimited.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an injected error.")
+    parser.add_argument("--error-status", type=int, action="append", help="Injected status code (repeatable; default 429 and 503).")
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with injected errors.")
+    parser.add_argument("--seed", type=int, default=0)
+
+def server_from_arguments(args, host="127.0.0.1", port=0):
+    return ReplayServer(PageSource(args.recordings, args.data_dir), host=host, port=port,
+                        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                        bandwidth=args.bandwidth_kbps * 1024 or None, error_rate=args.error_rate,
+                        error_statuses=args.error_status or (429, 503), retry_after=args.retry_after, seed=args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Record month pages from the live site or replay them locally.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Serve month pages at http://HOST:PORT/nepali-calendar/.")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8766)
+    add_server_arguments(serve_parser)
+    record_parser = subparsers.add_parser("record", help="Save live month pages for the given B.S. years.")
+    record_parser.add_argument("years", nargs="+", type=int)
+    record_parser.add_argument("--recordings", default=RECORDINGS_DIR)
+    record_parser.add_argument("--base-url", help="Site to record from (default: the scraper's site).")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.years, args.recordings, args.base_url)
+        return
+
+    server = server_from_arguments(args, args.host, args.port)
+    print(f"Replaying on {server.url} (set MITITITHI_BASE_URL to this to sync against it)", file=sys.stderr)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import subprocess
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.fixtures import FIXTURES_DIR
+
+# Every case is set up outside the timed region and runs fully offline: scraping is measured on
+# saved fixture pages and the UI on Qt's offscreen platform with a throwaway settings directory.
+CASES = {}
+
+def case(name, repeat=5, group="data"):
+    def register(func):
+        CASES[name] = {"func": func, "repeat": repeat, "group": group}
+        return func
+    return register
+
+class Context:
+    def __init__(self, data_dir, seed):
+        self.data_dir = data_dir
+        self.rng = random.Random(seed)
+        self._data_manager = None
+        self._window = None
+
+    @property
+    def data_manager(self):
+        if self._data_manager is None:
+            from src.calendar_data import CalendarData
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                self._data_manager = CalendarData(self.data_dir)
+        return self._data_manager
+
+    @property
+    def window(self):
+        if self._window is None:
+            self._window = _create_offscreen_window()
+        return self._window
+
+    def close(self):
+        if self._window is not None:
+            import shiboken6
+            self._window.sync_thread.quit()
+            self._window.sync_thread.wait()
+            self._window.tray_icon.hide()
+            shiboken6.delete(self._window)
+            self._window = None
+
+    def sample_dates(self, count):
+        return [self.rng.choice(self.data_manager.sorted_dates) for _ in range(count)]
+
+def _create_offscreen_window():
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    settings_home = tempfile.mkdtemp(prefix="mititithi-bench-")
+    os.environ["HOME"] = settings_home
+    os.environ["APPDATA"] = settings_home
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from src.ui.main_window import MainWindow
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        window = MainWindow()
+        # Let the start-up sync (which only reloads data for already-synced years) settle so it
+        # does not run concurrently with the timed UI work.
+        finished = []
+        window.data_manager.sync_finished.connect(lambda: finished.append(time.perf_counter()))
+        deadline = time.perf_counter() + 60
+        while time.perf_counter() < deadline and (not finished or time.perf_counter() - finished[-1] < 0.5):
+            app.processEvents()
+            time.sleep(0.01)
+    window.set_view_mode('calendar')
+    return window
+
+@case("data.load_all_data", repeat=3)
+def bench_load_all_data(ctx):
+    data_manager = ctx.data_manager
+    def run():
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            data_manager.load_all_data()
+    return run
+
+@case("data.get_data_for_date x100k")
+def bench_get_data_for_date(ctx):
+    dates = ctx.sample_dates(100_000)
+    get = ctx.data_manager.get_data_for_date
+    return lambda: [get(d) for d in dates]
+
+@case("data.lookup_bs_to_ad x100k")
+def bench_lookup_bs_to_ad(ctx):
+    records = [ctx.data_manager.get_data_for_date(d) for d in ctx.sample_dates(100_000)]
+    triples = [(r['nepali_year'], r['nepali_month_index'], r['nepali_day']) for r in records]
+    lookup = ctx.data_manager.lookup_bs_to_ad
+    return lambda: [lookup(y, m, d) for y, m, d in triples]
+
+@case("data.get_data_for_nepali_month x1212")
+def bench_get_data_for_nepali_month(ctx):
+    get = ctx.data_manager.get_data_for_nepali_month
+    return lambda: [get(year, month) for year in range(2000, 2101) for month in range(12)]
+
+@case("data.get_upcoming_events x1000")
+def bench_get_upcoming_events(ctx):
+    dates = ctx.sample_dates(1000)
+    get = ctx.data_manager.get_upcoming_events
+    return lambda: [get(d) for d in dates]
+
+@case("query.calendar_index x100")
+def bench_calendar_index(ctx):
+    from src.calendar_index import weekday, tithi, bs_years, holiday
+    index = ctx.data_manager.get_calendar_index()
+    query = (weekday("Saturday") & tithi("Purnima") & bs_years(2080, 2090)) | (holiday() & weekday("Monday"))
+    return lambda: [index.ranges(query) for _ in range(100)]
+
+@case("query.calendar_arrays.ad_to_bs 1M")
+def bench_calendar_arrays(ctx):
+    import numpy as np
+    arrays = ctx.data_manager.get_calendar_arrays()
+    dates = arrays.base_day + np.random.default_rng(0).integers(0, arrays.span, size=1_000_000)
+    return lambda: arrays.ad_to_bs(dates)
+
+def _export_case(ctx, start, end):
+    from src.export import iter_days, write_ics
+    def run():
+        with open(os.devnull, "w", encoding="utf-8", newline="") as out:
+            write_ics(iter_days(ctx.data_manager, start, end), out)
+    return run
+
+# Same work per day, so time should scale with the range while peak memory stays the same.
+@case("export.ics one month", repeat=5)
+def bench_export_month(ctx):
+    return _export_case(ctx, "2024-04-13", "2024-05-13")
+
+@case("export.ics all days", repeat=3)
+def bench_export_all(ctx):
+    return _export_case(ctx, None, None)
+
+@case("scraper.parse_month fixtures", repeat=3, group="scraper")
+def bench_parse_month(ctx):
+    from src.scraper import CalendarScraper
+    scraper = CalendarScraper()
+    pages = []
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        if filename.endswith(".html"):
+            year, month = filename[:-5].split("_")
+            with open(os.path.join(FIXTURES_DIR, filename), encoding="utf-8") as f:
+                pages.append((f.read(), int(year), int(month) - 1))
+    if not pages:
+        raise RuntimeError(f"No fixtures in {FIXTURES_DIR}; run benchmarks/fixtures.py first.")
+    names = scraper.NEPALI_MONTHS_LIST
+    return lambda: [scraper.parse_month(html, year, names[month], month) for html, year, month in pages]
+
+@case("ui.populate_calendar x20", repeat=3, group="ui")
+def bench_populate_calendar(ctx):
+    from PySide6.QtWidgets import QApplication
+    window = ctx.window
+    def run():
+        for _ in range(20):
+            window.populate_calendar()
+            QApplication.processEvents()
+    return run
+
+@case("ui.navigate_month x24", repeat=3, group="ui")
+def bench_navigate_month(ctx):
+    from PySide6.QtWidgets import QApplication
+    window = ctx.window
+    def run():
+        for direction in [1] * 12 + [-1] * 12:
+            window.navigate_month(direction)
+            QApplication.processEvents()
+    return run
+
+def run_case(ctx, name, spec):
+    func = spec["func"](ctx)
+    timings = []
+    for _ in range(spec["repeat"]):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "repeat": spec["repeat"],
+        "peak_alloc_kb": round(peak / 1024, 1),
+    }
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n{'case':42} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, result in results["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "median_s" not in result:
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{name:42} {base['median_s'] * 1000:9.2f}ms {result['median_s'] * 1000:9.2f}ms {ratio:6.2f}x{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="MitiTithi offline benchmark suite.")
+    parser.add_argument("-k", "--filter", default="", help="Only run cases whose name contains this text.")
+    parser.add_argument("--skip-ui", action="store_true", help="Skip the Qt offscreen cases.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("-o", "--output", help="Write results JSON here.")
+    parser.add_argument("--baseline", help="Compare against a previous results JSON.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Median ratio above which a case counts as regressed.")
+    args = parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    ctx = Context(args.data_dir, args.seed)
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+
+    for name, spec in CASES.items():
+        if args.filter not in name or (args.skip_ui and spec["group"] == "ui"):
+            continue
+        try:
+            result = run_case(ctx, name, spec)
+            print(f"{name:42} median {result['median_s'] * 1000:9.2f} ms   peak {result['peak_alloc_kb']:10.1f} KiB")
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+            print(f"{name:42} FAILED: {result['error']}")
+        results["results"][name] = result
+    ctx.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,49 @@
 import sys
-from PySide6.QtCore import Qt
-from src.ui.main_window import MainWindow
-from PySide6.QtWidgets import QApplication
+import argparse
+from src.single_instance import send_command
+
+def parse_command(argv):
+    parser = argparse.ArgumentParser(description="MitiTithi Nepali calendar widget. If it is already running, the action goes to the running widget.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--calendar", nargs="?", const="", metavar="YYYY-MM", help="Open the calendar, optionally at a B.S. year and month.")
+    group.add_argument("--ad2bs", metavar="YYYY-MM-DD", help="Print the B.S. date for an A.D. date.")
+    group.add_argument("--bs2ad", metavar="YYYY-MM-DD", help="Print the A.D. date for a B.S. date.")
+    args = parser.parse_args(argv)
+    if args.calendar is not None:
+        command = {"action": "calendar"}
+        if args.calendar:
+            try:
+                year, month = (int(part) for part in args.calendar.replace("/", "-").split("-"))
+            except ValueError:
+                parser.error("--calendar takes a B.S. year and month, e.g. 2081-05.")
+            command.update(year=year, month_index=min(max(month, 1), 12) - 1)
+        return command
+    if args.ad2bs or args.bs2ad:
+        return {"action": "ad2bs" if args.ad2bs else "bs2ad", "date": args.ad2bs or args.bs2ad}
+    return {"action": "show"}
+
+def report(reply):
+    if not reply.get("ok"):
+        print(f"Error: {reply.get('error')}", file=sys.stderr)
+        return 1
+    result = reply.get("result")
+    if result:
+        events = f" ({', '.join(result['events'])})" if result["events"] else ""
+        print(f"{result['gregorian_date']} A.D. = {result['nepali_date_expanded']} B.S., {result['weekday']}, {result['tithi']}{events}")
+    return 0
 
 def main():
+    command = parse_command(sys.argv[1:])
+    # A running widget takes the command and this process exits without loading Qt or the data.
+    reply = send_command(command)
+    if reply is not None:
+        sys.exit(report(reply))
+
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QApplication
+    from src.ui.main_window import MainWindow
+    from src.ui.instance_server import InstanceServer
+
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     
@@ -11,9 +51,18 @@ def main():
     
     app.setApplicationName("NepaliCalendarDesktopWidget")
     app.setOrganizationName("SubhojitGhimire")
+
+    # Claimed before the window is built, so two launches at the same moment cannot both start.
+    instance_server = InstanceServer()
+    if not instance_server.listen():
+        reply = send_command(command)
+        sys.exit(report(reply) if reply is not None else 1)
     
     window = MainWindow()
+    instance_server.handler = window.handle_command
     window.show()
+    if command["action"] != "show":
+        report(window.handle_command(command))
     
     sys.exit(app.exec())
 
@@ -0,0 +1,172 @@
+import bisect
+from array import array
+from datetime import date
+from src.calendar_data import NEPALI_MONTHS
+
+# Date arithmetic in Bikram Sambat. B.S. dates are (year, month_index, day) tuples with a 0-based
+# month index, as in CalendarData.lookup_bs_to_ad. Everything runs off two compact tables built
+# once from the calendar: the A.D. ordinal of the first day of every B.S. month, and its length.
+# Month m (counted from Baishakh of first_year) starts on month_starts[m] and the table ends with
+# the day after the last month, so lengths are differences of neighbours.
+class BSCalendar:
+    def __init__(self, first_year, month_starts):
+        self.first_year = first_year
+        self.month_starts = array('l', month_starts)
+        self.month_lengths = array('b', (b - a for a, b in zip(self.month_starts, self.month_starts[1:])))
+        self.last_year = first_year + len(self.month_lengths) // 12 - 1
+
+    @classmethod
+    def from_calendar(cls, nepali_month_map):
+        # Only whole runs of years from the first loaded one are used; a month missing from the
+        # data ends the table there.
+        years = sorted({year for year, _ in nepali_month_map})
+        if not years:
+            return cls(0, [0])
+        month_starts = []
+        year = years[0]
+        while all((year, month_index) in nepali_month_map for month_index in range(12)):
+            for month_index in range(12):
+                first = nepali_month_map[(year, month_index)][0]
+                start = date.fromisoformat(first['gregorian_date']).toordinal() - (first['nepali_day'] - 1)
+                month_starts.append(start)
+            last = nepali_month_map[(year, 11)][-1]
+            end = date.fromisoformat(last['gregorian_date']).toordinal() + 1
+            year += 1
+        if not month_starts:
+            return cls(0, [0])
+        return cls(years[0], month_starts + [end])
+
+    def _month(self, year, month_index):
+        month = (year - self.first_year) * 12 + month_index
+        if year < self.first_year or not 0 <= month_index < 12 or month >= len(self.month_lengths):
+            return None
+        return month
+
+    def month_length(self, year, month_index):
+        month = self._month(year, month_index)
+        return None if month is None else self.month_lengths[month]
+
+    def is_valid(self, bs_date):
+        year, month_index, day = bs_date
+        length = self.month_length(year, month_index)
+        return length is not None and 1 <= day <= length
+
+    def to_ordinal(self, bs_date):
+        # A.D. proleptic ordinal (date.toordinal) of a B.S. date, or None if it is not valid.
+        if not self.is_valid(bs_date):
+            return None
+        year, month_index, day = bs_date
+        return self.month_starts[self._month(year, month_index)] + day - 1
+
+    def from_ordinal(self, ordinal):
+        if not self.month_starts[0] <= ordinal < self.month_starts[-1]:
+            return None
+        month = bisect.bisect_right(self.month_starts, ordinal) - 1
+        return self.first_year + month // 12, month % 12, ordinal - self.month_starts[month] + 1
+
+    def to_ad(self, bs_date):
+        ordinal = self.to_ordinal(bs_date)
+        return None if ordinal is None else date.fromordinal(ordinal)
+
+    def from_ad(self, ad_date):
+        return self.from_ordinal(ad_date.toordinal())
+
+    def add(self, bs_date, years=0, months=0, days=0):
+        # Like relativedelta: years and months first, with the day clamped to the end of the
+        # resulting month (30 Chaitra + 1 month is the last day of Baishakh), then days.
+        # None if the result falls outside the table.
+        if not self.is_valid(bs_date):
+            return None
+        year, month_index, day = bs_date
+        month = self._month(year, month_index) + years * 12 + months
+        if not 0 <= month < len(self.month_lengths):
+            return None
+        day = min(day, self.month_lengths[month])
+        if not days:
+            return self.first_year + month // 12, month % 12, day
+        return self.from_ordinal(self.month_starts[month] + day - 1 + days)
+
+    def difference(self, start, end):
+        # (years, months, days) from start to end in B.S., relativedelta-style: the most whole
+        # months that fit, then the remaining days. Negated when end is before start.
+        start_ordinal, end_ordinal = self.to_ordinal(start), self.to_ordinal(end)
+        if start_ordinal is None or end_ordinal is None:
+            return None
+        if end_ordinal < start_ordinal:
+            years, months, days = self.difference(end, start)
+            return -years, -months, -days
+        start_month = self._month(start[0], start[1])
+        months = self._month(end[0], end[1]) - start_month
+        reached = self.month_starts[start_month + months] + min(start[2], self.month_lengths[start_month + months]) - 1
+        if reached > end_ordinal:
+            months -= 1
+            reached = self.month_starts[start_month + months] + min(start[2], self.month_lengths[start_month + months]) - 1
+        return months // 12, months % 12, end_ordinal - reached
+
+    def add_many(self, years, month_indexes, days, add_years=0, add_months=0, add_days=0):
+        # Batch add over parallel arrays (B.S. year, 0-based month index, day); the amounts may be
+        # scalars or arrays. Returns (years, month_indexes, days, valid) as NumPy arrays.
+        import numpy as np
+        starts = np.asarray(self.month_starts, dtype=np.int64)
+        lengths = np.asarray(self.month_lengths, dtype=np.int64)
+        month_indexes = np.asarray(month_indexes, dtype=np.int64)
+        month = (np.asarray(years, dtype=np.int64) - self.first_year) * 12 + month_indexes
+        day = np.asarray(days, dtype=np.int64)
+        valid = (month_indexes >= 0) & (month_indexes < 12) & (month >= 0) & (month < len(lengths))
+        valid &= (day >= 1) & (day <= lengths[np.where(valid, month, 0)])
+        month = month + np.asarray(add_years, dtype=np.int64) * 12 + np.asarray(add_months, dtype=np.int64)
+        valid &= (month >= 0) & (month < len(lengths))
+        month = np.where(valid, month, 0)
+        ordinal = starts[month] + np.minimum(day, lengths[month]) - 1 + np.asarray(add_days, dtype=np.int64)
+        valid &= (ordinal >= starts[0]) & (ordinal < starts[-1])
+        ordinal = np.where(valid, ordinal, starts[0])
+        result_month = np.searchsorted(starts, ordinal, side="right") - 1
+        zero = np.zeros_like(result_month)
+        return (np.where(valid, self.first_year + result_month // 12, zero), np.where(valid, result_month % 12, zero),
+                np.where(valid, ordinal - starts[result_month] + 1, zero), valid)
+
+    def difference_many(self, start_dates, end_dates):
+        # Batch difference over two sequences of B.S. date tuples. Returns (years, months, days,
+        # valid) as NumPy arrays; like difference, negative when an end is before its start.
+        import numpy as np
+        starts = np.asarray(self.month_starts, dtype=np.int64)
+        lengths = np.asarray(self.month_lengths, dtype=np.int64)
+
+        def split(dates):
+            dates = np.asarray(dates, dtype=np.int64).reshape(-1, 3)
+            month = (dates[:, 0] - self.first_year) * 12 + dates[:, 1]
+            ok = (dates[:, 1] >= 0) & (dates[:, 1] < 12) & (month >= 0) & (month < len(lengths))
+            month = np.where(ok, month, 0)
+            ok &= (dates[:, 2] >= 1) & (dates[:, 2] <= lengths[month])
+            return month, dates[:, 2], ok
+
+        start_month, start_day, start_ok = split(start_dates)
+        end_month, end_day, end_ok = split(end_dates)
+        valid = start_ok & end_ok
+        start_ordinal = starts[start_month] + start_day - 1
+        end_ordinal = starts[end_month] + end_day - 1
+        # Work on (earlier, later) pairs and put the sign back at the end.
+        negative = end_ordinal < start_ordinal
+        low_month, high_month = np.where(negative, end_month, start_month), np.where(negative, start_month, end_month)
+        low_day = np.where(negative, end_day, start_day)
+        high_ordinal = np.where(negative, start_ordinal, end_ordinal)
+
+        def reached(months):
+            month = low_month + months
+            return starts[month] + np.minimum(low_day, lengths[month]) - 1
+
+        months = high_month - low_month
+        months = np.where(reached(months) > high_ordinal, months - 1, months)
+        days = high_ordinal - reached(months)
+        sign = np.where(negative, -1, 1)
+        zero = np.zeros_like(months)
+        return (np.where(valid, sign * (months // 12), zero), np.where(valid, sign * (months % 12), zero),
+                np.where(valid, sign * days, zero), valid)
+
+def format_duration(years, months, days):
+    parts = [(years, "year"), (months, "month"), (days, "day")]
+    return ", ".join(f"{value} {unit}{'' if abs(value) == 1 else 's'}" for value, unit in parts)
+
+def format_bs_date(bs_date):
+    year, month_index, day = bs_date
+    return f"{day} {NEPALI_MONTHS[month_index]} {year}"
@@ -0,0 +1,94 @@
+import numpy as np
+from src.tithi import tithi_code
+from src.tithi_engine import tithi_codes
+
+WEEKDAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+BS_DAY_SLOTS = 32
+
+# Column-oriented copy of the calendar data. Every attribute is a NumPy column indexed by day
+# number (days since the first Gregorian date in the dataset), so converting an array of dates is
+# one fancy-indexing operation. B.S. dates map back through a dense (year, month, day) slot table.
+class CalendarArrays:
+    def __init__(self, calendar_data):
+        dates = np.array(sorted(calendar_data), dtype='datetime64[D]')
+        if len(dates) == 0:
+            dates = np.array(['1970-01-01'], dtype='datetime64[D]')
+        self.base_day = dates[0]
+        self.span = int((dates[-1] - dates[0]).astype(np.int64)) + 1
+
+        self.valid = np.zeros(self.span, dtype=bool)
+        self.bs_year = np.zeros(self.span, dtype=np.int16)
+        self.bs_month = np.zeros(self.span, dtype=np.int8)
+        self.bs_day = np.zeros(self.span, dtype=np.int8)
+        self.weekday = np.full(self.span, -1, dtype=np.int8)
+        self.tithi = np.zeros(self.span, dtype=np.int8)
+        self.is_holiday = np.zeros(self.span, dtype=bool)
+
+        records = [calendar_data[str(day)] for day in dates] if calendar_data else []
+        offsets = (dates - self.base_day).astype(np.int64)[:len(records)]
+        weekday_index = {name: i for i, name in enumerate(WEEKDAYS)}
+        self.valid[offsets] = True
+        self.bs_year[offsets] = [r['nepali_year'] for r in records]
+        self.bs_month[offsets] = [r['nepali_month_index'] + 1 for r in records]
+        self.bs_day[offsets] = [r['nepali_day'] for r in records]
+        self.weekday[offsets] = [weekday_index.get(r['weekday'], -1) for r in records]
+        self.tithi[offsets] = [tithi_code(r['tithi']) for r in records]
+        # Days without a usable scraped tithi (code 0, see tithi.has_tithi) get the computed one;
+        # tithi_computed marks them.
+        self.tithi_computed = self.valid & (self.tithi == 0)
+        missing = np.nonzero(self.tithi_computed)[0]
+        if len(missing):
+            self.tithi[missing] = tithi_codes(self.base_day + missing)
+        self.is_holiday[offsets] = [bool(r['is_holiday']) for r in records]
+
+        self.min_bs_year = int(self.bs_year[self.valid].min()) if records else 0
+        self.max_bs_year = int(self.bs_year[self.valid].max()) if records else -1
+        slot_count = (self.max_bs_year - self.min_bs_year + 1) * 12 * BS_DAY_SLOTS
+        self.bs_slot_to_offset = np.full(max(slot_count, 0), -1, dtype=np.int64)
+        if records:
+            slots = self._bs_slots(self.bs_year[offsets], self.bs_month[offsets], self.bs_day[offsets])
+            self.bs_slot_to_offset[slots] = offsets
+
+    def _bs_slots(self, years, months, days):
+        years = np.asarray(years, dtype=np.int64)
+        months = np.asarray(months, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+        return ((years - self.min_bs_year) * 12 + (months - 1)) * BS_DAY_SLOTS + (days - 1)
+
+    def _offsets(self, dates):
+        offsets = (np.asarray(dates, dtype='datetime64[D]') - self.base_day).astype(np.int64)
+        in_range = (offsets >= 0) & (offsets < self.span)
+        offsets = np.where(in_range, offsets, 0)
+        return offsets, in_range & self.valid[offsets]
+
+    def _gather(self, offsets, valid):
+        return {
+            "bs_year": np.where(valid, self.bs_year[offsets], 0),
+            "bs_month": np.where(valid, self.bs_month[offsets], 0),
+            "bs_day": np.where(valid, self.bs_day[offsets], 0),
+            "weekday": np.where(valid, self.weekday[offsets], -1),
+            "tithi": np.where(valid, self.tithi[offsets], 0),
+            "is_holiday": valid & self.is_holiday[offsets],
+            "valid": valid,
+        }
+
+    def ad_to_bs(self, dates):
+        # dates: array-like of datetime64[D]. Returns parallel arrays; rows outside the synced
+        # range have valid=False and zeroed fields. B.S. months are 1-based.
+        offsets, valid = self._offsets(dates)
+        return self._gather(offsets, valid)
+
+    def bs_to_ad(self, years, months, days):
+        years = np.asarray(years, dtype=np.int64)
+        months = np.asarray(months, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+        in_range = ((years >= self.min_bs_year) & (years <= self.max_bs_year) &
+                    (months >= 1) & (months <= 12) & (days >= 1) & (days <= BS_DAY_SLOTS))
+        slots = np.where(in_range, self._bs_slots(years, months, days), 0)
+        offsets = self.bs_slot_to_offset[slots] if len(self.bs_slot_to_offset) else np.full(slots.shape, -1)
+        valid = in_range & (offsets >= 0)
+        offsets = np.where(valid, offsets, 0)
+
+        result = self._gather(offsets, valid)
+        result["date"] = np.where(valid, self.base_day + offsets, np.datetime64('NaT'))
+        return result
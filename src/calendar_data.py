@@ -0,0 +1,330 @@
+import os
+import json
+import bisect
+from datetime import datetime, date
+from src.working_days import WorkingDayCalendar
+from src.change_feed import ChangeFeed
+from src.tithi import tithi_name, has_tithi
+
+NEPALI_MONTHS = [
+    "Baishakh", "Jestha", "Ashadh", "Shrawan", "Bhadra", "Ashwin",
+    "Kartik", "Mangsir", "Poush", "Magh", "Falgun", "Chaitra"
+]
+
+# The calendar data and every query on it, in plain Python: headless tools import this without
+# paying for PySide6, bs4 or requests. The app wraps it in DataManager, the Qt adapter.
+class CalendarData:
+    # Approximate (Gregorian month, day) each B.S. month starts on; close enough to pick the
+    # month to fetch for an A.D. date that is not synced yet.
+    NEPALI_MONTH_STARTS = ((4, 14), (5, 15), (6, 15), (7, 17), (8, 17), (9, 17),
+                           (10, 18), (11, 17), (12, 16), (1, 15), (2, 13), (3, 15))
+
+    def __init__(self, data_dir="data", user_events=None):
+        self.data_dir = data_dir
+        # Optional UserEventStore, merged into query results; editing it never reloads the data.
+        self.user_events = user_events
+        self.calendar_data = {}
+        self.sorted_dates = []
+        self.on_demand_data = {}
+        self.nepali_to_gregorian_map = {}
+        self.nepali_month_map = {}
+        self.working_days = WorkingDayCalendar()
+        self._calendar_arrays = None
+        self._calendar_index = None
+        self._bs_calendar = None
+        # Tithis computed for days the scraped data has none for, by A.D. date.
+        self._computed_tithi = {}
+        self.data_version = 0
+        # (mtime_ns, size) of each year file as last loaded, so a change on disk can be traced
+        # to the years it touched.
+        self.file_stamps = {}
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.change_feed = ChangeFeed(os.path.join(self.data_dir, "changes.jsonl"))
+        self.load_all_data()
+
+    def year_path(self, year):
+        return os.path.join(self.data_dir, f"calendar_{year}.jsonl")
+
+    def has_year(self, year):
+        return os.path.exists(self.year_path(year))
+
+    def has_month(self, year, month_index):
+        return (year, month_index) in self.nepali_month_map
+
+    def _compute_tithis(self, date_strs):
+        # NumPy and the engine are only imported once a day without a scraped tithi is asked for.
+        missing = [date_str for date_str in date_strs if date_str not in self._computed_tithi]
+        if missing:
+            from src.tithi_engine import tithi_codes
+            for date_str, code in zip(missing, tithi_codes(missing)):
+                self._computed_tithi[date_str] = tithi_name(int(code))
+
+    def tithi_for_date(self, date_str):
+        # The scraped tithi, or the computed one for days outside (or missing from) the data.
+        data = self.calendar_data.get(date_str)
+        if data and has_tithi(data):
+            return data['tithi']
+        self._compute_tithis([date_str])
+        return self._computed_tithi[date_str]
+
+    def _present(self, data):
+        # A record as the app shows it. A day without a scraped tithi gets the computed one
+        # (flagged 'tithi_computed'), and a day with user events gets the extra titles appended
+        # (and listed again under 'user_events'). Such days come back as shallow copies; every
+        # other day is the base record itself, with no further work.
+        if data is None or (has_tithi(data) and not self.user_events):
+            return data
+        extra = {}
+        if not has_tithi(data):
+            date_str = data['gregorian_date']
+            if date_str not in self._computed_tithi:
+                # The rest of the month is likely to be asked for next, so it is computed in one go.
+                month_days = self.nepali_month_map.get((data['nepali_year'], data['nepali_month_index']), [])
+                self._compute_tithis([date_str] + [day['gregorian_date'] for day in month_days if not has_tithi(day)])
+            extra.update(tithi=self._computed_tithi[date_str], tithi_computed=True)
+        titles = self.user_events.titles_for(data) if self.user_events else None
+        if titles:
+            extra.update(events=data['events'] + titles, user_events=titles)
+        return dict(data, **extra) if extra else data
+
+    def get_data_for_date(self, date_str):
+        return self._present(self.calendar_data.get(date_str))
+
+    def lookup_bs_to_ad(self, year, month_index, day):
+        key = f"{year}-{month_index + 1:02d}-{day:02d}"
+        return self._present(self.nepali_to_gregorian_map.get(key))
+    
+    def get_data_for_nepali_month(self, year, month_index):
+        month_days = self.nepali_month_map.get((year, month_index), [])
+        if not self.user_events and all(has_tithi(data) for data in month_days):
+            return list(month_days)
+        return [self._present(data) for data in month_days]
+
+    def get_upcoming_events(self, from_date_str, limit=10):
+        upcoming_events = []
+        start_index = bisect.bisect_left(self.sorted_dates, from_date_str)
+
+        for date_str in self.sorted_dates[start_index:]:
+            data = self.calendar_data[date_str]
+            if data.get('events') or (self.user_events and self.user_events.titles_for(data)):
+                upcoming_events.append(data)
+            if len(upcoming_events) >= limit:
+                break
+        return [self._present(data) for data in upcoming_events]
+
+    def get_calendar_arrays(self):
+        # Built on first use so the GUI never pays for importing NumPy or building the columns.
+        if self._calendar_arrays is None:
+            from src.calendar_arrays import CalendarArrays
+            self._calendar_arrays = CalendarArrays(self.calendar_data)
+        return self._calendar_arrays
+
+    def get_calendar_index(self):
+        if self._calendar_index is None:
+            from src.calendar_index import CalendarIndex
+            self._calendar_index = CalendarIndex(self.calendar_data)
+        return self._calendar_index
+
+    def year_files(self):
+        # {year: filename} for the calendar_*.jsonl files in the data directory. atomic_write's
+        # temporary files (".calendar_Y.jsonl.*.tmp") never match.
+        year_files = {}
+        for filename in os.listdir(self.data_dir):
+            if filename.startswith("calendar_") and filename.endswith(".jsonl"):
+                try:
+                    year_files[int(filename[len("calendar_"):-len(".jsonl")])] = filename
+                except ValueError:
+                    continue
+        return year_files
+
+    def file_stamp(self, filename):
+        try:
+            stat = os.stat(os.path.join(self.data_dir, filename))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get_bs_calendar(self):
+        # Month-length table for B.S. date arithmetic (see src.bs_date).
+        if self._bs_calendar is None:
+            from src.bs_date import BSCalendar
+            self._bs_calendar = BSCalendar.from_calendar(self.nepali_month_map)
+        return self._bs_calendar
+
+    def load_all_data(self):
+        calendar_data = {}
+        file_stamps = {}
+        for filename in os.listdir(self.data_dir):
+            if filename.startswith("calendar_") and filename.endswith(".jsonl"):
+                # Stamped before reading: a write that lands mid-read shows up as a change later.
+                file_stamps[filename] = self.file_stamp(filename)
+                try:
+                    with open(os.path.join(self.data_dir, filename), 'r', encoding='utf-8') as f:
+                        for line in f:
+                            calendar_data.update(json.loads(line))
+                except (json.JSONDecodeError, IndexError):
+                    print(f"Warning: Could not parse or invalid filename: {filename}")
+        # Months fetched on demand only live in memory; a synced year file takes precedence.
+        for date_str, data in self.on_demand_data.items():
+            calendar_data.setdefault(date_str, data)
+        self.install_data(calendar_data)
+        self.file_stamps = file_stamps
+        print(f"Loaded {len(self.calendar_data)} days of data. Mapped {len(self.nepali_to_gregorian_map)} BS dates.")
+
+    def install_data(self, calendar_data):
+        # Everything is built into locals and swapped in at the end; the GUI thread keeps reading
+        # the previous data while the sync thread reloads.
+        nepali_to_gregorian_map = {}
+        for nep_data in calendar_data.values():
+            key = f"{nep_data['nepali_year']}-{nep_data['nepali_month_index'] + 1:02d}-{nep_data['nepali_day']:02d}"
+            nepali_to_gregorian_map[key] = nep_data
+
+        sorted_dates = sorted(calendar_data.keys())
+        nepali_month_map = {}
+        for date_str in sorted_dates:
+            data = calendar_data[date_str]
+            nepali_month_map.setdefault((data['nepali_year'], data['nepali_month_index']), []).append(data)
+        self.working_days.rebuild(sorted_dates, calendar_data)
+
+        self.calendar_data = calendar_data
+        self.nepali_to_gregorian_map = nepali_to_gregorian_map
+        self.sorted_dates = sorted_dates
+        self.nepali_month_map = nepali_month_map
+        self._calendar_arrays = None
+        self._calendar_index = None
+        self._bs_calendar = None
+        self.data_version += 1
+
+    def merge_month(self, month_data):
+        calendar_data = dict(self.calendar_data)
+        calendar_data.update(month_data)
+        self.on_demand_data.update(month_data)
+        self.install_data(calendar_data)
+
+    def changed_years(self):
+        # Years whose file was added, replaced, modified or removed since it was last loaded.
+        year_files = self.year_files()
+        changed = {year for year, filename in year_files.items()
+                   if self.file_stamps.get(filename) != self.file_stamp(filename)}
+        loaded = set(year_files.values())
+        for filename in self.file_stamps:
+            if filename not in loaded:
+                try:
+                    changed.add(int(filename[len("calendar_"):-len(".jsonl")]))
+                except ValueError:
+                    continue
+        return sorted(changed)
+
+    def read_year_file(self, year):
+        # The year's records, {} if the file is gone, or None if it is not a complete, valid
+        # year file (half written, truncated or for another year).
+        year_data = {}
+        try:
+            with open(self.year_path(year), 'r', encoding='utf-8') as f:
+                for line in f:
+                    year_data.update(json.loads(line))
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            return None
+        months = {}
+        for data in year_data.values():
+            if not isinstance(data, dict) or data.get('nepali_year') != year \
+                    or data.get('nepali_month_index') not in range(len(NEPALI_MONTHS)) or not isinstance(data.get('nepali_day'), int):
+                return None
+            months.setdefault(data.get('nepali_month_index'), []).append(data.get('nepali_day'))
+        # Syncs only ever write whole years: all twelve months, each ending on day 29-32. That
+        # also catches a file cut off between two lines, unless the cut falls in Chaitra's last days.
+        if sorted(months) != list(range(len(NEPALI_MONTHS))):
+            return None
+        if not all(29 <= max(days) <= 32 for days in months.values()):
+            return None
+        return year_data
+
+    def reload_year(self, year):
+        # Re-reads one year file after it changed on disk. Returns True if the year was replaced
+        # (or dropped, for a deleted file); an invalid file keeps the old data and is not looked
+        # at again until it changes.
+        filename = os.path.basename(self.year_path(year))
+        stamp = self.file_stamp(filename)
+        year_data = self.read_year_file(year)
+        if year_data is None:
+            print(f"Warning: Ignoring incomplete or invalid file: {filename}")
+            self.file_stamps[filename] = stamp
+            return False
+        self.replace_year(year, year_data)
+        if stamp is None:
+            self.file_stamps.pop(filename, None)
+        else:
+            self.file_stamps[filename] = stamp
+        return True
+
+    def replace_year(self, year, year_data):
+        # install_data for a single B.S. year: only that year's entries in the maps are rebuilt,
+        # and its dates are spliced into sorted_dates. New containers are swapped in as usual.
+        old_dates = set()
+        for month_index in range(len(NEPALI_MONTHS)):
+            old_dates.update(data['gregorian_date'] for data in self.nepali_month_map.get((year, month_index), ()))
+        year_data = dict(year_data)
+        for date_str, data in self.on_demand_data.items():
+            if data['nepali_year'] == year:
+                year_data.setdefault(date_str, data)
+
+        calendar_data = dict(self.calendar_data)
+        for date_str in old_dates:
+            del calendar_data[date_str]
+        calendar_data.update(year_data)
+
+        prefix = f"{year}-"
+        nepali_to_gregorian_map = {key: data for key, data in self.nepali_to_gregorian_map.items()
+                                   if not key.startswith(prefix)}
+        nepali_month_map = {key: days for key, days in self.nepali_month_map.items() if key[0] != year}
+        new_dates = sorted(year_data)
+        for date_str in new_dates:
+            data = year_data[date_str]
+            nepali_to_gregorian_map[f"{year}-{data['nepali_month_index'] + 1:02d}-{data['nepali_day']:02d}"] = data
+            nepali_month_map.setdefault((year, data['nepali_month_index']), []).append(data)
+
+        # A B.S. year covers a contiguous run of A.D. dates, so its old dates come out as one
+        # slice and the new ones go in as another; anything else falls back to a full sort.
+        sorted_dates = self.sorted_dates
+        if old_dates:
+            low, high = bisect.bisect_left(sorted_dates, min(old_dates)), bisect.bisect_right(sorted_dates, max(old_dates))
+            sorted_dates = sorted_dates[:low] + sorted_dates[high:] if high - low == len(old_dates) else None
+        if sorted_dates is not None and new_dates:
+            low = bisect.bisect_left(sorted_dates, new_dates[0])
+            if low == bisect.bisect_right(sorted_dates, new_dates[-1]):
+                sorted_dates = sorted_dates[:low] + new_dates + sorted_dates[low:]
+            else:
+                sorted_dates = None
+        if sorted_dates is None or len(sorted_dates) != len(calendar_data):
+            sorted_dates = sorted(calendar_data)
+        self.working_days.rebuild(sorted_dates, calendar_data)
+
+        self.calendar_data = calendar_data
+        self.nepali_to_gregorian_map = nepali_to_gregorian_map
+        self.sorted_dates = sorted_dates
+        self.nepali_month_map = nepali_month_map
+        self._calendar_arrays = None
+        self._calendar_index = None
+        self._bs_calendar = None
+        self.data_version += 1
+
+    def changes_since(self, version=0):
+        # Corrections the syncs have written since `version` (see ChangeFeed).
+        return self.change_feed.changes_since(version)
+
+    def estimate_nepali_months(self, date_str):
+        # The B.S. months an A.D. date may fall in: the one whose approximate start it follows,
+        # plus its neighbour when the date is within a few days of a month boundary.
+        day = datetime.strptime(date_str, "%Y-%m-%d").date()
+        starts = []
+        for gregorian_year in (day.year - 1, day.year):
+            for month_index, (month, start_day) in enumerate(self.NEPALI_MONTH_STARTS):
+                start = date(gregorian_year + (month_index >= 9), month, start_day)
+                starts.append((start, gregorian_year + 57, month_index))
+        months = []
+        for (start, year, month_index), (next_start, _, _) in zip(starts, starts[1:]):
+            if (start - day).days <= 3 and (day - next_start).days < 3:
+                months.append((year, month_index))
+        return months
@@ -0,0 +1,159 @@
+from datetime import date, timedelta
+from src.tithi import tithi_code
+
+WEEKDAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+# Bitmap indexes over the day-number space (days since the first loaded Gregorian date). Each
+# bitmap is a plain Python int, so AND/OR/NOT over all 101 years are single big-int operations.
+class CalendarIndex:
+    def __init__(self, calendar_data):
+        sorted_dates = sorted(calendar_data)
+        self.base_date = date.fromisoformat(sorted_dates[0]) if sorted_dates else date(1970, 1, 1)
+        self.span = (date.fromisoformat(sorted_dates[-1]) - self.base_date).days + 1 if sorted_dates else 0
+        self.day_strings = [(self.base_date + timedelta(days=offset)).isoformat() for offset in range(self.span)]
+
+        bitmaps = {}
+        def set_bit(key, offset):
+            bitmap = bitmaps.get(key)
+            if bitmap is None:
+                bitmap = bitmaps[key] = bytearray((self.span + 7) // 8)
+            bitmap[offset >> 3] |= 1 << (offset & 7)
+
+        weekday_index = {name: i for i, name in enumerate(WEEKDAYS)}
+        for date_str in sorted_dates:
+            data = calendar_data[date_str]
+            offset = (date.fromisoformat(date_str) - self.base_date).days
+            set_bit(("all",), offset)
+            set_bit(("tithi", tithi_code(data['tithi'])), offset)
+            set_bit(("weekday", weekday_index.get(data['weekday'], -1)), offset)
+            set_bit(("bs_month", data['nepali_month_index'] + 1), offset)
+            set_bit(("bs_year", data['nepali_year']), offset)
+            if data['is_holiday']:
+                set_bit(("holiday",), offset)
+            if data['events']:
+                set_bit(("has_events",), offset)
+
+        self.bitmaps = {key: int.from_bytes(bitmap, 'little') for key, bitmap in bitmaps.items()}
+        self.all_days = self.bitmaps.get(("all",), 0)
+
+    def bitmap(self, *key):
+        return self.bitmaps.get(key, 0)
+
+    def offset_of(self, date_str):
+        return (date.fromisoformat(date_str) - self.base_date).days
+
+    def evaluate(self, query):
+        return query.evaluate(self) & self.all_days
+
+    def count(self, query):
+        return self.evaluate(query).bit_count()
+
+    def offset_ranges(self, query):
+        # Runs of consecutive matching days as [start, end) day offsets. Walks the bitmap one
+        # 64-bit word at a time so sparse results skip empty stretches cheaply.
+        bits = self.evaluate(query)
+        words = memoryview(bits.to_bytes((self.span + 63) // 64 * 8, 'little')).cast('Q')
+        runs = []
+        for word_index, word in enumerate(words):
+            base = word_index * 64
+            while word:
+                low = (word & -word).bit_length() - 1
+                shifted = word >> low
+                run = (shifted ^ (shifted + 1)).bit_length() - 1
+                start = base + low
+                if runs and runs[-1][1] == start:
+                    runs[-1][1] = start + run
+                else:
+                    runs.append([start, start + run])
+                word = (shifted >> run) << (low + run)
+        return runs
+
+    def ranges(self, query):
+        # Inclusive (start, end) A.D. date string pairs.
+        return [(self.day_strings[start], self.day_strings[end - 1]) for start, end in self.offset_ranges(query)]
+
+    def dates(self, query):
+        dates = []
+        for start, end in self.offset_ranges(query):
+            dates.extend(self.day_strings[start:end])
+        return dates
+
+class Query:
+    def __and__(self, other):
+        return _Combined(self, other, lambda a, b: a & b)
+
+    def __or__(self, other):
+        return _Combined(self, other, lambda a, b: a | b)
+
+    def __invert__(self):
+        return _Not(self)
+
+class _Combined(Query):
+    def __init__(self, left, right, operator):
+        self.left, self.right, self.operator = left, right, operator
+
+    def evaluate(self, index):
+        return self.operator(self.left.evaluate(index), self.right.evaluate(index))
+
+class _Not(Query):
+    def __init__(self, query):
+        self.query = query
+
+    def evaluate(self, index):
+        return index.all_days & ~self.query.evaluate(index)
+
+class _Bitmap(Query):
+    def __init__(self, *key):
+        self.key = key
+
+    def evaluate(self, index):
+        return index.bitmap(*self.key)
+
+class _BSYearRange(Query):
+    def __init__(self, start_year, end_year):
+        self.start_year, self.end_year = start_year, end_year
+
+    def evaluate(self, index):
+        bits = 0
+        for year in range(self.start_year, self.end_year + 1):
+            bits |= index.bitmap("bs_year", year)
+        return bits
+
+class _ADRange(Query):
+    def __init__(self, start_date_str, end_date_str):
+        self.start_date_str, self.end_date_str = start_date_str, end_date_str
+
+    def evaluate(self, index):
+        start = max(index.offset_of(self.start_date_str), 0)
+        end = min(index.offset_of(self.end_date_str), index.span - 1)
+        if end < start:
+            return 0
+        return ((1 << (end + 1)) - 1) ^ ((1 << start) - 1)
+
+def tithi(name_or_code):
+    # tithi(0) selects the days without a recognised tithi; an unknown name is an error.
+    if isinstance(name_or_code, int):
+        return _Bitmap("tithi", name_or_code)
+    code = tithi_code(name_or_code)
+    if not code:
+        raise ValueError(f"Unknown tithi '{name_or_code}'.")
+    return _Bitmap("tithi", code)
+
+def weekday(name_or_index):
+    return _Bitmap("weekday", name_or_index if isinstance(name_or_index, int) else WEEKDAYS.index(name_or_index.title()))
+
+def bs_month(month):
+    # 1-based B.S. month (1 = Baishakh).
+    return _Bitmap("bs_month", month)
+
+def bs_years(start_year, end_year=None):
+    return _BSYearRange(start_year, start_year if end_year is None else end_year)
+
+def ad_range(start_date_str, end_date_str):
+    return _ADRange(start_date_str, end_date_str)
+
+def holiday():
+    return _Bitmap("holiday")
+
+def has_events():
+    return _Bitmap("has_events")
@@ -0,0 +1,305 @@
+import os
+import time
+import json
+import threading
+from src.calendar_data import NEPALI_MONTHS
+from src.scraper import CalendarScraper
+from src.sync_metrics import SyncMetrics
+from src.file_utils import atomic_write
+from src.change_feed import diff_days, load_year_file
+from src.sync_pipeline import YearAssembler, BulkSyncPipeline
+from src.sync_retry import RetryPolicy, CircuitBreaker, AdaptiveThrottle, MonthFetcher
+from src.sync_queue import MonthRequestQueue, SyncCoordinator
+from src.sync_lease import SyncLease
+
+# Keeps a CalendarData in step with the calendar site. Progress is reported through plain
+# callback hooks, all called on the thread that runs the sync:
+#   on_progress(message, detail), on_month_synced(year, month_index), on_finished().
+# on_month_requested() and on_sync_requested() are called from whichever thread asked for work
+# when a sync thread has to be woken to run process_month_requests() / process_sync_jobs().
+class CalendarSync:
+    # Syncing this many missing years or more switches to the pipelined bulk sync.
+    BULK_SYNC_MIN_YEARS = 2
+    BULK_FETCH_WORKERS = 3
+    BULK_PARSE_WORKERS = None
+    # Years are claimed this many at a time, so another process that starts syncing the same
+    # range meanwhile takes the later ones instead of waiting for this one to finish them.
+    CLAIM_BATCH_YEARS = 4
+    # A month the user asked for that could not be fetched is not retried for this long.
+    MONTH_REQUEST_COOLDOWN_SECONDS = 60
+
+    def __init__(self, calendar, metrics=None, scraper=None):
+        self.calendar = calendar
+        self.sync_metrics = metrics or SyncMetrics()
+        # Requests are paced by the shared throttle rather than a fixed sleep in the scraper.
+        self.scraper = scraper or CalendarScraper(metrics=self.sync_metrics, request_delay=0)
+        self.retry_policy = RetryPolicy()
+        self.circuit_breaker = CircuitBreaker()
+        self.throttle = AdaptiveThrottle()
+        # Months the user is looking at jump ahead of the background sync through this queue.
+        self.month_requests = MonthRequestQueue()
+        self.sync_jobs = SyncCoordinator(self.sync_metrics)
+        # Years being synced are claimed, so another process syncing into the same data
+        # directory (a CLI run next to the widget) takes different ones.
+        self.lease = SyncLease(calendar.data_dir)
+        self.is_syncing = False
+        self.cancel_event = threading.Event()
+        self.on_progress = None
+        self.on_month_synced = None
+        self.on_finished = None
+        self.on_month_requested = None
+        self.on_sync_requested = None
+        self._fetcher = None
+        self._user_months = set()
+        self._failed_requests = {}
+
+    def request_month(self, year, month_index):
+        # Safe to call from any thread. Returns True if the month is (now) queued for fetching.
+        if self.calendar.has_month(year, month_index) or not 0 <= month_index < len(NEPALI_MONTHS):
+            return False
+        failed_at = self._failed_requests.get((year, month_index))
+        if failed_at is not None and time.monotonic() - failed_at < self.MONTH_REQUEST_COOLDOWN_SECONDS:
+            return False
+        if self.month_requests.priority_of(year, month_index) == MonthRequestQueue.USER:
+            return True
+        self._user_months.add((year, month_index))
+        self.month_requests.put(year, month_index, MonthRequestQueue.USER)
+        # A running sync picks the month up from the queue straight away; otherwise the owner
+        # has to call process_month_requests() on its sync thread.
+        self._notify(self.on_month_requested)
+        return True
+
+    def request_date(self, date_str):
+        if self.calendar.get_data_for_date(date_str):
+            return False
+        requested = False
+        for year, month_index in self.calendar.estimate_nepali_months(date_str):
+            requested = self.request_month(year, month_index) or requested
+        return requested
+
+    def cancel_sync(self):
+        # Safe to call from any thread; the running sync stops after its in-flight requests.
+        self.cancel_event.set()
+        self.sync_jobs.cancel_running()
+        fetcher = self._fetcher
+        if fetcher is not None:
+            fetcher.stop_event.set()
+
+    def close(self):
+        # On shutdown: stops a running sync and gives up its year claims straight away, rather
+        # than leaving other processes to wait for them to go stale.
+        self.cancel_sync()
+        self.lease.stop()
+
+    def _notify(self, hook, *args):
+        if hook is not None:
+            hook(*args)
+
+    def _report_progress(self, message):
+        detail = self.sync_metrics.progress()
+        detail["message"] = message
+        self._notify(self.on_progress, message, detail)
+
+    def _write_year_data(self, year, all_year_data):
+        if not self.lease.renew(year):
+            self.sync_metrics.increment("years_claim_lost")
+            self._report_progress(f"Another process took over {year} B.S. Not saving it.")
+            return
+        path = self.calendar.year_path(year)
+        with self.sync_metrics.stage("diff"):
+            changes = diff_days(load_year_file(path), all_year_data)
+        with self.sync_metrics.stage("write"):
+            with atomic_write(path) as f:
+                for key, value in all_year_data.items():
+                    json.dump({key:value}, f, ensure_ascii=False)
+                    f.write("\n")
+            # Logged after the year file is in place: the data files stay the source of truth.
+            self.calendar.change_feed.append(year, changes)
+        self.sync_metrics.increment("years_written")
+        self.sync_metrics.increment("days_changed", len(changes))
+        self._report_progress(f"Saved data for {year} B.S.")
+
+    def _on_year_synced(self, year, all_year_data, failed_months):
+        # An incomplete year is not written: the existing file (if any) stays as it is, and a
+        # missing year is picked up again by the next sync instead of being saved with holes.
+        if failed_months:
+            self.sync_metrics.increment("years_incomplete")
+            names = ", ".join(NEPALI_MONTHS[i] for i in failed_months)
+            self._report_progress(f"Could not fetch {names} {year}. Keeping the existing data for {year} B.S.")
+            return
+        self._write_year_data(year, all_year_data)
+
+    def _on_month_fetched(self, assembler, year, month_index, month_data, started):
+        # Every fetched month comes through here, from the background sync or a user request;
+        # months of the years being synced also go to the assembler.
+        months = NEPALI_MONTHS
+        metrics = self.sync_metrics
+        metrics.month_completed(metrics.month_key(year, month_index), time.perf_counter() - started, bool(month_data))
+        if (year, month_index) in self._user_months:
+            self._user_months.discard((year, month_index))
+            # The site may answer with a different month than was asked for (the year and month
+            # name come from the page's header), so only records of the requested month are
+            # merged. If that leaves the month missing it counts as failed, or the view would ask
+            # for it again straight away.
+            requested = {date_str: data for date_str, data in month_data.items()
+                         if data['nepali_year'] == year and data['nepali_month'] == months[month_index]}
+            if requested:
+                self.calendar.merge_month(requested)
+            if self.calendar.has_month(year, month_index):
+                self._failed_requests.pop((year, month_index), None)
+            else:
+                self._failed_requests[(year, month_index)] = time.monotonic()
+            self._notify(self.on_month_synced, year, month_index)
+        if assembler is not None and year in assembler.pending:
+            self._report_progress(f"{'Synced' if month_data else 'Failed'} {months[month_index]} {year}.")
+            assembler.add(year, month_index, month_data)
+
+    def _new_fetcher(self):
+        fetcher = MonthFetcher(self.scraper, self.retry_policy, self.circuit_breaker, self.throttle,
+                               metrics=self.sync_metrics, progress=self._report_progress)
+        self._fetcher = fetcher
+        if self.cancel_event.is_set():
+            fetcher.stop_event.set()
+        return fetcher
+
+    def _queue_years(self, years):
+        for year in years:
+            for month_index in range(len(NEPALI_MONTHS)):
+                self.month_requests.put(year, month_index, MonthRequestQueue.BACKGROUND)
+
+    def _run_bulk_sync(self, years):
+        # Returns the years still to sync, so a broken process pool falls back to the
+        # one-month-at-a-time loop for whatever it did not finish.
+        finished = []
+        def on_year(year, all_year_data, failed_months):
+            self._on_year_synced(year, all_year_data, failed_months)
+            finished.append(year)
+
+        self._report_progress(f"Bulk syncing {len(years)} years ({years[0]}-{years[-1]} B.S.)...")
+        assembler = YearAssembler(years, len(NEPALI_MONTHS), on_year)
+        self._queue_years(years)
+        pipeline = BulkSyncPipeline(self._new_fetcher(), self.sync_metrics, fetch_workers=self.BULK_FETCH_WORKERS,
+                                    parse_workers=self.BULK_PARSE_WORKERS)
+        try:
+            pipeline.run(self.month_requests, lambda *month: self._on_month_fetched(assembler, *month))
+        except Exception as e:
+            print(f"Bulk sync failed ({e}); continuing one month at a time.")
+        print(f"Bulk sync: page queue high water {pipeline.stats['queue_high_water']}, "
+              f"fetchers blocked {pipeline.stats['fetch_blocked_s']:.1f}s.")
+        return [year for year in years if year not in finished]
+
+    def _run_sequential_sync(self, years, forced_years):
+        months = NEPALI_MONTHS
+        assembler = YearAssembler(years, len(months), self._on_year_synced)
+        self._queue_years(years)
+
+        announced = set()
+        def on_page(year, month_index, html, started):
+            if year in forced_years and year in assembler.pending and year not in announced:
+                announced.add(year)
+                self._report_progress(f"Force resyncing data for {year} B.S....")
+            month_data = self.scraper.parse_month(html, year, months[month_index], month_index) if html else {}
+            self._on_month_fetched(assembler, year, month_index, month_data, started)
+        self._new_fetcher().run(self.month_requests, on_page)
+
+    def process_month_requests(self):
+        # Fetches the months the user asked for while no sync is running. During a sync the
+        # sync's own fetchers take them from the shared queue first.
+        if not len(self.month_requests):
+            return
+        self.cancel_event.clear()
+        self.circuit_breaker.reset()
+        self._run_sequential_sync([], set())
+        self._fetcher = None
+
+    def request_sync(self, start_year, end_year, force=False):
+        # Safe to call from any thread. Repeated requests coalesce into one sync and one reload,
+        # which the owner runs by calling process_sync_jobs() on its sync thread.
+        if self.sync_jobs.submit(start_year, end_year, force):
+            self._notify(self.on_sync_requested)
+
+    def process_sync_jobs(self):
+        job = self.sync_jobs.take()
+        while job is not None:
+            years, forced_years = job
+            self._sync_years(years, forced_years)
+            job = self.sync_jobs.take()
+
+    def run_sync(self, start_year, end_year, force=False):
+        years = list(range(start_year, end_year + 1))
+        self._sync_years(years, set(years) if force else set())
+
+    def _claim_years(self, years, forced_years):
+        # Claims the next batch of years, in order. Returns (claimed, left, looked_at): the years
+        # this process now holds, the ones left to another process because it holds them (or,
+        # unless forced, finished them since this calendar was loaded) and how many were tried.
+        claimed, left = [], []
+        looked_at = 0
+        for year in years:
+            if len(claimed) == self.CLAIM_BATCH_YEARS:
+                break
+            looked_at += 1
+            (claimed if self.lease.claim(year) else left).append(year)
+        # Checked after claiming, since a process writes its year before releasing it.
+        changed = set(self.calendar.changed_years()) if claimed else set()
+        finished = [year for year in claimed if year not in forced_years and year in changed
+                    and os.path.exists(self.calendar.year_path(year))]
+        self.lease.release(finished)
+        return [year for year in claimed if year not in finished], left + finished, looked_at
+
+    def _leave_years(self, years):
+        # The data folder watcher, or the reload at the end of the sync, picks their files up.
+        for year in years:
+            self.sync_metrics.increment("years_claimed_elsewhere")
+            holder = self.lease.holder(year)
+            if holder is not None:
+                self._report_progress(f"{year} B.S. is being synced by another process ({holder['owner']}). Skipping.")
+            else:
+                self._report_progress(f"{year} B.S. was synced by another process. Skipping.")
+        self.sync_metrics.reduce_total(len(years) * len(NEPALI_MONTHS))
+
+    def _sync_years(self, years, forced_years):
+        metrics = self.sync_metrics
+        pending_years = [year for year in years
+                         if year in forced_years or not self.calendar.has_year(year)]
+        metrics.begin_sync(len(pending_years) * len(NEPALI_MONTHS))
+        self.cancel_event.clear()
+        self.is_syncing = True
+        years_written = metrics.counters["years_written"]
+
+        for year in years:
+            if year not in pending_years:
+                metrics.increment("years_skipped")
+                self._report_progress(f"Data for {year} B.S. exists. Skipping sync.")
+
+        self.circuit_breaker.reset()
+        years_left = []
+        while pending_years and not self.cancel_event.is_set():
+            batch, left, looked_at = self._claim_years(pending_years, forced_years)
+            pending_years = pending_years[looked_at:]
+            self._leave_years(left)
+            years_left.extend(left)
+            try:
+                if len(batch) >= self.BULK_SYNC_MIN_YEARS:
+                    batch = self._run_bulk_sync(batch)
+                if batch and not self.cancel_event.is_set():
+                    self._run_sequential_sync(batch, forced_years)
+            finally:
+                self.lease.release()
+
+        # Nothing is claimed between syncs, so the heartbeat thread is not kept around either.
+        self.lease.stop()
+
+        # Whatever the sync left behind (all of it, if cancelled) is dropped; months the user
+        # asked for stay queued.
+        self.month_requests.discard(MonthRequestQueue.BACKGROUND)
+        self._fetcher = None
+        self.is_syncing = False
+        if self.cancel_event.is_set():
+            self._report_progress("Sync cancelled.")
+        # Nothing to reload if every year was already there and none came from elsewhere.
+        if metrics.counters["years_written"] != years_written or years_left:
+            with metrics.stage("reload"):
+                self.calendar.load_all_data()
+        metrics.end_sync()
+        self._notify(self.on_finished)
@@ -0,0 +1,112 @@
+import os
+import json
+import threading
+from datetime import datetime, timezone
+from src.file_utils import file_lock
+
+# Fields compared per day. Events are diffed as sets; anything else that differs is reported
+# with its old and new value.
+TRACKED_FIELDS = ("tithi", "is_holiday", "weekday", "nepali_date", "gregorian_date_expanded", "nepali_date_expanded")
+
+def load_year_file(path):
+    data = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                data.update(json.loads(line))
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return data
+
+def diff_day(old, new):
+    # Returns the change record for one day, or None if nothing that matters changed.
+    change = {}
+    for field in TRACKED_FIELDS:
+        if old.get(field) != new.get(field):
+            change[field] = [old.get(field), new.get(field)]
+    old_events, new_events = old.get('events') or [], new.get('events') or []
+    if old_events != new_events:
+        added = [event for event in new_events if event not in old_events]
+        removed = [event for event in old_events if event not in new_events]
+        if added:
+            change["events_added"] = added
+        if removed:
+            change["events_removed"] = removed
+    return change or None
+
+def diff_days(old_data, new_data):
+    # Semantic per-day diff between two {date: record} maps, in date order. Unchanged records
+    # compare equal as whole dicts, so the field-by-field work is only done for changed days.
+    changes = []
+    for date_str in sorted(old_data.keys() | new_data.keys()):
+        old, new = old_data.get(date_str), new_data.get(date_str)
+        if old == new:
+            continue
+        if old is None:
+            changes.append({"date": date_str, "op": "added", "day": new})
+        elif new is None:
+            changes.append({"date": date_str, "op": "removed"})
+        else:
+            change = diff_day(old, new)
+            if change:
+                change.update(date=date_str, op="changed", day=new)
+                changes.append(change)
+    return changes
+
+# Append-only log next to the data files, one JSON line per written year that changed:
+#   {"version": N, "time": ..., "year": Y, "changes": [...]}
+# Versions increase by one per entry, so a consumer that has applied version N asks for
+# changes_since(N) and applies the rest in order. Each change carries the full new record.
+class ChangeFeed:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        # Another process syncing into the same data directory appends to the same log, so
+        # appends take a file lock and first read whatever was added since this one last looked.
+        self._file_lock_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.lock")
+        self._offset = 0
+        self.version = 0
+        self._catch_up()
+
+    def _catch_up(self):
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    if line.strip():
+                        self.version = json.loads(line)["version"]
+                    self._offset += len(line)
+        except FileNotFoundError:
+            return
+
+    def _entries(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def append(self, year, changes):
+        if not changes:
+            return self.version
+        with self._lock, file_lock(self._file_lock_path):
+            self._catch_up()
+            entry = {"version": self.version + 1, "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                     "year": year, "changes": changes}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._catch_up()
+            return self.version
+
+    def changes_since(self, version=0):
+        # Yields the log entries after `version`, oldest first.
+        for entry in self._entries():
+            if entry["version"] > version:
+                yield entry
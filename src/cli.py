@@ -0,0 +1,218 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import contextlib
+from datetime import date
+from itertools import islice
+
+from src.calendar_data import CalendarData
+from src.change_feed import ChangeFeed
+from src.export import WRITERS, ad_range_date, bs_to_ad_date, iter_days, filter_days
+from src.shard_export import export_shards
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+AD_TO_BS_COLUMNS = ["nepali_date", "nepali_year", "nepali_month", "nepali_day", "weekday", "tithi", "is_holiday", "events"]
+BS_TO_AD_COLUMNS = ["gregorian_date", "weekday", "tithi", "is_holiday", "events"]
+
+def _parse_date_triple(value):
+    parts = value.strip().replace("/", "-").split("-")
+    if len(parts) != 3:
+        return None
+    try:
+        return int(parts[0]), int(parts[1]), int(parts[2])
+    except ValueError:
+        return None
+
+def _format_columns(data, columns):
+    if not data:
+        return [""] * len(columns)
+    row = []
+    for column in columns:
+        if column not in data:
+            row.append("")
+            continue
+        value = data[column]
+        if column == "events":
+            value = "; ".join(value or [])
+        elif column == "is_holiday":
+            value = int(bool(value))
+        row.append(value)
+    return row
+
+def _computed_tithis(date_strs):
+    # One engine call for a whole chunk of dates outside the data. Nothing is cached, so a long
+    # stream does not grow the calendar's own cache of computed tithis.
+    from src.tithi_engine import tithi_codes
+    from src.tithi import tithi_name
+    return [tithi_name(int(code)) for code in tithi_codes(date_strs)]
+
+def convert_ad_to_bs_many(data_manager, values):
+    results, missing = [], []
+    for value in values:
+        triple = _parse_date_triple(value)
+        try:
+            date_str = date(*triple).isoformat() if triple else None
+        except ValueError:
+            date_str = None
+        data = data_manager.get_data_for_date(date_str) if date_str else None
+        if data is None and date_str:
+            # Outside the data there is no B.S. date, but the tithi can still be computed.
+            missing.append((len(results), date_str))
+        results.append(data)
+    if missing:
+        for (index, _), tithi in zip(missing, _computed_tithis([date_str for _, date_str in missing])):
+            results[index] = {"tithi": tithi}
+    return results
+
+def convert_ad_to_bs(data_manager, value):
+    return convert_ad_to_bs_many(data_manager, [value])[0]
+
+def convert_bs_to_ad(data_manager, value):
+    triple = _parse_date_triple(value)
+    if not triple or not 1 <= triple[1] <= 12:
+        return None
+    return data_manager.lookup_bs_to_ad(triple[0], triple[1] - 1, triple[2])
+
+def convert_bs_to_ad_many(data_manager, values):
+    return [convert_bs_to_ad(data_manager, value) for value in values]
+
+def _resolve_column(header, column):
+    if column is None:
+        return 0
+    if column.isdigit():
+        return int(column)
+    if header and column in header:
+        return header.index(column)
+    raise SystemExit(f"Column '{column}' not found in input header.")
+
+def convert_stream(data_manager, reader, writer, direction, column=None, has_header=True, chunk_size=10000):
+    convert, columns = (convert_ad_to_bs_many, AD_TO_BS_COLUMNS) if direction == "ad2bs" else (convert_bs_to_ad_many, BS_TO_AD_COLUMNS)
+
+    header = next(reader, None) if has_header else None
+    if has_header:
+        if header is None:
+            return 0
+        writer.writerow(header + columns)
+    column_index = _resolve_column(header, column)
+
+    rows_converted = 0
+    while True:
+        chunk = list(islice(reader, chunk_size))
+        if not chunk:
+            break
+        values = [row[column_index] if column_index < len(row) else "" for row in chunk]
+        results = convert(data_manager, values)
+        writer.writerows(row + _format_columns(data, columns) for row, data in zip(chunk, results))
+        rows_converted += len(chunk)
+    return rows_converted
+
+def _open_input(path):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, "r", encoding="utf-8", newline="")
+
+def _open_output(path):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    return open(path, "w", encoding="utf-8", newline="")
+
+def load_data_manager(data_dir):
+    # CalendarData reports progress on stdout, which may be carrying our CSV output.
+    with contextlib.redirect_stdout(sys.stderr):
+        return CalendarData(data_dir)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Headless MitiTithi date conversion tools.")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Directory holding calendar_*.jsonl files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for direction, help_text in (("ad2bs", "Convert A.D. dates (YYYY-MM-DD) to B.S. with tithi/holiday columns."),
+                                 ("bs2ad", "Convert B.S. dates (YYYY-MM-DD) to A.D.")):
+        sub = subparsers.add_parser(direction, help=help_text)
+        sub.add_argument("input", nargs="?", default="-", help="Input CSV file, or - for stdin (default).")
+        sub.add_argument("-o", "--output", default="-", help="Output CSV file, or - for stdout (default).")
+        sub.add_argument("-c", "--column", help="Name or index of the date column (default: first column).")
+        sub.add_argument("--no-header", action="store_true", help="Input has no header row.")
+        sub.add_argument("--chunk-size", type=int, default=10000, help="Rows converted and written per chunk.")
+
+    export = subparsers.add_parser("export", help="Export days with their holidays and events as iCalendar or CSV.")
+    export.add_argument("start", nargs="?", help="First day: YYYY-MM-DD, YYYY-MM or YYYY (B.S. unless --ad; default: first synced day).")
+    export.add_argument("end", nargs="?", help="Last day, same forms (default: the whole of start, or the last synced day).")
+    export.add_argument("--ad", action="store_true", help="start and end are A.D. dates (YYYY-MM-DD).")
+    export.add_argument("-f", "--format", choices=sorted(WRITERS), default="ics")
+    export.add_argument("-o", "--output", default="-", help="Output file, or - for stdout (default).")
+    export.add_argument("--holidays", action="store_true", help="Only public holidays.")
+    export.add_argument("--include-saturdays", action="store_true", help="With --holidays, also export plain Saturdays.")
+    export.add_argument("--events", metavar="PATTERN", help="Only days with an event matching this regular expression.")
+    export.add_argument("--tithi", help="Only days on this tithi, e.g. Purnima or एकादशी.")
+
+    changes = subparsers.add_parser("changes", help="Print the calendar corrections logged by syncs, as JSON lines.")
+    changes.add_argument("--since", type=int, default=0, help="Only entries after this change-log version.")
+
+    shards = subparsers.add_parser("shards", help="Write one content-hashed JSON shard per B.S. month plus manifest.json, for static serving.")
+    shards.add_argument("out_dir", help="Output directory; shards already there for unchanged years are kept.")
+    shards.add_argument("--force", action="store_true", help="Regenerate every year, even if its data file is unchanged.")
+    shards.add_argument("--prune", action="store_true", help="Delete shards the new manifest no longer lists.")
+    return parser
+
+def _export_range(data_manager, args):
+    if args.ad:
+        if not args.start:
+            return None, None
+        return ad_range_date(args.start), ad_range_date(args.end or args.start, end=True)
+    start = bs_to_ad_date(data_manager, args.start) if args.start else None
+    end = bs_to_ad_date(data_manager, args.end or args.start, end=True) if args.start else None
+    if args.start and (start is None or end is None):
+        raise SystemExit("Date out of sync range.")
+    return start, end
+
+def export(data_manager, args):
+    try:
+        start, end = _export_range(data_manager, args)
+        days = filter_days(iter_days(data_manager, start, end), holidays=args.holidays,
+                           include_saturdays=args.include_saturdays, pattern=args.events, tithi=args.tithi)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if args.output == "-":
+        # iCalendar needs CRLF line ends as written, not translated.
+        sys.stdout.reconfigure(newline="")
+    with _open_output(args.output) as outfile:
+        return WRITERS[args.format](days, outfile)
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "changes":
+        # Only the log is needed, not the calendar.
+        for entry in ChangeFeed(os.path.join(args.data_dir, "changes.jsonl")).changes_since(args.since):
+            print(json.dumps(entry, ensure_ascii=False))
+        return
+    if args.command == "shards":
+        # Reads only the year files that changed since the last export.
+        start = time.perf_counter()
+        stats = export_shards(args.data_dir, args.out_dir, force=args.force, prune=args.prune)
+        print(f"Regenerated {stats['years_regenerated']} years ({stats['shards_written']} shards), "
+              f"kept {stats['years_unchanged']}, pruned {stats['shards_pruned']} in {time.perf_counter() - start:.2f}s.", file=sys.stderr)
+        return
+    data_manager = load_data_manager(args.data_dir)
+
+    if args.command == "export":
+        start = time.perf_counter()
+        days = export(data_manager, args)
+        elapsed = time.perf_counter() - start
+        rate = days / elapsed if elapsed > 0 else float("inf")
+        print(f"Exported {days} days in {elapsed:.2f}s ({rate:,.0f} days/sec).", file=sys.stderr)
+        return
+
+    start = time.perf_counter()
+    with _open_input(args.input) as infile, _open_output(args.output) as outfile:
+        rows = convert_stream(data_manager, csv.reader(infile), csv.writer(outfile), args.command,
+                              column=args.column, has_header=not args.no_header, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"Converted {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec).", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
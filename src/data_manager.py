@@ -1,106 +1,150 @@
 import os
-import json
 import time
-from datetime import datetime
-from src.scraper import CalendarScraper
-from PySide6.QtCore import QObject, Signal, Slot
+from src.calendar_data import CalendarData
+from src.calendar_sync import CalendarSync
+from PySide6.QtCore import QObject, Signal, Slot, QFileSystemWatcher, QTimer
 
+# The Qt side of CalendarData and CalendarSync: the window talks to this object, which lives on
+# the sync thread and turns the sync's callback hooks into signals.
 class DataManager(QObject):
     sync_progress = Signal(str)
+    sync_progress_detail = Signal(dict)
     sync_finished = Signal()
+    month_synced = Signal(int, int)
+    year_reloaded = Signal(int)
+    _month_requested = Signal()
+    _sync_requested = Signal()
+    RELOAD_DEBOUNCE_MS = 500
 
-    def __init__(self, data_dir="data"):
+    def __init__(self, data_dir="data", user_events=None):
         super().__init__()
-        self.data_dir = data_dir
-        self.calendar_data = {}
-        self.sorted_dates = []
-        self.scraper = CalendarScraper()
-        self.nepali_to_gregorian_map = {}
-        os.makedirs(self.data_dir, exist_ok=True)
-        self.load_all_data()
+        self.calendar = CalendarData(data_dir, user_events)
+        self.sync = CalendarSync(self.calendar)
+        self.sync.on_progress = self._on_progress
+        self.sync.on_month_synced = self.month_synced.emit
+        self.sync.on_finished = self.sync_finished.emit
+        # Requests made on the GUI thread reach the sync thread as queued signals.
+        self.sync.on_month_requested = self._month_requested.emit
+        self.sync.on_sync_requested = self._sync_requested.emit
+        self._month_requested.connect(self.process_month_requests)
+        self._sync_requested.connect(self.process_sync_jobs)
+
+        # Year files edited or dropped into the data directory by hand (or by another copy of the
+        # app) are reloaded one year at a time. Events are debounced, and a file is only read
+        # once its size and mtime have held still for a whole debounce interval. Both children
+        # move to the sync thread with this object, so reloads never race a sync.
+        self._pending_stamps = {}
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(self.RELOAD_DEBOUNCE_MS)
+        self.reload_timer.timeout.connect(self.reload_changed_years)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_data_dir_changed)
+        self.watcher.fileChanged.connect(self._on_data_dir_changed)
+        self._watch_data_dir()
+
+    def _watch_data_dir(self):
+        # Replacing a file drops it from the watch list, so this runs after every scan.
+        paths = [self.calendar.data_dir] + [os.path.join(self.calendar.data_dir, filename)
+                                            for filename in self.calendar.year_files().values()]
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        missing = [path for path in paths if path not in watched]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    @Slot(str)
+    def _on_data_dir_changed(self, path):
+        self.reload_timer.start()
+
+    @Slot()
+    def reload_changed_years(self):
+        calendar = self.calendar
+        changed = calendar.changed_years()
+        stamps = {year: calendar.file_stamp(os.path.basename(calendar.year_path(year))) for year in changed}
+        settled = [year for year in changed if self._pending_stamps.get(year, False) == stamps[year]]
+        self._pending_stamps = {year: stamp for year, stamp in stamps.items() if year not in settled}
+        for year in settled:
+            started = time.perf_counter()
+            if calendar.reload_year(year):
+                print(f"Reloaded {year} from disk in {(time.perf_counter() - started) * 1000:.1f} ms.")
+                self.year_reloaded.emit(year)
+        if self._pending_stamps:
+            # Still being written (or just seen for the first time): look again after a pause.
+            self.reload_timer.start()
+        self._watch_data_dir()
+
+    def _on_progress(self, message, detail):
+        self.sync_progress_detail.emit(detail)
+        self.sync_progress.emit(message)
+
+    @property
+    def calendar_data(self):
+        return self.calendar.calendar_data
+
+    @property
+    def sorted_dates(self):
+        return self.calendar.sorted_dates
+
+    @property
+    def user_events(self):
+        return self.calendar.user_events
+
+    @property
+    def working_days(self):
+        return self.calendar.working_days
+
+    @property
+    def sync_metrics(self):
+        return self.sync.sync_metrics
+
+    @property
+    def is_syncing(self):
+        return self.sync.is_syncing
 
     def get_data_for_date(self, date_str):
-        return self.calendar_data.get(date_str)
+        return self.calendar.get_data_for_date(date_str)
 
     def lookup_bs_to_ad(self, year, month_index, day):
-        key = f"{year}-{month_index + 1:02d}-{day:02d}"
-        return self.nepali_to_gregorian_map.get(key)
-    
+        return self.calendar.lookup_bs_to_ad(year, month_index, day)
+
     def get_data_for_nepali_month(self, year, month_index):
-        month_days = []
-        for date_str in self.sorted_dates:
-            data = self.calendar_data[date_str]
-            if data.get('nepali_year') == year and data.get('nepali_month_index') == month_index:
-                month_days.append(data)
-        return month_days
+        return self.calendar.get_data_for_nepali_month(year, month_index)
 
     def get_upcoming_events(self, from_date_str, limit=10):
-        upcoming_events = []
-        try:
-            start_index = self.sorted_dates.index(from_date_str)
-        except ValueError:
-            start_index = 0
-
-        for date_str in self.sorted_dates[start_index:]:
-            data = self.calendar_data[date_str]
-            if data.get('events'):
-                upcoming_events.append(data)
-            if len(upcoming_events) >= limit:
-                break
-        return upcoming_events
-
-    def load_all_data(self):
-        self.calendar_data = {}
-        self.nepali_to_gregorian_map = {}
-        for filename in os.listdir(self.data_dir):
-            if filename.endswith(".jsonl"):
-                try:
-                    with open(os.path.join(self.data_dir, filename), 'r', encoding='utf-8') as f:
-                        for line in f:
-                            data_dict = json.loads(line)
-                            self.calendar_data.update(data_dict)
-                            for greg_date, nep_data in data_dict.items():
-                                key = f"{nep_data['nepali_year']}-{nep_data['nepali_month_index'] + 1:02d}-{nep_data['nepali_day']:02d}"
-                                self.nepali_to_gregorian_map[key] = nep_data
-                except (json.JSONDecodeError, IndexError):
-                    print(f"Warning: Could not parse or invalid filename: {filename}")
-        
-        self.sorted_dates = sorted(self.calendar_data.keys())
-        print(f"Loaded {len(self.calendar_data)} days of data. Mapped {len(self.nepali_to_gregorian_map)} BS dates.")
+        return self.calendar.get_upcoming_events(from_date_str, limit)
+
+    def get_bs_calendar(self):
+        return self.calendar.get_bs_calendar()
+
+    def tithi_for_date(self, date_str):
+        return self.calendar.tithi_for_date(date_str)
+
+    def estimate_nepali_months(self, date_str):
+        return self.calendar.estimate_nepali_months(date_str)
+
+    def request_month(self, year, month_index):
+        return self.sync.request_month(year, month_index)
+
+    def request_date(self, date_str):
+        return self.sync.request_date(date_str)
+
+    def request_sync(self, start_year, end_year, force=False):
+        self.sync.request_sync(start_year, end_year, force)
+
+    def cancel_sync(self):
+        self.sync.cancel_sync()
+
+    def close(self):
+        self.sync.close()
+
+    @Slot()
+    def process_month_requests(self):
+        self.sync.process_month_requests()
+
+    @Slot()
+    def process_sync_jobs(self):
+        self.sync.process_sync_jobs()
 
     @Slot(int, int, bool)
     def run_sync(self, start_year, end_year, force=False):
-        for year in range(start_year, end_year + 1):
-            year_data_path = os.path.join(self.data_dir, f"calendar_{year}.jsonl")
-
-            if os.path.exists(year_data_path) and not force:
-                self.sync_progress.emit(f"Data for {year} B.S. exists. Skipping sync.")
-                continue
-            
-            if force:
-                self.sync_progress.emit(f"Force resyncing data for {year} B.S....")
-
-            all_year_data = {}
-            for i, month_name in enumerate(self.scraper.NEPALI_MONTHS_LIST):
-                self.sync_progress.emit(f"Fetching {month_name} {year}...")
-                month_data = self.scraper.scrape_month(year, month_name, i)
-                if month_data:
-                    all_year_data.update(month_data)
-                else:
-                    self.sync_progress.emit(f"Failed {month_name} {year}. Retrying...")
-                    time.sleep(5)
-                    month_data = self.scraper.scrape_month(year, month_name, i)
-                    if month_data:
-                        all_year_data.update(month_data)
-
-                time.sleep(1)
-
-            if all_year_data:
-                with open(year_data_path, 'w', encoding='utf-8') as f:
-                    for key, value in all_year_data.items():
-                        json.dump({key:value}, f, ensure_ascii=False)
-                        f.write("\n")
-                self.sync_progress.emit(f"Saved data for {year} B.S.")
-
-        self.load_all_data()
-        self.sync_finished.emit()
+        self.sync.run_sync(start_year, end_year, force)
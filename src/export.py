@@ -0,0 +1,129 @@
+import re
+import csv
+from datetime import date, datetime, timedelta, timezone
+from bisect import bisect_left, bisect_right
+from src.tithi import tithi_code
+
+CSV_COLUMNS = ["gregorian_date", "nepali_date", "nepali_month", "weekday", "tithi", "is_holiday", "events"]
+ICS_LINE_LIMIT = 75
+
+# Everything here is a generator over the loaded calendar, and the writers emit each day as it
+# comes, so an export holds one day at a time no matter how long the range is.
+
+def bs_to_ad_date(calendar, value, end=False):
+    # "YYYY", "YYYY-MM" or "YYYY-MM-DD" in B.S.; a partial date means the first (or, with end,
+    # the last) day it covers. Returns None if the calendar does not have that day.
+    try:
+        parts = [int(part) for part in value.replace("/", "-").split("-")]
+    except ValueError:
+        parts = []
+    if not 1 <= len(parts) <= 3:
+        raise ValueError(f"Invalid B.S. date '{value}', expected YYYY-MM-DD, YYYY-MM or YYYY.")
+    if len(parts) == 3:
+        data = calendar.lookup_bs_to_ad(parts[0], parts[1] - 1, parts[2])
+        return data['gregorian_date'] if data else None
+    month_index = parts[1] - 1 if len(parts) == 2 else (11 if end else 0)
+    month_days = calendar.get_data_for_nepali_month(parts[0], month_index)
+    if not month_days:
+        return None
+    return month_days[-1 if end else 0]['gregorian_date']
+
+def ad_range_date(value, end=False):
+    # The same forms in A.D., as a normalised YYYY-MM-DD. Raises ValueError for anything else.
+    value = value.replace("/", "-")
+    try:
+        if value.count("-") == 2:
+            return datetime.strptime(value, "%Y-%m-%d").date().isoformat()
+        first = datetime.strptime(value, "%Y-%m" if "-" in value else "%Y").date()
+    except ValueError:
+        raise ValueError(f"Invalid A.D. date '{value}', expected YYYY-MM-DD, YYYY-MM or YYYY.")
+    if not end:
+        return first.isoformat()
+    if "-" not in value:
+        return date(first.year, 12, 31).isoformat()
+    next_month = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+    return (next_month - timedelta(days=1)).isoformat()
+
+def iter_days(calendar, start=None, end=None):
+    # A.D. dates (inclusive); None for the first or last loaded day.
+    sorted_dates = calendar.sorted_dates
+    first = bisect_left(sorted_dates, start) if start else 0
+    last = bisect_right(sorted_dates, end) if end else len(sorted_dates)
+    calendar_data = calendar.calendar_data
+    for index in range(first, last):
+        yield calendar_data[sorted_dates[index]]
+
+def filter_days(days, holidays=False, include_saturdays=False, pattern=None, tithi=None):
+    # holidays keeps public holidays; every Saturday is a holiday in the data, so plain
+    # Saturdays are left out unless include_saturdays. pattern is a regular expression matched
+    # against the events (case-insensitive), tithi a tithi name in English or Nepali.
+    event_pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+    code = tithi_code(tithi) if tithi else None
+    if tithi and not code:
+        raise ValueError(f"Unknown tithi '{tithi}'.")
+    for data in days:
+        if holidays and not (data.get('is_holiday') and (include_saturdays or data['events'] or data['weekday'] != "Saturday")):
+            continue
+        if event_pattern and not any(event_pattern.search(event) for event in data['events']):
+            continue
+        if code and tithi_code(data['tithi']) != code:
+            continue
+        yield data
+
+def _summary(data):
+    if data['events']:
+        return ", ".join(data['events'])
+    return "Public holiday" if data.get('is_holiday') else data['tithi']
+
+def write_csv(days, out):
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    count = 0
+    for data in days:
+        writer.writerow([data['gregorian_date'], data['nepali_date'], data['nepali_month'], data['weekday'],
+                         data['tithi'], int(bool(data.get('is_holiday'))), "; ".join(data['events'])])
+        count += 1
+    return count
+
+def _ics_escape(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _ics_fold(line):
+    # RFC 5545 3.1: lines longer than 75 octets continue on the next line after a space, and a
+    # break must not split a UTF-8 sequence.
+    encoded = line.encode("utf-8")
+    if len(encoded) <= ICS_LINE_LIMIT:
+        return line + "\r\n"
+    parts = []
+    start, limit = 0, ICS_LINE_LIMIT
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start, limit = end, ICS_LINE_LIMIT - 1
+    return "\r\n ".join(parts) + "\r\n"
+
+def write_ics(days, out, calendar_name="Nepali Calendar"):
+    # One all-day VEVENT per day. UIDs depend only on the date, so importing a newer export
+    # updates the existing entries instead of duplicating them.
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//MitiTithi//Calendar Export//EN\r\nCALSCALE:GREGORIAN\r\n")
+    out.write(_ics_fold(f"X-WR-CALNAME:{_ics_escape(calendar_name)}"))
+    count = 0
+    for data in days:
+        day = datetime.strptime(data['gregorian_date'], "%Y-%m-%d")
+        summary = _summary(data)
+        description = f"{data['nepali_date_expanded']}, {data['tithi']}"
+        out.write("BEGIN:VEVENT\r\n")
+        out.write(f"UID:{day:%Y%m%d}@mititithi\r\nDTSTAMP:{stamp}\r\n")
+        out.write(f"DTSTART;VALUE=DATE:{day:%Y%m%d}\r\nDTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}\r\n")
+        out.write(_ics_fold(f"SUMMARY:{_ics_escape(summary)}"))
+        out.write(_ics_fold(f"DESCRIPTION:{_ics_escape(description)}"))
+        out.write("TRANSP:TRANSPARENT\r\n" if not data.get('is_holiday') else "TRANSP:OPAQUE\r\n")
+        out.write("END:VEVENT\r\n")
+        count += 1
+    out.write("END:VCALENDAR\r\n")
+    return count
+
+WRITERS = {"ics": write_ics, "csv": write_csv}
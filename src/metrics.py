@@ -0,0 +1,58 @@
+import bisect
+import threading
+
+# Upper bounds in seconds, roughly logarithmic from 50us to 60s.
+DEFAULT_LATENCY_BOUNDS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+class Histogram:
+    def __init__(self, bounds=DEFAULT_LATENCY_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p):
+        # Estimated by linear interpolation inside the bucket holding the p-th observation.
+        with self._lock:
+            if not self.count:
+                return None
+            rank = p / 100 * self.count
+            seen = 0
+            for i, bucket_count in enumerate(self.buckets):
+                if bucket_count and seen + bucket_count >= rank:
+                    lower = self.bounds[i - 1] if i > 0 else (self.min or 0.0)
+                    upper = self.bounds[i] if i < len(self.bounds) else self.max
+                    lower, upper = max(lower, self.min), min(upper, self.max)
+                    return lower + (upper - lower) * (rank - seen) / bucket_count
+                seen += bucket_count
+            return self.max
+
+    def to_dict(self):
+        summary = {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+        with self._lock:
+            summary["buckets"] = {("+Inf" if i == len(self.bounds) else repr(self.bounds[i])): n
+                                  for i, n in enumerate(self.buckets) if n}
+        return summary
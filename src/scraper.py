@@ -4,17 +4,41 @@ import json
 import pytz
 import time
 import requests
+import contextlib
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from src.calendar_data import NEPALI_MONTHS
+
+class FetchError(Exception):
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        # Connection errors and timeouts have no status; 404 and other client errors will not
+        # go away by asking again.
+        return self.status is None or self.status in (408, 429) or self.status >= 500
+
+def _retry_after_seconds(value):
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
 
 class CalendarScraper:
     BASE_URL = "https://www.ashesh.com.np/nepali-calendar/"
     HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
     HOLIDAY_COLOR = "#FF4D00"
-    NEPALI_MONTHS_LIST = [
-        "Baishakh", "Jestha", "Ashadh", "Shrawan", "Bhadra", "Ashwin", 
-        "Kartik", "Mangsir", "Poush", "Magh", "Falgun", "Chaitra"
-    ]
+    NEPALI_MONTHS_LIST = NEPALI_MONTHS
     NEPALI_MONTHS_MAP = {name: f"{i+1:02d}" for i, name in enumerate(NEPALI_MONTHS_LIST)}
     NEPALI_MONTHS_ALIAS = {
     "Baishakh": ["Baishakh", "Baisakh", "Baisakh"],
@@ -50,6 +74,20 @@ class CalendarScraper:
         12: 31   # December
     }
     
+    REQUEST_DELAY_SECONDS = 2
+
+    def __init__(self, metrics=None, base_url=None, request_delay=None):
+        # MITITITHI_BASE_URL points a whole app run at another server, e.g. the replay server in
+        # benchmarks/replay_server.py.
+        self.metrics = metrics
+        self.base_url = base_url or os.environ.get("MITITITHI_BASE_URL") or self.BASE_URL
+        self.request_delay = self.REQUEST_DELAY_SECONDS if request_delay is None else request_delay
+
+    def _stage(self, name, year, month_name):
+        if self.metrics is None:
+            return contextlib.nullcontext()
+        return self.metrics.stage(name, f"{year}-{self.NEPALI_MONTHS_MAP.get(month_name, month_name)}")
+
     def __adjust_for_english_date(self, days_data, english_month, english_year):
         def __is_leap_year(year):
             year = int(year)
@@ -74,14 +112,24 @@ class CalendarScraper:
             monthly_data_list.append(days_data[nepali_day])
         return monthly_data_list
     
-    def __get_page_content(self, year, month):
+    def __get_page_content(self, year, month, raise_errors=False):
         try:
-            time.sleep(2)
-            url = f"{self.BASE_URL}?year={year}&month={month}"
-            response = requests.get(url, headers=self.HEADERS, timeout=15)
-            response.raise_for_status()
+            if self.request_delay:
+                time.sleep(self.request_delay)
+            url = f"{self.base_url}?year={year}&month={month}"
+            with self._stage("fetch", year, month):
+                response = requests.get(url, headers=self.HEADERS, timeout=15)
+                response.raise_for_status()
+            if self.metrics is not None:
+                self.metrics.increment("bytes_downloaded", len(response.content))
+                self.metrics.record_month(f"{year}-{self.NEPALI_MONTHS_MAP.get(month, month)}", bytes=len(response.content))
             return response.text
         except requests.RequestException as e:
+            if raise_errors:
+                response = getattr(e, 'response', None)
+                status = response.status_code if response is not None else None
+                retry_after = _retry_after_seconds(response.headers.get("Retry-After")) if response is not None else None
+                raise FetchError(f"Error fetching data for {month} {year}: {e}", status, retry_after) from e
             print(f"Error fetching data for {month} {year}: {e}")
             return None
     
@@ -91,68 +139,77 @@ class CalendarScraper:
                 return this_month
         return month_name
     
+    def fetch_page(self, year, month_name, raise_errors=False):
+        return self.__get_page_content(year, month_name, raise_errors)
+
     def scrape_month(self, year, month_name, month_index):
+        html = self.__get_page_content(year, month_name)
+        if not html: return {}
+        return self.parse_month(html, year, month_name, month_index)
+
+    def parse_month(self, html, year, month_name, month_index):
+        requested_year = year
         try:
-            html = self.__get_page_content(year, month_name)
-            if not html: return {}
-            soup = BeautifulSoup(html, 'html.parser')
+            with self._stage("parse", requested_year, month_name):
+                soup = BeautifulSoup(html, 'html.parser')
 
-            date_header = soup.find("div", class_="cal_left").get_text().strip()
-            month_year = date_header.split()
-            year = month_year[1]
-            month_text = month_year[0].title()
-            if month_text not in self.NEPALI_MONTHS_LIST:
-                month_text = self.__comb_through_alias(month_text)
+                date_header = soup.find("div", class_="cal_left").get_text().strip()
+                month_year = date_header.split()
+                year = month_year[1]
+                month_text = month_year[0].title()
+                if month_text not in self.NEPALI_MONTHS_LIST:
+                    month_text = self.__comb_through_alias(month_text)
 
-            days_data = {}
-            calendar_table = soup.find('table', id='calendartable')
-            for row in calendar_table.find_all('tr')[2:]:
-                cells = row.find_all('td')
-                for cell in cells:
-                    day = cell.find("div", class_="date_np")
-                    events = []
-                    if day:
-                        english_day = cell.find("div", class_="date_en")
-                        tithi = cell.find("div", class_="tithi").get_text().strip()
-                        weekday = cells.index(cell)
-                        holiday = (weekday==6) or (str(day.get('style')).replace(" ","")==f"color:{self.HOLIDAY_COLOR}")
+                days_data = {}
+                calendar_table = soup.find('table', id='calendartable')
+                for row in calendar_table.find_all('tr')[2:]:
+                    cells = row.find_all('td')
+                    for cell in cells:
+                        day = cell.find("div", class_="date_np")
+                        events = []
+                        if day:
+                            english_day = cell.find("div", class_="date_en")
+                            tithi = cell.find("div", class_="tithi").get_text().strip()
+                            weekday = cells.index(cell)
+                            holiday = (weekday==6) or (str(day.get('style')).replace(" ","")==f"color:{self.HOLIDAY_COLOR}")
                         
-                        event1 = cell.find("div", class_="event_one").get_text().strip()
-                        if event1:
-                            events.append(event1)
-                        event2 = cell.find("div", class_="rotate_left").get_text().strip()
-                        if event2:
-                            events.append(event2)
-                        event3 = cell.find("div", class_="rotate_right").get_text().strip()
-                        if event3:
-                            events.append(event3)
-                        if month_index==2 and day.get_text().strip()=='11':   events.append("सुभोजितको जन्मदिन")
+                            event1 = cell.find("div", class_="event_one").get_text().strip()
+                            if event1:
+                                events.append(event1)
+                            event2 = cell.find("div", class_="rotate_left").get_text().strip()
+                            if event2:
+                                events.append(event2)
+                            event3 = cell.find("div", class_="rotate_right").get_text().strip()
+                            if event3:
+                                events.append(event3)
+                            if month_index==2 and day.get_text().strip()=='11':   events.append("सुभोजितको जन्मदिन")
                         
-                        days_data[int(day.get_text().strip())] = {
-                            "gregorian_date": None,
-                            "gregorian_date_expanded": None,
-                            "nepali_date": f"{year}-{self.NEPALI_MONTHS_MAP[month_text]}-{int(day.get_text().strip()):02d}",
-                            "nepali_date_expanded": f"{int(day.get_text().strip()):02d} {month_text}, {year}",
-                            "nepali_year": int(year),
-                            "nepali_month": month_text,
-                            "nepali_month_index": month_index,
-                            "nepali_day": int(day.get_text().strip()),
-                            "weekday": self.WEEKDAYS[weekday],
-                            "tithi": tithi,
-                            "is_holiday": holiday,
-                            "events": list(set(events)),
-                            "gregorian_date_placeholder": int(english_day.get_text().strip())
-                        }
-            days_data = dict(sorted(days_data.items()))
+                            days_data[int(day.get_text().strip())] = {
+                                "gregorian_date": None,
+                                "gregorian_date_expanded": None,
+                                "nepali_date": f"{year}-{self.NEPALI_MONTHS_MAP[month_text]}-{int(day.get_text().strip()):02d}",
+                                "nepali_date_expanded": f"{int(day.get_text().strip()):02d} {month_text}, {year}",
+                                "nepali_year": int(year),
+                                "nepali_month": month_text,
+                                "nepali_month_index": month_index,
+                                "nepali_day": int(day.get_text().strip()),
+                                "weekday": self.WEEKDAYS[weekday],
+                                "tithi": tithi,
+                                "is_holiday": holiday,
+                                "events": list(dict.fromkeys(events)),
+                                "gregorian_date_placeholder": int(english_day.get_text().strip())
+                            }
+                days_data = dict(sorted(days_data.items()))
 
             english_date_header = soup.find('div', class_='cal_right').get_text().strip()  
             english_month = self.ENGLISH_MONTHS_MAP[re.match(r"([A-Za-z]+)", english_date_header).group(1).title()] 
             english_year = re.match(r"[^0-9]+(\d{4})", english_date_header).group(1) 
 
-            monthly_data_list = self.__adjust_for_english_date(days_data, english_month, english_year)
-            monthly_data = {}
-            for daily_data in monthly_data_list:
-                monthly_data[daily_data["gregorian_date"]] = daily_data
+            with self._stage("adjust", requested_year, month_name):
+                monthly_data_list = self.__adjust_for_english_date(days_data, english_month, english_year)
+                monthly_data = {}
+                for daily_data in monthly_data_list:
+                    monthly_data[daily_data["gregorian_date"]] = daily_data
             
             return monthly_data
         except Exception as e:
@@ -0,0 +1,245 @@
+import sys
+import json
+import bisect
+import time
+import asyncio
+import hashlib
+import argparse
+from datetime import date
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from src.calendar_data import CalendarData
+from src.metrics import Histogram
+
+MAX_BATCH_SIZE = 10000
+# Not derived from the loaded dataset alone, so never answered from an ETag.
+UNCACHED_PATHS = {"/stats", "/changes"}
+MAX_BODY_BYTES = 4 * 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 15
+
+class BadRequest(Exception):
+    pass
+
+def _param(query, name, default=None):
+    values = query.get(name)
+    if not values:
+        if default is None:
+            raise BadRequest(f"Missing query parameter '{name}'.")
+        return default
+    return values[0]
+
+def _int_param(query, name, default=None):
+    try:
+        return int(_param(query, name, default))
+    except ValueError:
+        raise BadRequest(f"Query parameter '{name}' must be an integer.")
+
+def _date_triple(value):
+    try:
+        year, month, day = (int(part) for part in str(value).split("-"))
+        return year, month, day
+    except ValueError:
+        raise BadRequest(f"Invalid date '{value}', expected YYYY-MM-DD.")
+
+class CalendarService:
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self.latency = {}
+        self.routes = {
+            ("GET", "/ad-to-bs"): self.ad_to_bs,
+            ("GET", "/bs-to-ad"): self.bs_to_ad,
+            ("GET", "/month"): self.month,
+            ("GET", "/upcoming"): self.upcoming,
+            ("GET", "/holidays"): self.holidays,
+            ("POST", "/batch/ad-to-bs"): self.batch_ad_to_bs,
+            ("POST", "/batch/bs-to-ad"): self.batch_bs_to_ad,
+            ("GET", "/changes"): self.changes,
+            ("GET", "/stats"): self.stats,
+        }
+
+    def _lookup_ad(self, value):
+        year, month, day = _date_triple(value)
+        return self.data_manager.get_data_for_date(f"{year:04d}-{month:02d}-{day:02d}")
+
+    def _lookup_bs(self, value):
+        year, month, day = _date_triple(value)
+        if not 1 <= month <= 12:
+            return None
+        return self.data_manager.lookup_bs_to_ad(year, month - 1, day)
+
+    def ad_to_bs(self, query, body):
+        return {"date": _param(query, "date"), "result": self._lookup_ad(_param(query, "date"))}
+
+    def bs_to_ad(self, query, body):
+        return {"date": _param(query, "date"), "result": self._lookup_bs(_param(query, "date"))}
+
+    def month(self, query, body):
+        year, month = _int_param(query, "year"), _int_param(query, "month")
+        if not 1 <= month <= 12:
+            raise BadRequest("Query parameter 'month' must be between 1 and 12.")
+        return {"year": year, "month": month, "days": self.data_manager.get_data_for_nepali_month(year, month - 1)}
+
+    def upcoming(self, query, body):
+        from_date = _param(query, "from", date.today().isoformat())
+        limit = min(_int_param(query, "limit", "10"), 100)
+        if limit < 1:
+            raise BadRequest("Query parameter 'limit' must be at least 1.")
+        return {"from": from_date, "events": self.data_manager.get_upcoming_events(from_date, limit)}
+
+    def holidays(self, query, body):
+        # A.D. range, inclusive; the sorted date list keeps the scan to the requested window.
+        start, end = _param(query, "from"), _param(query, "to")
+        sorted_dates = self.data_manager.sorted_dates
+        days = []
+        for date_str in sorted_dates[bisect.bisect_left(sorted_dates, start):bisect.bisect_right(sorted_dates, end)]:
+            data = self.data_manager.get_data_for_date(date_str)
+            if data.get("is_holiday"):
+                days.append(data)
+        return {"from": start, "to": end, "holidays": days}
+
+    def _batch_values(self, body):
+        try:
+            values = json.loads(body or b"null")["dates"]
+        except (ValueError, TypeError, KeyError):
+            raise BadRequest("Body must be a JSON object with a 'dates' list.")
+        if not isinstance(values, list) or len(values) > MAX_BATCH_SIZE:
+            raise BadRequest(f"'dates' must be a list of at most {MAX_BATCH_SIZE} dates.")
+        return values
+
+    def batch_ad_to_bs(self, query, body):
+        return {"results": [self._lookup_ad(value) for value in self._batch_values(body)]}
+
+    def batch_bs_to_ad(self, query, body):
+        return {"results": [self._lookup_bs(value) for value in self._batch_values(body)]}
+
+    def changes(self, query, body):
+        # The feed is read from disk, so it includes syncs run since the service started.
+        since = _int_param(query, "since", "0")
+        entries = list(self.data_manager.changes_since(since))
+        return {"since": since, "version": entries[-1]["version"] if entries else since, "entries": entries}
+
+    def stats(self, query, body):
+        return {
+            "data_version": self.data_manager.data_version,
+            "days_loaded": len(self.data_manager.calendar_data),
+            "latency_seconds": {path: histogram.to_dict() for path, histogram in self.latency.items()},
+        }
+
+    def etag_for(self, target):
+        # Responses are a pure function of the request target and the loaded dataset, so the ETag
+        # can be derived without building the body; a reload bumps data_version. /upcoming without
+        # 'from' starts at today, so today's date is part of its ETag.
+        parts = urlsplit(target)
+        if parts.path == "/upcoming" and "from" not in parse_qs(parts.query):
+            target = f"{target}#{date.today().isoformat()}"
+        digest = hashlib.sha1(target.encode("utf-8")).hexdigest()[:16]
+        return f'"{self.data_manager.data_version}-{digest}"'
+
+    def record_latency(self, path, seconds):
+        histogram = self.latency.get(path)
+        if histogram is None:
+            histogram = self.latency[path] = Histogram()
+        histogram.observe(seconds)
+
+def _response(status, body=b"", headers=None, keep_alive=True):
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    all_headers = {"Content-Length": str(len(body)), "Connection": "keep-alive" if keep_alive else "close"}
+    if body:
+        all_headers["Content-Type"] = "application/json; charset=utf-8"
+    all_headers.update(headers or {})
+    lines.extend(f"{name}: {value}" for name, value in all_headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+def _json_body(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise BadRequest("Malformed request line.")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0) or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise BadRequest("Invalid Content-Length.")
+    if length > MAX_BODY_BYTES:
+        raise BadRequest("Request body too large.")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+async def handle_connection(service, reader, writer):
+    try:
+        while True:
+            try:
+                request = await asyncio.wait_for(_read_request(reader), KEEP_ALIVE_TIMEOUT)
+            except BadRequest as e:
+                writer.write(_response(HTTPStatus.BAD_REQUEST, _json_body({"error": str(e)}), keep_alive=False))
+                break
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                break
+            if request is None:
+                break
+
+            start = time.perf_counter()
+            method, target, version, headers, body = request
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            path = urlsplit(target).path
+            handler = service.routes.get((method, path))
+
+            if handler is None:
+                known_path = any(route_path == path for _, route_path in service.routes)
+                status = HTTPStatus.METHOD_NOT_ALLOWED if known_path else HTTPStatus.NOT_FOUND
+                writer.write(_response(status, _json_body({"error": status.phrase}), keep_alive=keep_alive))
+            elif method == "GET" and path not in UNCACHED_PATHS and headers.get("if-none-match") == service.etag_for(target):
+                writer.write(_response(HTTPStatus.NOT_MODIFIED, headers={"ETag": service.etag_for(target)}, keep_alive=keep_alive))
+            else:
+                try:
+                    payload = handler(parse_qs(urlsplit(target).query), body)
+                    extra_headers = {"Cache-Control": "no-cache"}
+                    if method == "GET" and path not in UNCACHED_PATHS:
+                        extra_headers["ETag"] = service.etag_for(target)
+                    writer.write(_response(HTTPStatus.OK, _json_body(payload), extra_headers, keep_alive))
+                except BadRequest as e:
+                    writer.write(_response(HTTPStatus.BAD_REQUEST, _json_body({"error": str(e)}), keep_alive=keep_alive))
+            await writer.drain()
+            service.record_latency(path if handler else "(unmatched)", time.perf_counter() - start)
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving MitiTithi calendar on {addresses}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.server", description="Local JSON query service for the MitiTithi calendar.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args(argv)
+
+    service = CalendarService(CalendarData(args.data_dir))
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
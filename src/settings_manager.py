@@ -1,10 +1,15 @@
 import os
 import sys
 import json
+import atexit
 import platform
+import threading
+from src.file_utils import atomic_write
 
 class SettingsManager:
-    def __init__(self, app_name="MitiTithi-DesktopWidget"):
+    SAVE_DELAY_SECONDS = 1.5
+
+    def __init__(self, app_name="MitiTithi-DesktopWidget", save_delay=SAVE_DELAY_SECONDS):
         if platform.system() == "Windows":
             self.settings_dir = os.path.join(os.environ['APPDATA'], app_name)
         else:
@@ -13,9 +18,20 @@ class SettingsManager:
         os.makedirs(self.settings_dir, exist_ok=True)
         self.settings_file = os.path.join(self.settings_dir, "settings.json")
         self.reminders_file = os.path.join(self.settings_dir, "reminders.json")
+        self.user_events_file = os.path.join(self.settings_dir, "user_events.json")
         self.app_name = app_name
         self.settings = self._load_settings()
 
+        # Write-behind: set() only marks the settings dirty and (re)arms a timer, so a burst of
+        # changes (e.g. dragging the size grip) ends up as a single file write.
+        self.save_delay = save_delay
+        self.writes_performed = 0
+        self.writes_saved = 0
+        self._dirty = False
+        self._save_timer = None
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+
     def _get_default_settings(self):
         return {
             "run_on_startup": False,
@@ -27,7 +43,8 @@ class SettingsManager:
             "resizing_enabled": False,
             "widget_size": [260, 80],
             "minimized_size": [80, 80],
-            "calendar_size": [800, 550]
+            "calendar_size": [800, 550],
+            "reminder_catchup_policy": "Fire All"
         }
 
     def _load_settings(self):
@@ -41,15 +58,40 @@ class SettingsManager:
             return self._get_default_settings()
 
     def save_settings(self):
-        with open(self.settings_file, 'w') as f:
-            json.dump(self.settings, f, indent=4)
+        with self._lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            with atomic_write(self.settings_file) as f:
+                json.dump(self.settings, f, indent=4)
+            self._dirty = False
+            self.writes_performed += 1
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self.save_settings()
 
     def get(self, key):
         return self.settings.get(key)
 
     def set(self, key, value):
-        self.settings[key] = value
-        self.save_settings()
+        with self._lock:
+            if key in self.settings and self.settings[key] == value:
+                self.writes_saved += 1
+                return
+            self.settings[key] = value
+            if self._dirty:
+                self.writes_saved += 1
+            self._dirty = True
+            self._schedule_save()
+
+    def _schedule_save(self):
+        if self._save_timer:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(self.save_delay, self.flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
 
     def load_reminders(self):
         try:
@@ -59,7 +101,7 @@ class SettingsManager:
             return []
 
     def save_reminders(self, reminders):
-        with open(self.reminders_file, 'w') as f:
+        with atomic_write(self.reminders_file) as f:
             json.dump(reminders, f, indent=4)
     
     def set_startup(self, enable):
@@ -0,0 +1,130 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+from src.calendar_data import NEPALI_MONTHS
+from src.change_feed import load_year_file
+from src.file_utils import atomic_write
+from src.tithi import has_tithi, tithi_name
+
+# Static export of the month view: one small JSON shard per B.S. month with everything the
+# calendar grid shows, plus manifest.json mapping months to shard files. Shard names carry a hash
+# of their content, so a static server can cache them forever; only the manifest changes. Each
+# year's shards are regenerated only when the year file they came from changes (or the format).
+SHARD_FORMAT = 1
+WEEKDAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+MANIFEST_NAME = "manifest.json"
+SHARD_DIR = "months"
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _computed_tithis(year_data):
+    # Same fallback as the app: days the site has no tithi for get the computed one.
+    missing = sorted(date_str for date_str, data in year_data.items() if not has_tithi(data))
+    if not missing:
+        return {}
+    from src.tithi_engine import tithi_codes
+    return {date_str: tithi_name(int(code)) for date_str, code in zip(missing, tithi_codes(missing))}
+
+def build_month_shard(year, month_index, month_days, computed_tithis=None):
+    # month_days: the month's records in date order. The layout matches populate_calendar:
+    # row and col are the grid cell (0-based, Sunday first) and nothing depends on today.
+    computed_tithis = computed_tithis or {}
+    first = month_days[0]
+    first_weekday = (WEEKDAYS.index(first['weekday']) - (first['nepali_day'] - 1)) % 7
+    start = datetime.strptime(first['gregorian_date'], "%Y-%m-%d")
+    end = datetime.strptime(month_days[-1]['gregorian_date'], "%Y-%m-%d")
+    days, events = [], []
+    for data in month_days:
+        cell = first_weekday + data['nepali_day'] - 1
+        day = {"day": data['nepali_day'], "date": data['gregorian_date'], "weekday": WEEKDAYS.index(data['weekday']),
+               "row": cell // 7, "col": cell % 7, "tithi": data['tithi'] if has_tithi(data) else computed_tithis.get(data['gregorian_date'], ""),
+               "holiday": bool(data.get('is_holiday')), "events": data['events']}
+        if not has_tithi(data) and day["tithi"]:
+            day["tithi_computed"] = True
+        days.append(day)
+        if data['events']:
+            events.append({"day": data['nepali_day'], "events": data['events']})
+    return {
+        "format": SHARD_FORMAT, "year": year, "month_index": month_index, "month": NEPALI_MONTHS[month_index],
+        "title": f"{NEPALI_MONTHS[month_index]} {year}", "gregorian_header": f"{start:%b} - {end:%b %Y}",
+        "first_weekday": first_weekday, "rows": (first_weekday + month_days[-1]['nepali_day'] - 1) // 7 + 1,
+        "days": days, "events": events,
+    }
+
+def _write_shard(out_dir, shard):
+    payload = json.dumps(shard, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()
+    name = f"{shard['year']}-{shard['month_index'] + 1:02d}.{digest[:16]}.json"
+    path = os.path.join(out_dir, SHARD_DIR, name)
+    # The name is the content: a shard that already exists is already right.
+    if not os.path.exists(path):
+        with atomic_write(path, 'wb') as f:
+            f.write(payload)
+    return {"year": shard['year'], "month_index": shard['month_index'], "month": shard['month'],
+            "file": f"{SHARD_DIR}/{name}", "sha256": digest, "days": len(shard['days'])}
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return manifest if manifest.get("format") == SHARD_FORMAT else None
+
+def export_shards(data_dir, out_dir, force=False, prune=False):
+    # Reads the year files directly, so an export where little changed never loads the rest of
+    # the calendar. Returns counts of years regenerated and reused, shards written and pruned.
+    os.makedirs(os.path.join(out_dir, SHARD_DIR), exist_ok=True)
+    previous = None if force else load_manifest(out_dir)
+    old_sources = previous["sources"] if previous else {}
+    old_months = {}
+    for entry in previous["months"] if previous else []:
+        old_months.setdefault(str(entry["year"]), []).append(entry)
+
+    sources, months = {}, []
+    stats = {"years_regenerated": 0, "years_unchanged": 0, "shards_written": 0, "shards_pruned": 0}
+    for filename in sorted(os.listdir(data_dir)):
+        if not (filename.startswith("calendar_") and filename.endswith(".jsonl")):
+            continue
+        year = filename[len("calendar_"):-len(".jsonl")]
+        if not year.isdigit():
+            continue
+        sources[year] = _file_sha256(os.path.join(data_dir, filename))
+        reusable = old_months.get(year)
+        if reusable and old_sources.get(year) == sources[year] and all(
+                os.path.exists(os.path.join(out_dir, entry["file"])) for entry in reusable):
+            months.extend(reusable)
+            stats["years_unchanged"] += 1
+            continue
+
+        year_data = load_year_file(os.path.join(data_dir, filename))
+        computed_tithis = _computed_tithis(year_data)
+        by_month = {}
+        for date_str in sorted(year_data):
+            data = year_data[date_str]
+            by_month.setdefault(data['nepali_month_index'], []).append(data)
+        for month_index in sorted(by_month):
+            months.append(_write_shard(out_dir, build_month_shard(int(year), month_index, by_month[month_index], computed_tithis)))
+            stats["shards_written"] += 1
+        stats["years_regenerated"] += 1
+
+    manifest = {"format": SHARD_FORMAT, "generated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "sources": sources, "months": months}
+    with atomic_write(os.path.join(out_dir, MANIFEST_NAME)) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    if prune:
+        # Clients holding an older manifest may still ask for the shards it names, so old shards
+        # are only removed on request.
+        referenced = {os.path.basename(entry["file"]) for entry in months}
+        for name in os.listdir(os.path.join(out_dir, SHARD_DIR)):
+            if name.endswith(".json") and name not in referenced:
+                os.remove(os.path.join(out_dir, SHARD_DIR, name))
+                stats["shards_pruned"] += 1
+    return stats
@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import socket
+import getpass
+import tempfile
+
+# A launch first offers its command to a running instance over the local socket that instance
+# listens on (see src.ui.instance_server). This side is plain Python so that a second launch can
+# hand off and exit without importing Qt or loading any calendar data.
+#
+# Protocol: the client sends one JSON object on a line, e.g. {"action": "ad2bs", "date": "2024-04-13"},
+# and the instance answers with one JSON line: {"ok": true, ...} or {"ok": false, "error": "..."}.
+
+def server_name():
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    return f"mititithi-{''.join(c for c in user if c.isalnum()) or 'user'}"
+
+def server_address():
+    # The name QLocalServer.listen() is given: a named pipe on Windows, a socket path elsewhere.
+    if sys.platform == "win32":
+        return server_name()
+    return os.path.join(tempfile.gettempdir(), server_name())
+
+def lock_path():
+    # Held while an instance checks for another one and takes the name, so two launches at the
+    # same moment cannot both get past the check.
+    return os.path.join(tempfile.gettempdir(), f"{server_name()}.lock")
+
+def _connect():
+    if sys.platform == "win32":
+        pipe = open(rf"\\.\pipe\{server_address()}", "r+b", buffering=0)
+        return pipe, pipe.write, pipe.read
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(server_address())
+    except OSError:
+        client.close()
+        raise
+    return client, client.sendall, client.recv
+
+def instance_running():
+    # Connecting is enough: a running instance accepts even while it is busy starting up.
+    try:
+        connection = _connect()[0]
+    except OSError:
+        return False
+    connection.close()
+    return True
+
+def send_command(command, timeout=10.0):
+    # Returns the running instance's reply, or None if no instance is listening.
+    payload = (json.dumps(command, ensure_ascii=False) + "\n").encode("utf-8")
+    try:
+        connection, write, read = _connect()
+    except OSError:
+        return None
+    try:
+        if sys.platform != "win32":
+            connection.settimeout(timeout)
+        write(payload)
+        return json.loads(_read_line(read))
+    except (OSError, ValueError):
+        return {"ok": False, "error": "The running instance did not answer."}
+    finally:
+        connection.close()
+
+def _read_line(read):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = read(4096)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode("utf-8")
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import threading
+from src.file_utils import atomic_write, file_lock
+
+LEASE_DIR = ".sync"
+
+def _pid_alive(pid):
+    # Only asked about processes on this host. Windows has no harmless signal 0 (os.kill would
+    # terminate the process), so there a lease is only given up when its heartbeat goes stale.
+    if sys.platform == "win32":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+# Cross-process claims on the years of a data directory, so two processes syncing into the same
+# data/ (the widget and a CLI run, or two widgets on different accounts) split the years between
+# them instead of fetching and writing each one twice. A claim is a small JSON file per year in
+# data/.sync/ naming its owner (host, pid) with a heartbeat time; a background thread refreshes
+# the heartbeats of everything this process holds. A claim whose heartbeat is older than
+# TTL_SECONDS, or whose owner process on this host has exited, is stale and can be taken over.
+# Files are only read and changed under an advisory lock on data/.sync/lock, which makes
+# "check, then take over" a single step.
+class SyncLease:
+    TTL_SECONDS = 60
+    HEARTBEAT_SECONDS = 15
+
+    def __init__(self, data_dir):
+        self.lease_dir = os.path.join(data_dir, LEASE_DIR)
+        self.host = socket.gethostname()
+        self.owner = f"{self.host}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.started = time.time()
+        self.claims = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._heartbeat_thread = None
+
+    def _path(self, year):
+        return os.path.join(self.lease_dir, f"year-{year}.lease")
+
+    def _read(self, year):
+        try:
+            with open(self._path(year), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write(self, year):
+        with atomic_write(self._path(year)) as f:
+            json.dump({"owner": self.owner, "host": self.host, "pid": os.getpid(), "year": year,
+                       "started": self.started, "heartbeat": time.time()}, f)
+
+    def _is_live(self, record):
+        if record is None or time.time() - record.get("heartbeat", 0) > self.TTL_SECONDS:
+            return False
+        if record.get("host") == self.host and not _pid_alive(record.get("pid", 0)):
+            return False
+        return True
+
+    def holder(self, year):
+        # The record of whoever else holds a live claim on the year, or None.
+        record = self._read(year)
+        if record is None or record.get("owner") == self.owner or not self._is_live(record):
+            return None
+        return record
+
+    def claim(self, year):
+        # True if this process now holds the year: it was free, stale, or already ours.
+        with self._lock, file_lock(os.path.join(self.lease_dir, "lock")):
+            record = self._read(year)
+            if record is not None and record.get("owner") != self.owner and self._is_live(record):
+                return False
+            if record is not None and record.get("owner") != self.owner:
+                print(f"Taking over the stale sync claim on {year} B.S. from {record.get('owner')}.")
+            self._write(year)
+            self.claims.add(year)
+        self._start_heartbeat()
+        return True
+
+    def renew(self, year):
+        # Refreshes the claim and returns True if it is still ours. A process that stalled past
+        # the TTL may have lost the year to another one, and must not write it then.
+        with self._lock, file_lock(os.path.join(self.lease_dir, "lock")):
+            return self._renew(year)
+
+    def _renew(self, year):
+        if year not in self.claims:
+            return False
+        record = self._read(year)
+        if record is None or record.get("owner") != self.owner:
+            self.claims.discard(year)
+            return False
+        self._write(year)
+        return True
+
+    def release(self, years=None):
+        # Releases the given years, or everything this process holds.
+        with self._lock, file_lock(os.path.join(self.lease_dir, "lock")):
+            for year in list(self.claims if years is None else years):
+                if year not in self.claims:
+                    continue
+                self.claims.discard(year)
+                record = self._read(year)
+                if record is not None and record.get("owner") == self.owner:
+                    try:
+                        os.remove(self._path(year))
+                    except OSError:
+                        pass
+
+    def _start_heartbeat(self):
+        if self._heartbeat_thread is not None:
+            if not self._stop_event.is_set():
+                return
+            self._heartbeat_thread.join()
+        self._stop_event.clear()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="sync-lease-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def _heartbeat(self):
+        while not self._stop_event.wait(self.HEARTBEAT_SECONDS):
+            if not self.claims:
+                continue
+            try:
+                with self._lock, file_lock(os.path.join(self.lease_dir, "lock")):
+                    for year in sorted(self.claims):
+                        if not self._renew(year):
+                            print(f"Lost the sync claim on {year} B.S. to another process.")
+            except OSError as e:
+                print(f"Could not renew sync claims: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+        self.release()
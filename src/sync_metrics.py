@@ -0,0 +1,108 @@
+import json
+import time
+import threading
+from contextlib import contextmanager
+from src.metrics import Histogram
+
+# Shared between the sync thread (writer) and the GUI thread (diagnostics dialog), so every
+# mutation happens under the lock. Counters and stage histograms accumulate for the whole
+# session; progress and the per-month table describe the current (or last) sync run.
+class SyncMetrics:
+    STAGES = ("fetch", "parse", "adjust", "diff", "write", "reload")
+    COUNTERS = ("syncs_started", "syncs_completed", "months_fetched", "months_failed", "retries",
+                "circuit_breaks", "bytes_downloaded", "years_written", "years_skipped", "years_incomplete", "days_changed",
+                "sync_jobs_merged", "sync_jobs_dropped", "years_claimed_elsewhere", "years_claim_lost")
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.stage_histograms = {stage: Histogram() for stage in self.STAGES}
+        self.month_histogram = Histogram()
+        self.months = {}
+        self.completed = 0
+        self.total = 0
+        self.queue_depth = 0
+        self.started_at = None
+        self.finished_at = None
+
+    @staticmethod
+    def month_key(year, month_index):
+        return f"{year}-{month_index + 1:02d}"
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_queue_depth(self, depth):
+        with self._lock:
+            self.queue_depth = depth
+
+    def begin_sync(self, total_months):
+        with self._lock:
+            self.counters["syncs_started"] += 1
+            self.months = {}
+            self.completed = 0
+            self.total = total_months
+            self.started_at = time.time()
+            self.finished_at = None
+
+    def reduce_total(self, months):
+        # Months the running sync will not do after all, e.g. years another process took.
+        with self._lock:
+            self.total = max(self.total - months, self.completed)
+
+    def end_sync(self):
+        with self._lock:
+            self.counters["syncs_completed"] += 1
+            self.finished_at = time.time()
+
+    @contextmanager
+    def stage(self, name, month_key=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start, month_key)
+
+    def record_stage(self, name, duration, month_key=None):
+        # For stages timed elsewhere, e.g. parsing in a worker process.
+        with self._lock:
+            self.stage_histograms.setdefault(name, Histogram()).observe(duration)
+            if month_key:
+                month = self.months.setdefault(month_key, {})
+                month[f"{name}_s"] = month.get(f"{name}_s", 0.0) + duration
+
+    def record_month(self, month_key, **fields):
+        with self._lock:
+            month = self.months.setdefault(month_key, {})
+            for name, value in fields.items():
+                month[name] = month.get(name, 0) + value if name in ("bytes", "retries") else value
+
+    def month_completed(self, month_key, duration, ok):
+        with self._lock:
+            self.completed += 1
+            self.month_histogram.observe(duration)
+            self.counters["months_fetched" if ok else "months_failed"] += 1
+            self.record_month(month_key, ok=ok, duration_s=duration)
+
+    def progress(self):
+        with self._lock:
+            elapsed = (self.finished_at or time.time()) - self.started_at if self.started_at else 0.0
+            remaining = max(self.total - self.completed, 0)
+            eta = elapsed / self.completed * remaining if self.completed else None
+            return {"completed": self.completed, "total": self.total, "elapsed_seconds": elapsed, "eta_seconds": eta}
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "progress": self.progress(),
+                "queue_depth": self.queue_depth,
+                "stages_seconds": {name: histogram.to_dict() for name, histogram in self.stage_histograms.items()},
+                "month_seconds": self.month_histogram.to_dict(),
+                "months": {key: dict(value) for key, value in sorted(self.months.items())},
+            }
+
+    def dump_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,111 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from src.scraper import CalendarScraper
+
+_worker_scraper = None
+
+def _parse_page(html, year, month_name, month_index):
+    # Runs in a worker process, which keeps its own scraper (parse_month needs no state).
+    global _worker_scraper
+    if _worker_scraper is None:
+        _worker_scraper = CalendarScraper()
+    start = time.perf_counter()
+    month_data = _worker_scraper.parse_month(html, year, month_name, month_index)
+    return month_data, time.perf_counter() - start
+
+class YearAssembler:
+    # Collects months as they finish, in any order, and hands each year to on_year once all of
+    # its months are in, together with the indexes of the months that failed.
+    def __init__(self, years, months_per_year, on_year):
+        self.months_per_year = months_per_year
+        self.on_year = on_year
+        self.pending = {year: {} for year in years}
+
+    def add(self, year, month_index, month_data):
+        # A month can come in again after its year was handed over, e.g. from the retry queue
+        # once the bulk sync falls back to one month at a time; it is ignored.
+        months = self.pending.get(year)
+        if months is None:
+            return
+        months[month_index] = month_data
+        if len(months) == self.months_per_year:
+            year_data = {}
+            for index in range(self.months_per_year):
+                year_data.update(months[index] or {})
+            failed = [index for index in range(self.months_per_year) if not months[index]]
+            del self.pending[year]
+            self.on_year(year, year_data, failed)
+
+# Bulk resync in three overlapping stages: fetch threads download month pages into a bounded
+# queue, a process pool parses them on every core, and the calling thread hands each parsed
+# month to on_month. The queue and the cap on in-flight parses are the backpressure: when parsing
+# falls behind, the fetchers block on put().
+class BulkSyncPipeline:
+    def __init__(self, fetcher, metrics=None, fetch_workers=3, parse_workers=None):
+        self.fetcher = fetcher
+        self.scraper = fetcher.scraper
+        self.metrics = metrics
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.max_in_flight = self.parse_workers * 2
+        self.pages = queue.Queue(maxsize=self.max_in_flight)
+        self.stats = {"queue_high_water": 0, "fetch_blocked_s": 0.0}
+        self._lock = threading.Lock()
+
+    def _put_page(self, year, month_index, html, started):
+        blocked_from = time.perf_counter()
+        while not self.fetcher.stop_event.is_set():
+            try:
+                self.pages.put((year, month_index, html, started), timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        with self._lock:
+            self.stats["fetch_blocked_s"] += time.perf_counter() - blocked_from
+            self.stats["queue_high_water"] = max(self.stats["queue_high_water"], self.pages.qsize())
+
+    def run(self, tasks, on_month):
+        # tasks may keep growing while this runs (months the user asks for jump the queue), so
+        # the run ends when the fetchers have drained it rather than after a fixed count.
+        # on_month(year, month_index, month_data, started) gets {} for a failed month.
+        months = self.scraper.NEPALI_MONTHS_LIST
+        fetchers = [threading.Thread(target=self.fetcher.run, args=(tasks, self._put_page), daemon=True)
+                    for _ in range(self.fetch_workers)]
+        for fetcher in fetchers:
+            fetcher.start()
+
+        in_flight = {}
+        executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        try:
+            while True:
+                fetching = any(fetcher.is_alive() for fetcher in fetchers)
+                while len(in_flight) < self.max_in_flight:
+                    try:
+                        year, month_index, html, started = self.pages.get(timeout=0 if in_flight else 0.05)
+                    except queue.Empty:
+                        break
+                    if not html:
+                        on_month(year, month_index, {}, started)
+                        continue
+                    future = executor.submit(_parse_page, html, year, months[month_index], month_index)
+                    in_flight[future] = (year, month_index, started)
+
+                if not in_flight:
+                    if not fetching and self.pages.empty():
+                        break
+                    continue
+                done, _ = wait(list(in_flight), timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    year, month_index, started = in_flight.pop(future)
+                    month_data, parse_seconds = future.result()
+                    if self.metrics is not None:
+                        self.metrics.record_stage("parse", parse_seconds, self.metrics.month_key(year, month_index))
+                    on_month(year, month_index, month_data, started)
+        finally:
+            self.fetcher.stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            for fetcher in fetchers:
+                fetcher.join()
@@ -0,0 +1,127 @@
+import heapq
+import queue
+import threading
+
+# Months waiting to be fetched, lowest priority value first. Sync workers take from it with
+# get_nowait() like a queue.Queue, while the GUI thread can push a month the user is looking at
+# ahead of the background work at any time. A month is queued at most once; asking again at a
+# higher priority moves it up.
+class MonthRequestQueue:
+    USER = 0
+    BACKGROUND = 10
+
+    def __init__(self):
+        self._heap = []
+        self._pending = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    def qsize(self):
+        return len(self)
+
+    def put(self, year, month_index, priority=BACKGROUND):
+        key = (year, month_index)
+        with self._lock:
+            current = self._pending.get(key)
+            if current is not None and current <= priority:
+                return False
+            self._pending[key] = priority
+            self._counter += 1
+            heapq.heappush(self._heap, (priority, self._counter, key))
+            return True
+
+    def get_nowait(self):
+        with self._lock:
+            while self._heap:
+                priority, _, key = heapq.heappop(self._heap)
+                # Entries superseded by a higher-priority put() are skipped here.
+                if self._pending.get(key) == priority:
+                    del self._pending[key]
+                    return key
+            raise queue.Empty
+
+    def priority_of(self, year, month_index):
+        with self._lock:
+            return self._pending.get((year, month_index))
+
+    def discard(self, priority):
+        # Drops every pending month at this priority, e.g. the background work of a cancelled sync.
+        with self._lock:
+            dropped = [key for key, value in self._pending.items() if value == priority]
+            for key in dropped:
+                del self._pending[key]
+            return len(dropped)
+
+# Sync jobs waiting for the sync thread. Jobs submitted while one is pending are merged into it:
+# the years are united and a year is force-resynced if any of the merged jobs forced it. A job
+# that asks for nothing beyond what is pending or already running is dropped.
+class SyncCoordinator:
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+        self._pending = {}
+        self._pending_jobs = 0
+        self._running = None
+        self._lock = threading.Lock()
+
+    def _new_work(self, years, force):
+        # Years from this job that neither the pending nor the running job will cover.
+        running_years, running_forced = self._running or ({}, set())
+        new = {}
+        for year in years:
+            covered = running_forced if force else running_years
+            if year in covered or (year in self._pending and (self._pending[year] or not force)):
+                continue
+            new[year] = force
+        return new
+
+    def submit(self, start_year, end_year, force=False):
+        # Returns True if this job started a new batch, i.e. the sync thread needs waking.
+        with self._lock:
+            new = self._new_work(range(start_year, end_year + 1), force)
+            if not new:
+                self._increment("sync_jobs_dropped")
+                return False
+            wake = not self._pending
+            if not wake:
+                self._increment("sync_jobs_merged")
+            for year, year_force in new.items():
+                self._pending[year] = self._pending.get(year, False) or year_force
+            self._pending_jobs += 1
+            self._update_depth()
+            return wake
+
+    def take(self):
+        # Returns (years, forced_years) for the next merged job, or None.
+        with self._lock:
+            if not self._pending:
+                self._running = None
+                return None
+            years = sorted(self._pending)
+            forced = {year for year, force in self._pending.items() if force}
+            self._running = (set(years), forced)
+            self._pending = {}
+            self._pending_jobs = 0
+            self._update_depth()
+            return years, forced
+
+    def cancel_running(self):
+        # A cancelled job no longer covers its years, so a request made while it winds down
+        # is queued instead of dropped.
+        with self._lock:
+            self._running = None
+
+    def depth(self):
+        with self._lock:
+            return self._pending_jobs
+
+    def _increment(self, name):
+        if self.metrics is not None:
+            self.metrics.increment(name)
+
+    def _update_depth(self):
+        if self.metrics is not None:
+            self.metrics.set_queue_depth(self._pending_jobs)
@@ -0,0 +1,239 @@
+import time
+import heapq
+import queue
+import random
+import threading
+from src.scraper import FetchError
+
+class CircuitOpenError(FetchError):
+    @property
+    def retryable(self):
+        return False
+
+class RetryPolicy:
+    def __init__(self, max_attempts=5, base_delay=2.0, max_delay=120.0, multiplier=2.0, jitter=0.5,
+                 max_retry_after=300.0, rng=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.rng = rng or random.Random()
+
+    def should_retry(self, error, attempt):
+        # attempt is zero-based: the first failed request is attempt 0.
+        return error.retryable and attempt + 1 < self.max_attempts
+
+    def delay(self, attempt, retry_after=None):
+        # A server-supplied Retry-After wins; otherwise exponential backoff with the top
+        # `jitter` fraction randomised, so parallel fetchers do not retry in lockstep.
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return delay * (1 - self.jitter + self.jitter * self.rng.random())
+
+class AdaptiveThrottle:
+    # Spaces requests at least `interval` apart across all fetch threads. The interval grows when
+    # the server signals overload (429/503) and shrinks back towards min_interval on success.
+    def __init__(self, min_interval=0.5, max_interval=30.0, backoff=1.5, recovery=0.8):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.recovery = recovery
+        self.interval = min_interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self, stop_event=None):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            if stop_event is not None:
+                stop_event.wait(slot - now)
+            else:
+                time.sleep(slot - now)
+
+    def penalize(self):
+        with self._lock:
+            self.interval = min(self.max_interval, max(self.interval, self.min_interval, 0.1) * self.backoff)
+
+    def reward(self):
+        with self._lock:
+            self.interval = max(self.min_interval, self.interval * self.recovery)
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    # Opens after failure_threshold consecutive failures and holds every request for
+    # reset_timeout; then one probe request is let through. A failed probe re-opens it with the
+    # timeout doubled (up to max_reset_timeout), a successful one closes it. After max_opens
+    # openings without a success in between, the breaker gives up for the rest of the sync.
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, max_reset_timeout=600.0, max_opens=4):
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.max_opens = max_opens
+        self.state = self.CLOSED
+        self.failures = 0
+        self.times_opened = 0
+        self.consecutive_opens = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait_time(self):
+        # Seconds the caller should hold off; 0 means go ahead.
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0
+            if self.state == self.HALF_OPEN:
+                return 0.5
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                return remaining
+            self.state = self.HALF_OPEN
+            return 0.0
+
+    @property
+    def exhausted(self):
+        return self.consecutive_opens >= self.max_opens
+
+    def reset(self):
+        self.record_success()
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.consecutive_opens = 0
+            self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        self.consecutive_opens += 1
+
+class RetryQueue:
+    # Failed months wait here until their backoff expires, while the fetchers move on.
+    def __init__(self):
+        self._heap = []
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
+
+    def push(self, item, delay):
+        with self._lock:
+            self._counter += 1
+            heapq.heappush(self._heap, (time.monotonic() + delay, self._counter, item))
+
+    def pop_ready(self):
+        with self._lock:
+            if self._heap and self._heap[0][0] <= time.monotonic():
+                return heapq.heappop(self._heap)[2]
+            return None
+
+    def next_ready_in(self):
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(self._heap[0][0] - time.monotonic(), 0.0)
+
+class MonthFetcher:
+    def __init__(self, scraper, policy=None, breaker=None, throttle=None, metrics=None, progress=None):
+        self.scraper = scraper
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.throttle = throttle or AdaptiveThrottle()
+        self.metrics = metrics
+        self.progress = progress
+        self.retry_queue = RetryQueue()
+        self.stop_event = threading.Event()
+
+    def _increment(self, name, amount=1):
+        if self.metrics is not None:
+            self.metrics.increment(name, amount)
+
+    def _wait_for_circuit(self):
+        wait = self.breaker.wait_time()
+        announced = False
+        while wait > 0 and not self.stop_event.is_set():
+            if self.breaker.exhausted:
+                raise CircuitOpenError("Calendar site is still failing; giving up on this sync.")
+            if not announced and self.breaker.state == CircuitBreaker.OPEN:
+                announced = True
+                if self.progress:
+                    self.progress(f"Calendar site is failing; pausing sync for {wait:.0f}s...")
+            self.stop_event.wait(min(wait, 1.0))
+            wait = self.breaker.wait_time()
+
+    def fetch(self, year, month_index):
+        # One request, through the circuit breaker and the throttle. Raises FetchError.
+        self._wait_for_circuit()
+        self.throttle.wait(self.stop_event)
+        month_name = self.scraper.NEPALI_MONTHS_LIST[month_index]
+        try:
+            html = self.scraper.fetch_page(year, month_name, raise_errors=True)
+        except FetchError as e:
+            opened = self.breaker.times_opened
+            if e.retryable:
+                self.breaker.record_failure()
+            if e.status in (429, 503):
+                self.throttle.penalize()
+            if self.breaker.times_opened > opened:
+                self._increment("circuit_breaks")
+            raise
+        self.breaker.record_success()
+        self.throttle.reward()
+        return html
+
+    def run(self, tasks, on_page):
+        # Drains tasks (a queue.Queue of (year, month_index), possibly shared by several threads),
+        # deferring retryable failures to the retry queue. on_page(year, month_index, html, started)
+        # gets html=None for a month that failed for good.
+        while not self.stop_event.is_set():
+            item = self.retry_queue.pop_ready()
+            if item is None:
+                try:
+                    year, month_index = tasks.get_nowait()
+                    item = (year, month_index, 0, time.perf_counter())
+                except queue.Empty:
+                    wait = self.retry_queue.next_ready_in()
+                    if wait is None:
+                        return
+                    self.stop_event.wait(min(wait, 0.5))
+                    continue
+
+            year, month_index, attempt, started = item
+            try:
+                html = self.fetch(year, month_index)
+            except FetchError as e:
+                month_name = self.scraper.NEPALI_MONTHS_LIST[month_index]
+                if not self.policy.should_retry(e, attempt):
+                    print(e)
+                    on_page(year, month_index, None, started)
+                    continue
+                delay = self.policy.delay(attempt, e.retry_after)
+                self._increment("retries")
+                if self.metrics is not None:
+                    self.metrics.record_month(self.metrics.month_key(year, month_index), retries=1)
+                if self.progress:
+                    self.progress(f"Failed {month_name} {year} ({e.status or 'no response'}); retrying in {delay:.0f}s.")
+                self.retry_queue.push((year, month_index, attempt + 1, started), delay)
+                continue
+            on_page(year, month_index, html, started)
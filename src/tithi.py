@@ -0,0 +1,46 @@
+from functools import lru_cache
+
+# Scraped pages only give the tithi name, not the paksha, so codes are the tithi number within
+# the fortnight (1-14), with Purnima as 15 and Aaunsi (Amavasya) as 30. 0 means unknown.
+TITHI_NAMES = {
+    1: "Pratipada", 2: "Dwitiya", 3: "Tritiya", 4: "Chaturthi", 5: "Panchami",
+    6: "Sasthi", 7: "Saptami", 8: "Astami", 9: "Nawami", 10: "Dashami",
+    11: "Ekadashi", 12: "Dwadashi", 13: "Trayodashi", 14: "Chaturdashi",
+    15: "Purnima", 30: "Aaunsi"
+}
+TITHI_CODES = [0] + list(TITHI_NAMES)
+
+_TITHI_ALIASES = {
+    "प्रतिपदा": 1, "द्वितीया": 2, "दृतीया": 2, "तृतीया": 3, "चतुर्थी": 4, "पञ्चमी": 5, "पंचमी": 5,
+    "षष्ठी": 6, "सप्तमी": 7, "अष्टमी": 8, "नवमी": 9, "दशमी": 10, "एकादशी": 11, "द्वादशी": 12,
+    "त्रयोदशी": 13, "त्रायोदशी": 13, "चतुर्दशी": 14, "चतुर्दशि": 14, "चतुर्दसी": 14,
+    "पुर्णिमा": 15, "पूर्णिमा": 15, "औसी": 30, "औंसी": 30, "अमावस्या": 30,
+    "dwitiya": 2, "dwitya": 2, "sashti": 6, "shasthi": 6, "ashtami": 8, "navami": 9,
+    "purnima": 15, "aaunsi": 30, "aunsi": 30, "amavasya": 30,
+}
+_TITHI_ALIASES.update({name.lower(): code for code, name in TITHI_NAMES.items()})
+
+@lru_cache(maxsize=None)
+def tithi_code(name):
+    if not name:
+        return 0
+    # Festival tithis look like "मोक्षदा एकादशी" and split days like "तृतीया/चतुर्थी"; the
+    # tithi itself is the last word of the first alternative.
+    words = name.split("/")[0].split()
+    if not words:
+        return 0
+    return _TITHI_ALIASES.get(words[-1].lower(), _TITHI_ALIASES.get(name.strip().lower(), 0))
+
+def has_tithi(data):
+    # Whether a record's scraped tithi is usable. Empty or unrecognised ones (the site shows "0"
+    # on some days) are replaced by the computed tithi everywhere a record is shown.
+    return tithi_code(data.get('tithi')) != 0
+
+def tithi_name(code):
+    return TITHI_NAMES.get(code, "")
+
+def tithi_code_from_number(number):
+    # Converts a tithi number of the lunar month (1-30) to a paksha-less code.
+    if number in (15, 30):
+        return number
+    return (number - 1) % 15 + 1
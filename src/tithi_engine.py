@@ -0,0 +1,139 @@
+import numpy as np
+from src.tithi import tithi_code, tithi_name
+
+# Tithi computed from the Sun-Moon elongation, for days the scraped data does not cover. The
+# Moon is Meeus' ELP-2000/82 truncation ("Astronomical Algorithms", ch. 47) and the Sun his
+# low-precision theory (ch. 25): about 10" and 0.01 degrees, against tithis 12 degrees wide.
+# A day's tithi is the one in force at sunrise in Kathmandu, as in the printed patro.
+
+KATHMANDU_LATITUDE = 27.7172
+KATHMANDU_LONGITUDE = 85.3240
+SUNRISE_ALTITUDE = -0.833
+J2000 = 2451545.0
+_UNIX_EPOCH_JD = 2440587.5
+
+# Periodic terms of the Moon's longitude (Meeus table 47.A): multiples of D, M, M', F and the
+# coefficient in 1e-6 degrees.
+_MOON_TERMS = np.array([
+    (0, 0, 1, 0, 6288774), (2, 0, -1, 0, 1274027), (2, 0, 0, 0, 658314), (0, 0, 2, 0, 213618),
+    (0, 1, 0, 0, -185116), (0, 0, 0, 2, -114332), (2, 0, -2, 0, 58793), (2, -1, -1, 0, 57066),
+    (2, 0, 1, 0, 53322), (2, -1, 0, 0, 45758), (0, 1, -1, 0, -40923), (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383), (2, 0, 0, -2, 15327), (0, 0, 1, 2, -12528), (0, 0, 1, -2, 10980),
+    (4, 0, -1, 0, 10675), (0, 0, 3, 0, 10034), (4, 0, -2, 0, 8548), (2, 1, -1, 0, -7888),
+    (2, 1, 0, 0, -6766), (1, 0, -1, 0, -5163), (1, 1, 0, 0, 4987), (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994), (4, 0, 0, 0, 3861), (2, 0, -3, 0, 3665), (0, 1, -2, 0, -2689),
+    (2, 0, -1, 2, -2602), (2, -1, -2, 0, 2390), (1, 0, 1, 0, -2348), (2, -2, 0, 0, 2236),
+    (0, 1, 2, 0, -2120), (0, 2, 0, 0, -2069), (2, -2, -1, 0, 2048), (2, 0, 1, -2, -1773),
+    (2, 0, 0, 2, -1595), (4, -1, -1, 0, 1215), (0, 0, 2, 2, -1110), (3, 0, -1, 0, -892),
+    (2, 1, 1, 0, -810), (4, -1, -2, 0, 759), (0, 2, -1, 0, -713), (2, 2, -1, 0, -700),
+    (2, 1, -2, 0, 691), (2, -1, 0, -2, 596), (4, 0, 1, 0, 549), (0, 0, 4, 0, 537),
+    (4, -1, 0, 0, 520), (1, 0, -2, 0, -487), (2, 1, 0, -2, -399), (0, 0, 2, -2, -381),
+    (1, 1, 1, 0, 351), (3, 0, -2, 0, -340), (4, 0, -3, 0, 330), (2, -1, 2, 0, 327),
+    (0, 2, 1, 0, -323), (1, 1, -1, 0, 299), (2, 0, 3, 0, 294),
+], dtype=np.float64)
+
+def _to_days(dates):
+    # Accepts "YYYY-MM-DD" strings, date objects or datetime64 values; returns datetime64[D].
+    return np.asarray(dates, dtype="datetime64[D]")
+
+def _delta_t_days(jd):
+    # TT - UT from the long-term parabola (Morrison & Stephenson). It is off by up to ~20 s in
+    # this era, in which the elongation moves by less than 0.003 degrees.
+    years = (jd - J2000) / 365.25 + 2000.0
+    return (-20.0 + 32.0 * ((years - 1820.0) / 100.0) ** 2) / 86400.0
+
+def sun_longitude(jde):
+    # Apparent geocentric longitude of the Sun in degrees, without nutation (which cancels in
+    # the elongation).
+    t = (jde - J2000) / 36525.0
+    mean_longitude = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    anomaly = np.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    center = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * np.sin(anomaly)
+              + (0.019993 - 0.000101 * t) * np.sin(2 * anomaly) + 0.000289 * np.sin(3 * anomaly))
+    return np.mod(mean_longitude + center - 0.00569, 360.0)
+
+def moon_longitude(jde):
+    # Geocentric longitude of the Moon in degrees, without nutation.
+    t = (jde - J2000) / 36525.0
+    mean_longitude = 218.3164477 + 481267.88123421 * t - 0.0015786 * t ** 2 + t ** 3 / 538841 - t ** 4 / 65194000
+    elongation = 297.8501921 + 445267.1114034 * t - 0.0018819 * t ** 2 + t ** 3 / 545868 - t ** 4 / 113065000
+    sun_anomaly = 357.5291092 + 35999.0502909 * t - 0.0001536 * t ** 2 + t ** 3 / 24490000
+    moon_anomaly = 134.9633964 + 477198.8675055 * t + 0.0087414 * t ** 2 + t ** 3 / 69699 - t ** 4 / 14712000
+    latitude_argument = 93.2720950 + 483202.0175233 * t - 0.0036539 * t ** 2 - t ** 3 / 3526000 + t ** 4 / 863310000
+    arguments = np.radians(np.stack([elongation, sun_anomaly, moon_anomaly, latitude_argument], axis=-1))
+
+    # Terms with the Sun's anomaly shrink with the Earth's orbital eccentricity.
+    eccentricity = 1.0 - 0.002516 * t - 0.0000074 * t * t
+    sun_multiple = np.abs(_MOON_TERMS[:, 1])
+    factors = np.where(sun_multiple == 1, eccentricity[..., None], 1.0)
+    factors = np.where(sun_multiple == 2, (eccentricity ** 2)[..., None], factors)
+    total = (factors * _MOON_TERMS[:, 4] * np.sin(arguments @ _MOON_TERMS[:, :4].T)).sum(axis=-1)
+
+    a1 = np.radians(119.75 + 131.849 * t)
+    a2 = np.radians(53.09 + 479264.290 * t)
+    total += 3958 * np.sin(a1) + 1962 * np.sin(np.radians(mean_longitude - latitude_argument)) + 318 * np.sin(a2)
+    return np.mod(mean_longitude + total / 1e6, 360.0)
+
+def elongation(jd_ut):
+    # Moon minus Sun longitude (0-360 degrees) at the given UT Julian days.
+    jde = jd_ut + _delta_t_days(jd_ut)
+    return np.mod(moon_longitude(jde) - sun_longitude(jde), 360.0)
+
+def sunrise_jd(dates, latitude=KATHMANDU_LATITUDE, longitude=KATHMANDU_LONGITUDE):
+    # UT Julian day of sunrise on each date, from the Sun's declination and the equation of time
+    # at local noon. Good to about a minute, which is all a sunrise tithi needs.
+    midnight = _to_days(dates).astype(np.int64) + _UNIX_EPOCH_JD
+    noon = midnight + 0.5 - longitude / 360.0
+    t = (noon - J2000) / 36525.0
+    true_longitude = np.radians(sun_longitude(noon))
+    obliquity = np.radians(23.439291 - 0.0130042 * t)
+    declination = np.arcsin(np.sin(obliquity) * np.sin(true_longitude))
+    right_ascension = np.degrees(np.arctan2(np.cos(obliquity) * np.sin(true_longitude), np.cos(true_longitude)))
+    mean_longitude = 280.46646 + 36000.76983 * t
+    equation_of_time = (np.mod(mean_longitude - 0.0057183 - right_ascension + 180.0, 360.0) - 180.0) / 360.0
+    phi = np.radians(latitude)
+    cos_hour_angle = ((np.sin(np.radians(SUNRISE_ALTITUDE)) - np.sin(phi) * np.sin(declination))
+                      / (np.cos(phi) * np.cos(declination)))
+    hour_angle = np.degrees(np.arccos(np.clip(cos_hour_angle, -1.0, 1.0))) / 360.0
+    return midnight + 0.5 - longitude / 360.0 - equation_of_time - hour_angle
+
+def tithi_numbers(dates):
+    # Tithi of the lunar month at sunrise, 1-30 (1-15 Shukla paksha, 16-30 Krishna paksha).
+    return (elongation(sunrise_jd(dates)) // 12.0).astype(np.int64) + 1
+
+def tithi_codes(dates):
+    # The same as paksha-less codes (see src.tithi), comparable with the scraped names.
+    numbers = tithi_numbers(dates)
+    return np.where((numbers == 15) | (numbers == 30), numbers, (numbers - 1) % 15 + 1)
+
+def tithi_for_date(date_str):
+    # Name of the tithi at sunrise on an A.D. date, e.g. "Ekadashi".
+    return tithi_name(int(tithi_codes([date_str])[0]))
+
+def cross_check(calendar_data):
+    # Compares the computed tithi with the scraped one on every day whose name is recognised.
+    # "adjacent" counts the disagreements that are off by one tithi, i.e. days where a tithi
+    # change falls close to sunrise or a tithi is skipped or repeated differently.
+    dates = sorted(calendar_data)
+    scraped = np.array([tithi_code(calendar_data[date_str].get('tithi')) for date_str in dates], dtype=np.int64)
+    computed = tithi_codes(dates)
+    known = scraped > 0
+    agreed = known & (scraped == computed)
+    distance = np.abs(np.where(scraped == 30, 15, scraped) - np.where(computed == 30, 15, computed))
+    adjacent = known & ~agreed & ((distance == 1) | (distance == 14))
+    years = np.array([calendar_data[date_str]['nepali_year'] for date_str in dates], dtype=np.int64)
+    by_year = {}
+    for year in np.unique(years):
+        in_year = known & (years == year)
+        by_year[int(year)] = round(float(agreed[in_year].sum() / max(in_year.sum(), 1)), 4)
+    compared = int(known.sum())
+    return {
+        "days": len(dates),
+        "compared": compared,
+        "agreed": int(agreed.sum()),
+        "agreement": round(float(agreed.sum() / compared), 4) if compared else None,
+        "adjacent": int(adjacent.sum()),
+        "other": int((known & ~agreed & ~adjacent).sum()),
+        "by_year": by_year,
+        "mismatches": [date_str for date_str, bad in zip(dates, known & ~agreed) if bad],
+    }
@@ -0,0 +1,58 @@
+import json
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QLocalServer
+from src.file_utils import file_lock
+from src.single_instance import server_address, instance_running, lock_path
+
+# The running instance's end of src.single_instance: accepts one JSON command per connection,
+# passes it to handler (MainWindow.handle_command) and writes back its reply.
+class InstanceServer(QObject):
+    def __init__(self, handler=None, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.server = QLocalServer(self)
+        # Only this user may connect (socket file permissions on Unix, pipe ACL on Windows).
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self):
+        # False if another instance already owns the name. Checked first, since with access
+        # options Qt moves its new socket over an existing one. A socket file left behind by a
+        # crashed instance accepts no connections and is removed. All of it happens under a lock,
+        # so a launch starting at the same moment waits and then finds this one running.
+        with file_lock(lock_path()):
+            if instance_running():
+                return False
+            address = server_address()
+            QLocalServer.removeServer(address)
+            return self.server.listen(address)
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            self._buffers[connection] = b""
+            connection.readyRead.connect(lambda connection=connection: self._on_ready_read(connection))
+            connection.disconnected.connect(lambda connection=connection: self._on_disconnected(connection))
+
+    def _on_disconnected(self, connection):
+        self._buffers.pop(connection, None)
+        connection.deleteLater()
+
+    def _on_ready_read(self, connection):
+        data = self._buffers.get(connection, b"") + bytes(connection.readAll())
+        if not data.endswith(b"\n"):
+            self._buffers[connection] = data
+            return
+        self._buffers[connection] = b""
+        try:
+            command = json.loads(data.decode("utf-8"))
+            if self.handler is None:
+                reply = {"ok": False, "error": "Not ready."}
+            else:
+                reply = self.handler(command)
+        except (ValueError, AttributeError) as e:
+            reply = {"ok": False, "error": f"Bad command: {e}"}
+        connection.write((json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8"))
+        connection.flush()
+        connection.disconnectFromServer()
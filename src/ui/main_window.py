@@ -10,17 +10,22 @@ import requests
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 
+from src.calendar_data import NEPALI_MONTHS
+from src.bs_date import format_duration, format_bs_date
 from src.data_manager import DataManager
 from src.settings_manager import SettingsManager
+from src.user_events import UserEventStore, REPEAT_CHOICES
+from src.ui.tracing import tracer, traced
 
 from PySide6.QtWidgets import QStyle
-from PySide6.QtCore import Qt, QTimer, QPoint, QThread, Signal, QSize, QDate, QTime, QObject
+from PySide6.QtCore import Qt, QTimer, QPoint, QThread, Signal, QSize, QDate, QTime, QObject, QStringListModel
 from PySide6.QtGui import QIcon, QAction, QScreen, QPainter, QColor, QFont, QMouseEvent, QCursor, QPixmap
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                                 QFrame, QSystemTrayIcon, QMenu, QDialog, QDialogButtonBox,
                                 QComboBox, QGridLayout, QScrollArea, QPushButton, QListWidget,
                                 QListWidgetItem, QSpinBox, QCheckBox, QStyle, QSizeGrip, QTabWidget,
-                                QDateEdit, QMessageBox, QLineEdit, QTimeEdit, QTextEdit)
+                                QDateEdit, QMessageBox, QLineEdit, QTimeEdit, QTextEdit, QListView,
+                                QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog)
 
 try:
     with open("src/styles/light_theme.css", "r") as f:
@@ -177,6 +182,15 @@ class SettingsDialog(QDialog):
         resizing_layout.addWidget(reset_button)
         layout.addLayout(resizing_layout)
 
+        catchup_layout = QHBoxLayout()
+        catchup_layout.addWidget(QLabel("Missed Reminders:"))
+        self.catchup_combo = QComboBox()
+        self.catchup_combo.addItems(["Fire All", "Fire Latest", "Summarize"])
+        self.catchup_combo.setCurrentText(self.settings_manager.get("reminder_catchup_policy"))
+        self.catchup_combo.setToolTip("How reminders that became due while the computer was asleep or off are shown.")
+        catchup_layout.addWidget(self.catchup_combo)
+        layout.addLayout(catchup_layout)
+
         sync_layout = QGridLayout()
         sync_layout.addWidget(QLabel("Sync Start Year (BS):"), 0, 0)
         self.start_year_spin = QSpinBox()
@@ -207,6 +221,7 @@ class SettingsDialog(QDialog):
         self.settings_manager.set("theme", self.theme_combo.currentText())
         self.settings_manager.set("widget_placement", self.placement_combo.currentText())
         self.settings_manager.set("resizing_enabled", self.resize_checkbox.isChecked())
+        self.settings_manager.set("reminder_catchup_policy", self.catchup_combo.currentText())
         if platform.system() == "Windows": 
             self.settings_manager.set_startup(self.startup_checkbox.isChecked())
         self.settings_manager.set("sync_start_year", self.start_year_spin.value())
@@ -276,12 +291,16 @@ class DateToolsDialog(QDialog):
         tab_widget.addTab(self._create_converter_tab(), "Converter")
         tab_widget.addTab(self._create_age_calculator_tab(), "Age Calculator")
         tab_widget.addTab(self._create_date_difference_tab(), "Date Difference")
+        tab_widget.addTab(self._create_working_days_tab(), "Working Days")
         
         main_layout.addWidget(tab_widget)
         
         button_box = QDialogButtonBox(QDialogButtonBox.Close)
         button_box.rejected.connect(self.reject)
         main_layout.addWidget(button_box)
+        # A lookup outside the synced range fetches the month and re-runs when it arrives.
+        self.pending_lookups = {}
+        self.data_manager.month_synced.connect(self.on_month_synced)
     
     def _create_converter_tab(self):
         tab = QWidget()
@@ -309,7 +328,7 @@ class DateToolsDialog(QDialog):
         self.bs_year_input = QSpinBox()
         self.bs_year_input.setRange(2000, 2100)
         self.bs_month_input = QComboBox()
-        self.bs_month_input.addItems([m for m in self.data_manager.scraper.NEPALI_MONTHS_LIST])
+        self.bs_month_input.addItems(NEPALI_MONTHS)
         self.bs_day_input = QSpinBox()
         self.bs_day_input.setRange(1, 32)
         bs_lookup_btn = QPushButton("Lookup")
@@ -334,9 +353,11 @@ class DateToolsDialog(QDialog):
         age_calc_btn = QPushButton("Calculate Age")
         age_calc_btn.clicked.connect(self.calculate_age)
         self.age_result_label = QLabel("Result: ...")
+        self.age_bs_result_label = QLabel("B.S.: ...")
         layout.addWidget(self.age_input, 1, 1)
         layout.addWidget(age_calc_btn, 2, 1)
         layout.addWidget(self.age_result_label, 3, 0, 1, 2)
+        layout.addWidget(self.age_bs_result_label, 4, 0, 1, 2)
         return tab
 
     def _create_date_difference_tab(self):
@@ -354,8 +375,63 @@ class DateToolsDialog(QDialog):
         diff_calc_btn = QPushButton("Calculate Difference")
         diff_calc_btn.clicked.connect(self.calculate_difference)
         self.diff_result_label = QLabel("Result: ...")
+        self.diff_bs_result_label = QLabel("B.S.: ...")
         layout.addWidget(diff_calc_btn, 3, 1)
         layout.addWidget(self.diff_result_label, 4, 0, 1, 2)
+        layout.addWidget(self.diff_bs_result_label, 5, 0, 1, 2)
+
+        layout.addWidget(QLabel("<b>Add to Start Date (B.S.)</b>"), 6, 0, 1, 2)
+        offset_layout = QHBoxLayout()
+        self.bs_add_inputs = []
+        for unit in ("Years", "Months", "Days"):
+            spin = QSpinBox()
+            spin.setRange(-36500, 36500)
+            spin.setSuffix(f" {unit.lower()}")
+            offset_layout.addWidget(spin)
+            self.bs_add_inputs.append(spin)
+        layout.addLayout(offset_layout, 7, 0, 1, 2)
+        bs_add_btn = QPushButton("Calculate Date")
+        bs_add_btn.clicked.connect(self.calculate_bs_offset)
+        self.bs_add_result_label = QLabel("Result: ...")
+        layout.addWidget(bs_add_btn, 8, 1)
+        layout.addWidget(self.bs_add_result_label, 9, 0, 1, 2)
+        layout.addWidget(QLabel("<i>Months are counted in B.S.; a day past the end of a month moves to its last day.</i>"), 10, 0, 1, 2)
+        return tab
+
+    def _create_working_days_tab(self):
+        tab = QWidget()
+        layout = QGridLayout(tab)
+        layout.addWidget(QLabel("<b>Working Days Between</b>"), 0, 0, 1, 2)
+        layout.addWidget(QLabel("Start Date:"), 1, 0)
+        self.work_start_input = QDateEdit(QDate.currentDate())
+        self.work_start_input.setCalendarPopup(True)
+        layout.addWidget(self.work_start_input, 1, 1)
+        layout.addWidget(QLabel("End Date:"), 2, 0)
+        self.work_end_input = QDateEdit(QDate.currentDate().addDays(30))
+        self.work_end_input.setCalendarPopup(True)
+        layout.addWidget(self.work_end_input, 2, 1)
+        work_count_btn = QPushButton("Count Working Days")
+        work_count_btn.clicked.connect(self.calculate_working_days)
+        self.work_count_result_label = QLabel("Result: ...")
+        layout.addWidget(work_count_btn, 3, 1)
+        layout.addWidget(self.work_count_result_label, 4, 0, 1, 2)
+
+        layout.addWidget(QLabel("<b>Add Working Days</b>"), 5, 0, 1, 2)
+        layout.addWidget(QLabel("From Date:"), 6, 0)
+        self.work_from_input = QDateEdit(QDate.currentDate())
+        self.work_from_input.setCalendarPopup(True)
+        layout.addWidget(self.work_from_input, 6, 1)
+        layout.addWidget(QLabel("Working Days:"), 7, 0)
+        self.work_days_input = QSpinBox()
+        self.work_days_input.setRange(-10000, 10000)
+        self.work_days_input.setValue(10)
+        layout.addWidget(self.work_days_input, 7, 1)
+        work_add_btn = QPushButton("Calculate Date")
+        work_add_btn.clicked.connect(self.calculate_working_day_offset)
+        self.work_add_result_label = QLabel("Result: ...")
+        layout.addWidget(work_add_btn, 8, 1)
+        layout.addWidget(self.work_add_result_label, 9, 0, 1, 2)
+        layout.addWidget(QLabel("<i>Saturdays and public holidays are not working days.</i>"), 10, 0, 1, 2)
         return tab
 
     def lookup_ad_to_bs(self):
@@ -363,8 +439,13 @@ class DateToolsDialog(QDialog):
         nep_data = self.data_manager.get_data_for_date(ad_date)
         if nep_data:
             self.ad_result_label.setText(f"Result: {nep_data['nepali_date_expanded']}, {nep_data['weekday']}")
+        elif self.data_manager.request_date(ad_date):
+            for month in self.data_manager.estimate_nepali_months(ad_date):
+                self.pending_lookups[month] = self.lookup_ad_to_bs
+            self.ad_result_label.setText("Result: Fetching this month...")
         else:
-            self.ad_result_label.setText("Result: Date out of sync range.")
+            tithi = self.data_manager.tithi_for_date(ad_date)
+            self.ad_result_label.setText(f"Result: Date out of sync range. Tithi (computed): {tithi}")
 
     def lookup_bs_to_ad(self):
         nep_data = self.data_manager.lookup_bs_to_ad(
@@ -374,14 +455,29 @@ class DateToolsDialog(QDialog):
         )
         if nep_data:
             self.bs_result_label.setText(f"Result: {nep_data['gregorian_date_expanded']}, {nep_data['weekday']}")
+        elif self.data_manager.request_month(self.bs_year_input.value(), self.bs_month_input.currentIndex()):
+            self.pending_lookups[(self.bs_year_input.value(), self.bs_month_input.currentIndex())] = self.lookup_bs_to_ad
+            self.bs_result_label.setText("Result: Fetching this month...")
         else:
             self.bs_result_label.setText("Result: Invalid BS Date or out of range.")
+
+    def on_month_synced(self, year, month_index):
+        lookup = self.pending_lookups.pop((year, month_index), None)
+        if lookup:
+            lookup()
     
     def calculate_age(self):
         birth_date = self.age_input.date().toPython()
         today = QDate.currentDate().toPython()
         delta = relativedelta(today, birth_date)
         self.age_result_label.setText(f"Result: {delta.years} years, {delta.months} months, {delta.days} days")
+        bs_calendar = self.data_manager.get_bs_calendar()
+        birth_bs, today_bs = bs_calendar.from_ad(birth_date), bs_calendar.from_ad(today)
+        if birth_bs and today_bs:
+            duration = format_duration(*bs_calendar.difference(birth_bs, today_bs))
+            self.age_bs_result_label.setText(f"B.S.: {duration} (born {format_bs_date(birth_bs)})")
+        else:
+            self.age_bs_result_label.setText("B.S.: Date out of range.")
 
     def calculate_difference(self):
         start_date = self.diff_start_input.date().toPython()
@@ -392,9 +488,45 @@ class DateToolsDialog(QDialog):
         delta = relativedelta(end_date, start_date)
         total_days = (end_date - start_date).days
         self.diff_result_label.setText(f"Result: {delta.years}Y, {delta.months}M, {delta.days}D ({total_days} total days)")
+        bs_calendar = self.data_manager.get_bs_calendar()
+        start_bs, end_bs = bs_calendar.from_ad(start_date), bs_calendar.from_ad(end_date)
+        if start_bs and end_bs:
+            years, months, days = bs_calendar.difference(start_bs, end_bs)
+            self.diff_bs_result_label.setText(f"B.S.: {years}Y, {months}M, {days}D ({format_bs_date(start_bs)} to {format_bs_date(end_bs)})")
+        else:
+            self.diff_bs_result_label.setText("B.S.: Date out of range.")
+
+    def calculate_bs_offset(self):
+        bs_calendar = self.data_manager.get_bs_calendar()
+        start_bs = bs_calendar.from_ad(self.diff_start_input.date().toPython())
+        years, months, days = (spin.value() for spin in self.bs_add_inputs)
+        result = bs_calendar.add(start_bs, years, months, days) if start_bs else None
+        if result:
+            self.bs_add_result_label.setText(f"Result: {format_bs_date(result)} ({bs_calendar.to_ad(result).strftime('%b %d, %Y')})")
+        else:
+            self.bs_add_result_label.setText("Result: Date out of range.")
+
+    def calculate_working_days(self):
+        start_date = self.work_start_input.date().toString("yyyy-MM-dd")
+        end_date = self.work_end_input.date().toString("yyyy-MM-dd")
+        working_days = self.data_manager.working_days.working_days_between(start_date, end_date)
+        if working_days is None:
+            self.work_count_result_label.setText("Result: Date out of sync range.")
+            return
+        total_days = self.work_start_input.date().daysTo(self.work_end_input.date())
+        self.work_count_result_label.setText(f"Result: {working_days} working days ({abs(total_days) + 1} calendar days, inclusive)")
+
+    def calculate_working_day_offset(self):
+        from_date = self.work_from_input.date().toString("yyyy-MM-dd")
+        result_date = self.data_manager.working_days.add_working_days(from_date, self.work_days_input.value())
+        nep_data = self.data_manager.get_data_for_date(result_date) if result_date else None
+        if nep_data:
+            self.work_add_result_label.setText(f"Result: {nep_data['gregorian_date_expanded']} ({nep_data['nepali_date_expanded']}), {nep_data['weekday']}")
+        else:
+            self.work_add_result_label.setText("Result: Date out of sync range.")
 
 class ReminderAlert(QDialog):
-    def __init__(self, text, parent=None):
+    def __init__(self, text, parent=None, blink_timer=None):
         super().__init__(parent)
         self.setWindowTitle("Reminder!")
         self.setWindowFlags(Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
@@ -407,23 +539,29 @@ class ReminderAlert(QDialog):
         layout.addWidget(self.main_frame)
 
         content_layout = QVBoxLayout(self.main_frame)
-        title = QLabel("⏰ Reminder!")
-        title.setStyleSheet("font-size: 16px; font-weight: bold; padding: 5px; color: #b85656;")
-        content_layout.addWidget(title)
+        self.title_label = QLabel("⏰ Reminder!")
+        self.title_label.setStyleSheet("font-size: 16px; font-weight: bold; padding: 5px; color: #b85656;")
+        content_layout.addWidget(self.title_label)
         
-        reminder_text = QLabel(text)
-        reminder_text.setWordWrap(True)
-        reminder_text.setStyleSheet("font-size: 14px; padding: 10px;")
-        content_layout.addWidget(reminder_text)
+        self._create_content(content_layout, text)
         
         dismiss_button = QPushButton("Dismiss")
         dismiss_button.clicked.connect(self.accept)
         content_layout.addWidget(dismiss_button, 0, Qt.AlignRight)
 
-        self.blink_timer = QTimer(self)
-        self.blink_timer.timeout.connect(self.toggle_style)
         self.is_blinked = False
-        self.blink_timer.start(500)
+        if blink_timer is None:
+            blink_timer = QTimer(self)
+            blink_timer.start(500)
+        self.blink_timer = blink_timer
+        self.blink_timer.timeout.connect(self.toggle_style)
+        self.finished.connect(lambda: self.blink_timer.timeout.disconnect(self.toggle_style))
+
+    def _create_content(self, content_layout, text):
+        reminder_text = QLabel(text)
+        reminder_text.setWordWrap(True)
+        reminder_text.setStyleSheet("font-size: 14px; padding: 10px;")
+        content_layout.addWidget(reminder_text)
 
     def toggle_style(self):
         if self.is_blinked:
@@ -432,6 +570,34 @@ class ReminderAlert(QDialog):
             self.main_frame.setStyleSheet("border: 2px solid #b85656;")
         self.is_blinked = not self.is_blinked
 
+class ReminderBurstAlert(ReminderAlert):
+    def __init__(self, parent=None, blink_timer=None):
+        super().__init__(None, parent, blink_timer)
+        self.setMinimumWidth(360)
+        self.reminder_count = 0
+        self.skipped_count = 0
+
+    def _create_content(self, content_layout, text):
+        self.reminder_model = QStringListModel(self)
+        self.reminder_list = QListView()
+        self.reminder_list.setModel(self.reminder_model)
+        self.reminder_list.setUniformItemSizes(True)
+        self.reminder_list.setWordWrap(True)
+        self.reminder_list.setEditTriggers(QListView.NoEditTriggers)
+        content_layout.addWidget(self.reminder_list)
+
+    def add_entries(self, entries, reminder_count, skipped_count=0):
+        row = self.reminder_model.rowCount()
+        self.reminder_model.insertRows(row, len(entries))
+        for i, entry in enumerate(entries):
+            self.reminder_model.setData(self.reminder_model.index(row + i), entry)
+        self.reminder_count += reminder_count
+        self.skipped_count += skipped_count
+        title = f"⏰ {self.reminder_count} Reminder{'s' if self.reminder_count != 1 else ''}!"
+        if self.skipped_count:
+            title += f" (+{self.skipped_count} older skipped)"
+        self.title_label.setText(title)
+
 class AddReminderDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -521,6 +687,100 @@ class RemindersDialog(QDialog):
     def get_updated_reminders(self):
         return self.reminders
 
+class AddUserEventDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Add Event")
+        layout = QGridLayout(self)
+
+        layout.addWidget(QLabel("Event:"), 0, 0)
+        self.title_input = QLineEdit()
+        layout.addWidget(self.title_input, 0, 1)
+
+        layout.addWidget(QLabel("Date (A.D.):"), 1, 0)
+        self.date_input = QDateEdit(QDate.currentDate())
+        self.date_input.setCalendarPopup(True)
+        layout.addWidget(self.date_input, 1, 1)
+
+        layout.addWidget(QLabel("Repeat:"), 2, 0)
+        self.repeat_combo = QComboBox()
+        for repeat, label in REPEAT_CHOICES.items():
+            self.repeat_combo.addItem(label, repeat)
+        layout.addWidget(self.repeat_combo, 2, 1)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box, 3, 0, 1, 2)
+
+    def get_event_data(self):
+        return self.title_input.text().strip(), self.date_input.date().toString("yyyy-MM-dd"), self.repeat_combo.currentData()
+
+class UserEventsDialog(QDialog):
+    def __init__(self, data_manager, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self.user_events = data_manager.user_events
+        self.setWindowTitle("My Events")
+        self.setMinimumSize(450, 300)
+
+        layout = QVBoxLayout(self)
+        self.list_widget = QListWidget()
+        self.populate_list()
+        layout.addWidget(self.list_widget)
+
+        button_layout = QHBoxLayout()
+        add_btn = QPushButton("Add Event")
+        import_btn = QPushButton("Import...")
+        remove_btn = QPushButton("Remove Selected")
+        add_btn.clicked.connect(self.add_event)
+        import_btn.clicked.connect(self.import_events)
+        remove_btn.clicked.connect(self.remove_event)
+        button_layout.addWidget(add_btn)
+        button_layout.addWidget(import_btn)
+        button_layout.addWidget(remove_btn)
+        layout.addLayout(button_layout)
+
+    def populate_list(self):
+        self.list_widget.clear()
+        for event in sorted(self.user_events.events, key=lambda e: e['date']):
+            item = QListWidgetItem(f"{event['date']} - {event['title']} ({REPEAT_CHOICES[event['repeat']]})")
+            item.setData(Qt.UserRole, event['id'])
+            self.list_widget.addItem(item)
+
+    def add_event(self):
+        dialog = AddUserEventDialog(self)
+        if dialog.exec():
+            title, date_str, repeat = dialog.get_event_data()
+            if not title:
+                return
+            if not self.user_events.add(title, date_str, repeat, self.data_manager.get_data_for_date(date_str)):
+                QMessageBox.warning(self, "Add Event", "That date is out of sync range, so its B.S. date is unknown.")
+                return
+            self.populate_list()
+
+    def import_events(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Events", "", "Calendars (*.ics *.csv);;All Files (*)")
+        if not path:
+            return
+        try:
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                if path.lower().endswith(".csv"):
+                    added = self.user_events.import_csv(f, self.data_manager.calendar)
+                else:
+                    added = self.user_events.import_ics(f.read(), self.data_manager.calendar)
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.warning(self, "Import Events", f"Could not read {path}: {e}")
+            return
+        QMessageBox.information(self, "Import Events", f"Imported {added} event{'s' if added != 1 else ''}.")
+        self.populate_list()
+
+    def remove_event(self):
+        selected_item = self.list_widget.currentItem()
+        if not selected_item: return
+        self.user_events.remove(selected_item.data(Qt.UserRole))
+        self.populate_list()
+
 class UpdateChecker(QObject):
     finished = Signal(str)
 
@@ -651,15 +911,176 @@ The above copyright notice and this permission notice shall be included in all c
 
 THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE."""
 
+class SyncDiagnosticsDialog(QDialog):
+    STAGE_COLUMNS = ["Stage", "Count", "Mean (ms)", "p50 (ms)", "p90 (ms)", "p99 (ms)", "Max (ms)"]
+    MONTH_COLUMNS = ["Month", "Status", "Total (s)", "Fetch (s)", "Parse (s)", "Adjust (s)", "KiB", "Retries"]
+
+    def __init__(self, sync_metrics, parent=None):
+        super().__init__(parent)
+        self.sync_metrics = sync_metrics
+        self.setWindowTitle("Sync Diagnostics")
+        self.setMinimumSize(620, 420)
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        tabs = QTabWidget()
+        self.stages_table = self._create_table(self.STAGE_COLUMNS)
+        self.months_table = self._create_table(self.MONTH_COLUMNS)
+        tabs.addTab(self.stages_table, "Stages")
+        tabs.addTab(self.months_table, "Months")
+        layout.addWidget(tabs)
+
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        save_btn = QPushButton("Save JSON...")
+        close_btn = QPushButton("Close")
+        refresh_btn.clicked.connect(self.refresh)
+        save_btn.clicked.connect(self.save_json)
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(refresh_btn)
+        button_layout.addWidget(save_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        # The sync thread keeps updating the metrics; refresh while the dialog is open.
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(1000)
+        self.refresh()
+
+    def _create_table(self, columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        return table
+
+    def _fill_table(self, table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(str(value)))
+
+    def refresh(self):
+        snapshot = self.sync_metrics.to_dict()
+        counters, progress = snapshot["counters"], snapshot["progress"]
+        eta = progress["eta_seconds"]
+        eta_text = "-" if eta is None or progress["completed"] >= progress["total"] else f"{eta:.0f}s"
+        self.summary_label.setText(
+            f"<b>Current sync:</b> {progress['completed']}/{progress['total']} months, "
+            f"{progress['elapsed_seconds']:.1f}s elapsed, ETA {eta_text}<br>"
+            f"<b>Syncs:</b> {counters['syncs_completed']}/{counters['syncs_started']} completed, {snapshot['queue_depth']} queued, "
+            f"{counters['sync_jobs_merged']} merged, {counters['sync_jobs_dropped']} dropped as duplicates &nbsp; "
+            f"<b>Months:</b> {counters['months_fetched']} fetched, {counters['months_failed']} failed, {counters['retries']} retries, "
+            f"{counters['circuit_breaks']} circuit breaks<br>"
+            f"<b>Downloaded:</b> {counters['bytes_downloaded'] / 1024:.1f} KiB &nbsp; "
+            f"<b>Years:</b> {counters['years_written']} written, {counters['years_skipped']} skipped, {counters['years_incomplete']} incomplete, {counters['days_changed']} days changed")
+
+        ms = lambda value: f"{value * 1000:.1f}" if value is not None else "-"
+        self._fill_table(self.stages_table, [
+            [name, stats["count"], ms(stats["mean"]), ms(stats["p50"]), ms(stats["p90"]), ms(stats["p99"]), ms(stats["max"])]
+            for name, stats in snapshot["stages_seconds"].items()])
+
+        seconds = lambda month, key: f"{month[key]:.2f}" if key in month else "-"
+        self._fill_table(self.months_table, [
+            [key, "OK" if month.get("ok") else ("Failed" if "ok" in month else "In progress"),
+             seconds(month, "duration_s"), seconds(month, "fetch_s"), seconds(month, "parse_s"), seconds(month, "adjust_s"),
+             f"{month.get('bytes', 0) / 1024:.1f}", month.get("retries", 0)]
+            for key, month in snapshot["months"].items()])
+
+    def save_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Sync Diagnostics", "sync_diagnostics.json", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            self.sync_metrics.dump_json(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Save Failed", f"Could not save diagnostics: {e}")
+
+class UiLatencyDialog(QDialog):
+    COLUMNS = ["Interaction", "Count", "p50 (ms)", "p90 (ms)", "p99 (ms)", "Max (ms)", "Handler p50 (ms)", "No frame"]
+
+    def __init__(self, tracer, parent=None):
+        super().__init__(parent)
+        self.tracer = tracer
+        self.setWindowTitle("UI Latency")
+        self.setMinimumSize(620, 300)
+
+        layout = QVBoxLayout(self)
+        self.enable_checkbox = QCheckBox("Trace interactions (time from the call to the next painted frame)")
+        self.enable_checkbox.setChecked(tracer.enabled)
+        self.enable_checkbox.toggled.connect(self.set_tracing)
+        layout.addWidget(self.enable_checkbox)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        clear_btn = QPushButton("Clear")
+        save_btn = QPushButton("Save JSON...")
+        close_btn = QPushButton("Close")
+        refresh_btn.clicked.connect(self.refresh)
+        clear_btn.clicked.connect(self.clear)
+        save_btn.clicked.connect(self.save_json)
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(refresh_btn)
+        button_layout.addWidget(clear_btn)
+        button_layout.addWidget(save_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+        self.refresh()
+
+    def set_tracing(self, enabled):
+        self.tracer.set_enabled(enabled)
+        self.refresh()
+
+    def clear(self):
+        self.tracer.clear()
+        self.refresh()
+
+    def refresh(self):
+        summary = self.tracer.summary()
+        state = "on" if self.tracer.enabled else "off"
+        self.summary_label.setText(f"Tracing is {state}. {len(self.tracer.samples)} of the last {self.tracer.samples.maxlen} interactions are kept.")
+        ms = lambda value: f"{value * 1000:.1f}" if value is not None else "-"
+        self.table.setRowCount(len(summary))
+        for row, (name, stats) in enumerate(summary.items()):
+            values = [name, stats["count"], ms(stats["p50"]), ms(stats["p90"]), ms(stats["p99"]), ms(stats["max"]),
+                      ms(stats["handler_p50"]), stats["no_frame"]]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(str(value)))
+
+    def save_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save UI Latency Trace", "ui_latency.json", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            self.tracer.dump_json(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Save Failed", f"Could not save the trace: {e}")
+
 class MainWindow(QMainWindow):
-    start_sync_signal = Signal(int, int, bool)
     theme_changed = Signal()
+    REMINDER_CATCHUP_GRACE_SECONDS = 60
 
     def __init__(self):
         super().__init__()
         self.setObjectName("MainWindow")
         self.settings_manager = SettingsManager()
-        self.data_manager = DataManager()
+        self.data_manager = DataManager(user_events=UserEventStore(self.settings_manager.user_events_file))
         self.is_minimized_mode = False
         self.is_maximized_mode = False
         self.is_dragging = False
@@ -676,9 +1097,14 @@ class MainWindow(QMainWindow):
         self.event_widget = None
         self.reminders = self.settings_manager.load_reminders()
         self.active_alerts = []
+        self.burst_alert = None
+        self.alert_blink_timer = QTimer(self)
         self.reminder_timer = QTimer(self)
         self.reminder_timer.timeout.connect(self.check_reminders)
         self.reminder_timer.start(10000)
+        # MITITITHI_TRACE_UI=1 traces from startup; otherwise tracing is switched on from "UI Latency...".
+        if os.environ.get("MITITITHI_TRACE_UI") == "1":
+            tracer.set_enabled(True)
 
         self.setup_threading()
         self.setup_ui()
@@ -699,9 +1125,10 @@ class MainWindow(QMainWindow):
     def setup_threading(self):
         self.sync_thread = QThread()
         self.data_manager.moveToThread(self.sync_thread)
-        self.start_sync_signal.connect(self.data_manager.run_sync)
-        self.data_manager.sync_progress.connect(self.update_sync_status)
+        self.data_manager.sync_progress_detail.connect(self.update_sync_status)
         self.data_manager.sync_finished.connect(self.on_sync_finished)
+        self.data_manager.month_synced.connect(self.on_month_synced)
+        self.data_manager.year_reloaded.connect(self.on_year_reloaded)
         self.sync_thread.start()
 
     def setup_ui(self):
@@ -735,6 +1162,7 @@ class MainWindow(QMainWindow):
 
         self.set_view_mode('widget')
         
+    @traced("set_view_mode", with_argument=True)
     def set_view_mode(self, mode):
         self.widget_view.hide()
         self.minimized_view.hide()
@@ -925,6 +1353,7 @@ class MainWindow(QMainWindow):
 
         if not data: 
             self.date_label.setText("No Data")
+            self.tithi_label.setText(self.data_manager.tithi_for_date(self.today_gregorian_str))
             return
         self.date_label.setText(f"{data['weekday'][:3]}, {data['nepali_day']} {data['nepali_month']}")
         self.tithi_label.setText(data['tithi'])
@@ -936,15 +1365,18 @@ class MainWindow(QMainWindow):
             self.populate_calendar()
     
     def populate_calendar(self):
+        # Widgets are taken out of the layout and left to Qt to delete; reparenting them to None
+        # hands them to Python's garbage collector while Qt may still reference them.
         for i in reversed(range(self.calendar_grid.count())): 
             item = self.calendar_grid.itemAt(i)
             if item and item.widget() and not item.widget().objectName() == "CalendarWeekdayHeader": 
-                item.widget().setParent(None)
+                self.calendar_grid.takeAt(i).widget().deleteLater()
         for i in reversed(range(self.event_list_layout.count())): 
-            self.event_list_layout.itemAt(i).widget().setParent(None)
+            self.event_list_layout.takeAt(i).widget().deleteLater()
         month_data = self.data_manager.get_data_for_nepali_month(self.current_calendar_nep_year, self.current_calendar_nep_month_index)
         if not month_data: 
-            self.calendar_header_button.setText("No Data")
+            fetching = self.data_manager.request_month(self.current_calendar_nep_year, self.current_calendar_nep_month_index)
+            self.calendar_header_button.setText("Fetching..." if fetching else "No Data")
             self.gregorian_header_label.setText("")
             return
         month_name = month_data[0]['nepali_month']
@@ -978,6 +1410,7 @@ class MainWindow(QMainWindow):
                 event_label.setWordWrap(True)
                 self.event_list_layout.addWidget(event_label)
     
+    @traced("navigate_month")
     def navigate_month(self, direction):
         self.current_calendar_nep_month_index += direction
         if self.current_calendar_nep_month_index > 11: 
@@ -993,11 +1426,13 @@ class MainWindow(QMainWindow):
         dialog.date_selected.connect(self.jump_to_date)
         dialog.exec()
     
+    @traced("jump_to_date")
     def jump_to_date(self, year, month_index):
         self.current_calendar_nep_year = year
         self.current_calendar_nep_month_index = month_index
         self.populate_calendar()
     
+    @traced("show_day_detail")
     def show_day_detail(self, day_data, day_widget_ref=None):
         if self.active_day_detail_dialog and self.active_day_detail_dialog.isVisible():
             self.active_day_detail_dialog.close()
@@ -1014,6 +1449,9 @@ class MainWindow(QMainWindow):
     
     def quit_application(self):
         self.settings_manager.save_reminders(self.reminders)
+        self.settings_manager.flush()
+        print(f"Settings: {self.settings_manager.writes_performed} writes, {self.settings_manager.writes_saved} coalesced.")
+        self.data_manager.close()
         self.is_quitting = True
         self.tray_icon.hide()
         QApplication.instance().quit()
@@ -1030,6 +1468,37 @@ class MainWindow(QMainWindow):
         self.activateWindow()
         self.center_window()
     
+    def handle_command(self, command):
+        # Commands from a second launch (see src.single_instance), or from this launch's own
+        # command line. Returns the reply sent back to the launching process.
+        action = command.get("action")
+        if action == "show":
+            self.show_and_center_widget()
+            return {"ok": True}
+        if action == "calendar":
+            if not self.is_maximized_mode:
+                self.set_view_mode('calendar')
+            if command.get("year") is not None:
+                self.jump_to_date(command["year"], command.get("month_index", 0))
+            self.show()
+            self.raise_()
+            self.activateWindow()
+            return {"ok": True}
+        if action in ("ad2bs", "bs2ad"):
+            parts = str(command.get("date", "")).replace("/", "-").split("-")
+            if len(parts) != 3 or not all(part.isdigit() for part in parts):
+                return {"ok": False, "error": "Dates are YYYY-MM-DD."}
+            year, month, day = (int(part) for part in parts)
+            if action == "ad2bs":
+                data = self.data_manager.get_data_for_date(f"{year:04d}-{month:02d}-{day:02d}")
+            else:
+                data = self.data_manager.lookup_bs_to_ad(year, month - 1, day) if 1 <= month <= 12 else None
+            if not data:
+                return {"ok": False, "error": "Date out of sync range."}
+            return {"ok": True, "result": {key: data[key] for key in (
+                "gregorian_date", "nepali_date", "nepali_date_expanded", "weekday", "tithi", "is_holiday", "events")}}
+        return {"ok": False, "error": f"Unknown action '{action}'."}
+
     def toggle_event_widget(self):
         if self.event_widget and self.event_widget.isVisible():
             self.event_widget.close()
@@ -1057,6 +1526,26 @@ class MainWindow(QMainWindow):
         dialog.exec()
         self.reminders = dialog.get_updated_reminders()
         self.settings_manager.save_reminders(self.reminders)
+
+    def show_user_events(self):
+        dialog = UserEventsDialog(self.data_manager, self)
+        dialog.setStyleSheet(self.styleSheet())
+        dialog.exec()
+        # Only the overlay changed, so redrawing is enough; the calendar data is not reloaded.
+        self.update_date_display()
+        if self.event_widget and self.event_widget.isVisible():
+            today_data = self.data_manager.get_data_for_date(self.today_gregorian_str)
+            self.event_widget.update_events(today_data.get('events', []) if today_data else [])
+
+    def show_sync_diagnostics(self):
+        dialog = SyncDiagnosticsDialog(self.data_manager.sync_metrics, self)
+        dialog.setStyleSheet(self.styleSheet())
+        dialog.exec()
+
+    def show_ui_latency(self):
+        dialog = UiLatencyDialog(tracer, self)
+        dialog.setStyleSheet(self.styleSheet())
+        dialog.exec()
     
     def check_reminders(self):
         now = datetime.now(pytz.timezone('Asia/Kathmandu'))
@@ -1069,19 +1558,71 @@ class MainWindow(QMainWindow):
                 self.reminders.remove(reminder)
 
         if due_reminders:
-            for reminder in due_reminders:
-                self.trigger_reminder_alert(reminder)
+            self.trigger_reminder_alerts(due_reminders, now)
             self.settings_manager.save_reminders(self.reminders)
 
-    def trigger_reminder_alert(self, reminder):
+    def trigger_reminder_alerts(self, due_reminders, now):
+        # Reminders that were missed while the machine slept or the app was closed arrive all at
+        # once; they are folded into a single list-backed alert according to the catch-up policy.
+        grace = timedelta(seconds=self.REMINDER_CATCHUP_GRACE_SECONDS)
+        due_reminders.sort(key=lambda r: r['time'])
+        overdue = [r for r in due_reminders if now - datetime.fromisoformat(r['time']) > grace]
+        fresh = [r for r in due_reminders if now - datetime.fromisoformat(r['time']) <= grace]
+
+        skipped_count = 0
+        entries = []
+        policy = self.settings_manager.get("reminder_catchup_policy")
+        if overdue and policy == "Fire Latest":
+            skipped_count = len(overdue) - 1
+            overdue = overdue[-1:]
+        if overdue and policy == "Summarize":
+            by_day = {}
+            for reminder in overdue:
+                by_day.setdefault(reminder['time'][:10], []).append(reminder['text'])
+            for day, texts in by_day.items():
+                preview = ", ".join(texts[:3]) + ("…" if len(texts) > 3 else "")
+                entries.append(f"{day} — missed {len(texts)}: {preview}")
+        else:
+            entries.extend(self._format_reminder_entry(r) for r in overdue)
+        entries.extend(self._format_reminder_entry(r) for r in fresh)
+
         QApplication.beep()
+        burst_alert_open = self.burst_alert is not None and self.burst_alert.isVisible()
+        # A single reminder gets the plain alert; a summary line stands for several.
+        if len(due_reminders) == 1 and not burst_alert_open:
+            self.trigger_reminder_alert(due_reminders[0])
+            return
 
-        alert = ReminderAlert(reminder['text'], self)
+        if not burst_alert_open:
+            self.burst_alert = ReminderBurstAlert(self, self.alert_blink_timer)
+            self.burst_alert.setStyleSheet(self.styleSheet())
+            self._show_alert(self.burst_alert)
+        self.burst_alert.add_entries(entries, len(due_reminders) - skipped_count, skipped_count)
+
+    def _format_reminder_entry(self, reminder):
+        dt = datetime.fromisoformat(reminder['time'])
+        return f"{dt.strftime('%Y-%m-%d %I:%M %p')} - {reminder['text']}"
+
+    def trigger_reminder_alert(self, reminder):
+        alert = ReminderAlert(reminder['text'], self, self.alert_blink_timer)
         alert.setStyleSheet(self.styleSheet())
+        self._show_alert(alert)
+
+    def _show_alert(self, alert):
+        alert.adjustSize()
         alert.move(self.screen().geometry().center() - alert.rect().center() + QPoint(len(self.active_alerts) * 20, len(self.active_alerts) * 20))
         alert.show()
         self.active_alerts.append(alert)
-        alert.finished.connect(lambda: self.active_alerts.remove(alert))
+        alert.finished.connect(lambda: self._on_alert_finished(alert))
+        if not self.alert_blink_timer.isActive():
+            self.alert_blink_timer.start(500)
+
+    def _on_alert_finished(self, alert):
+        self.active_alerts.remove(alert)
+        if alert is self.burst_alert:
+            self.burst_alert = None
+        if not self.active_alerts:
+            self.alert_blink_timer.stop()
 
     def create_system_tray_icon(self):
         icon_path = "src/ui/icon.png"
@@ -1123,6 +1664,7 @@ class MainWindow(QMainWindow):
         elif placement == "Bottom-Left":
             self.move(10, screen_geo.height() - widget_size.height() - 40)
     
+    @traced("apply_theme")
     def apply_theme(self):
         theme = self.settings_manager.get("theme")
         self.setStyleSheet(DARK_THEME_STYLESHEET if theme == "Dark" else LIGHT_THEME_STYLESHEET)
@@ -1146,10 +1688,15 @@ class MainWindow(QMainWindow):
     def trigger_sync(self, force=False):
         start = self.settings_manager.get("sync_start_year")
         end = self.settings_manager.get("sync_end_year")
-        self.start_sync_signal.emit(start, end, force)
+        self.data_manager.request_sync(start, end, force)
     
-    def update_sync_status(self, message): 
-        print(f"Sync: {message}")
+    def update_sync_status(self, detail):
+        if detail["total"]:
+            eta = detail["eta_seconds"]
+            eta_text = f", ETA {eta:.0f}s" if eta is not None and detail["completed"] < detail["total"] else ""
+            print(f"Sync [{detail['completed']}/{detail['total']}{eta_text}]: {detail['message']}")
+        else:
+            print(f"Sync: {detail['message']}")
     
     def on_sync_finished(self):
         print("Sync complete. Data reloaded.")
@@ -1159,6 +1706,19 @@ class MainWindow(QMainWindow):
             self.current_calendar_nep_month_index = today_data['nepali_month_index']
         self.update_date_display()
     
+    def on_month_synced(self, year, month_index):
+        if (year, month_index) == (self.current_calendar_nep_year, self.current_calendar_nep_month_index) and self.is_maximized_mode:
+            self.populate_calendar()
+
+    def on_year_reloaded(self, year):
+        # Only redraw what shows the reloaded year.
+        today_data = self.data_manager.get_data_for_date(self.today_gregorian_str)
+        if not today_data or today_data['nepali_year'] == year:
+            self.update_date_display()
+        elif year == self.current_calendar_nep_year and self.is_maximized_mode:
+            self.populate_calendar()
+
+    @traced("jump_to_today")
     def jump_to_today(self):
         today_data = self.data_manager.get_data_for_date(self.today_gregorian_str)
         if today_data:
@@ -1173,6 +1733,7 @@ class MainWindow(QMainWindow):
                     self.show_day_detail(widget.day_data, day_widget_ref=widget)
                     break
 
+    @traced("toggle_event_panel")
     def toggle_event_panel(self):
         self.is_event_panel_visible = not self.is_event_panel_visible
         
@@ -1192,6 +1753,8 @@ class MainWindow(QMainWindow):
         menu = QMenu(self)
         
         sync_action = menu.addAction("Force Resync")
+        cancel_sync_action = menu.addAction("Cancel Sync")
+        cancel_sync_action.setEnabled(self.data_manager.is_syncing)
         settings_action = menu.addAction("Settings...")
         about_action = menu.addAction("About MitiTithi...")
         menu.addSeparator()
@@ -1202,11 +1765,16 @@ class MainWindow(QMainWindow):
 
         tools_action = menu.addAction("Date Tools...")
         reminders_action = menu.addAction("Reminders...")
+        user_events_action = menu.addAction("My Events...")
+        diagnostics_action = menu.addAction("Sync Diagnostics...")
+        latency_action = menu.addAction("UI Latency...")
         
         action = menu.exec(self.settings_button.mapToGlobal(QPoint(0, self.settings_button.height())))
         
         if action == sync_action: 
             self.trigger_sync(force=True)
+        elif action == cancel_sync_action:
+            self.data_manager.cancel_sync()
         elif action == settings_action: 
             self.open_settings()
         elif action == about_action:
@@ -1219,6 +1787,12 @@ class MainWindow(QMainWindow):
             self.show_date_tools()
         elif action == reminders_action:
             self.show_reminders()
+        elif action == user_events_action:
+            self.show_user_events()
+        elif action == diagnostics_action:
+            self.show_sync_diagnostics()
+        elif action == latency_action:
+            self.show_ui_latency()
 
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.LeftButton and self.settings_manager.get("widget_placement") == "Free":
@@ -0,0 +1,123 @@
+import json
+import time
+import functools
+from collections import deque
+from PySide6.QtCore import QObject, QEvent, QTimer
+from PySide6.QtWidgets import QApplication
+
+# Latency of UI interactions, from the moment a traced entry point is called to the end of the
+# next frame painted after it returns. While a trace is open, an application-wide event filter
+# watches for the first Paint event; the frame is done once that event (and the rest of its
+# update pass) has been handled, which a zero-length timer marks. Interactions that paint
+# nothing are closed after NO_FRAME_TIMEOUT_MS and recorded without a frame time.
+#
+# Disabled (the default), a traced method costs one attribute check and no event filter is
+# installed. Set MITITITHI_TRACE_UI=1 or tick the box in the UI Latency dialog to enable it.
+class InteractionTracer(QObject):
+    NO_FRAME_TIMEOUT_MS = 1000
+
+    def __init__(self, capacity=1000):
+        super().__init__()
+        self.enabled = False
+        self.samples = deque(maxlen=capacity)
+        self._depth = 0
+        self._pending = []
+        self._waiting_for_frame = False
+        self._no_frame_timer = None
+
+    def set_enabled(self, enabled):
+        app = QApplication.instance()
+        if enabled == self.enabled or app is None:
+            return
+        self.enabled = enabled
+        if enabled:
+            self._no_frame_timer = QTimer(self)
+            self._no_frame_timer.setSingleShot(True)
+            self._no_frame_timer.timeout.connect(self._close_without_frame)
+            app.installEventFilter(self)
+        else:
+            app.removeEventFilter(self)
+            self._no_frame_timer.stop()
+            self._pending = []
+
+    def clear(self):
+        self.samples.clear()
+
+    def begin(self, name):
+        # Nested entry points (jump_to_today opening a day detail) belong to the outer one.
+        self._depth += 1
+        if self._depth > 1:
+            return None
+        return name, time.perf_counter()
+
+    def end(self, token):
+        self._depth -= 1
+        if token is None:
+            return
+        name, started = token
+        self._pending.append((name, started, time.perf_counter() - started))
+        self._no_frame_timer.start(self.NO_FRAME_TIMEOUT_MS)
+
+    def eventFilter(self, watched, event):
+        if self._pending and not self._waiting_for_frame and event.type() == QEvent.Paint:
+            self._waiting_for_frame = True
+            QTimer.singleShot(0, self._close_with_frame)
+        return False
+
+    def _close_with_frame(self):
+        self._waiting_for_frame = False
+        self._close(time.perf_counter())
+
+    def _close_without_frame(self):
+        self._close(None)
+
+    def _close(self, frame_at):
+        pending, self._pending = self._pending, []
+        self._no_frame_timer.stop()
+        wall_time = time.time()
+        for name, started, handler_seconds in pending:
+            self.samples.append({
+                "name": name, "time": wall_time, "handler_s": handler_seconds,
+                "frame_s": frame_at - started if frame_at is not None else None,
+            })
+
+    def summary(self):
+        # {name: stats} over the ring buffer, with exact percentiles of the frame times.
+        by_name = {}
+        for sample in self.samples:
+            by_name.setdefault(sample["name"], []).append(sample)
+        summary = {}
+        for name, samples in sorted(by_name.items()):
+            frames = sorted(sample["frame_s"] for sample in samples if sample["frame_s"] is not None)
+            handlers = sorted(sample["handler_s"] for sample in samples)
+            pick = lambda values, p: values[min(len(values) - 1, int(p / 100 * len(values)))] if values else None
+            summary[name] = {
+                "count": len(samples), "no_frame": len(samples) - len(frames),
+                "p50": pick(frames, 50), "p90": pick(frames, 90), "p99": pick(frames, 99),
+                "max": frames[-1] if frames else None, "handler_p50": pick(handlers, 50),
+            }
+        return summary
+
+    def to_dict(self):
+        return {"capacity": self.samples.maxlen, "summary": self.summary(), "samples": list(self.samples)}
+
+    def dump_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+tracer = InteractionTracer()
+
+def traced(name, with_argument=False):
+    # with_argument records methods like set_view_mode per value of their first argument.
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            token = tracer.begin(f"{name}({args[1]})" if with_argument and len(args) > 1 else name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.end(token)
+        return wrapper
+    return decorate
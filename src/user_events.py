@@ -0,0 +1,158 @@
+import os
+import csv
+import json
+import uuid
+from datetime import datetime
+from src.file_utils import atomic_write
+
+REPEAT_CHOICES = {"none": "Once", "yearly_bs": "Every year (B.S. date)", "yearly_ad": "Every year (A.D. date)"}
+
+# The user's own events (birthdays, company days), kept apart from the scraped data so a resync
+# never touches them. CalendarData merges them into its query results; nothing here refers to
+# the base records. Each edit rebuilds only this store's small index and saves its own file.
+class UserEventStore:
+    def __init__(self, path):
+        self.path = path
+        self.events = []
+        self.version = 0
+        self._by_date = {}
+        self._by_ad_day = {}
+        self._by_bs_day = {}
+        self.load()
+
+    def __len__(self):
+        return len(self.events)
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.events = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.events = []
+        self._rebuild_index()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with atomic_write(self.path) as f:
+            json.dump(self.events, f, indent=4, ensure_ascii=False)
+
+    def _rebuild_index(self):
+        # A one-off event is keyed by its A.D. date, a yearly one by A.D. "MM-DD" or by B.S.
+        # (month index, day). The new dicts are swapped in whole for readers on other threads.
+        by_date, by_ad_day, by_bs_day = {}, {}, {}
+        for event in self.events:
+            if event['repeat'] == "yearly_ad":
+                by_ad_day.setdefault(event['date'][5:], []).append(event)
+            elif event['repeat'] == "yearly_bs":
+                by_bs_day.setdefault((event['bs_month_index'], event['bs_day']), []).append(event)
+            else:
+                by_date.setdefault(event['date'], []).append(event)
+        self._by_date, self._by_ad_day, self._by_bs_day = by_date, by_ad_day, by_bs_day
+        self.version += 1
+
+    def events_for(self, data):
+        date_str = data['gregorian_date']
+        found = list(self._by_date.get(date_str, ()))
+        # Yearly events start from the year they were added for (e.g. the date of birth).
+        for event in self._by_ad_day.get(date_str[5:], ()):
+            if event['date'] <= date_str:
+                found.append(event)
+        for event in self._by_bs_day.get((data['nepali_month_index'], data['nepali_day']), ()):
+            if event['date'] <= date_str:
+                found.append(event)
+        return found
+
+    def titles_for(self, data):
+        if not self.events:
+            return []
+        return [event['title'] for event in self.events_for(data)]
+
+    def add(self, title, date_str, repeat="none", nepali_data=None, save=True):
+        # nepali_data is the calendar record for date_str; yearly_bs events need it for their
+        # B.S. month and day. Returns the new event, or None if it cannot be placed.
+        if repeat not in REPEAT_CHOICES or not title:
+            return None
+        event = {"id": str(uuid.uuid4()), "title": title, "date": date_str, "repeat": repeat}
+        if repeat == "yearly_bs":
+            if not nepali_data:
+                return None
+            event["bs_month_index"] = nepali_data['nepali_month_index']
+            event["bs_day"] = nepali_data['nepali_day']
+        self.events.append(event)
+        self._rebuild_index()
+        if save:
+            self.save()
+        return event
+
+    def remove(self, event_id):
+        events = [event for event in self.events if event['id'] != event_id]
+        if len(events) == len(self.events):
+            return False
+        self.events = events
+        self._rebuild_index()
+        self.save()
+        return True
+
+    def _add_all(self, entries, calendar):
+        added = 0
+        for title, date_str, repeat in entries:
+            nepali_data = calendar.get_data_for_date(date_str) if calendar is not None else None
+            if self.add(title, date_str, repeat, nepali_data, save=False):
+                added += 1
+        if added:
+            self.save()
+        return added
+
+    def import_ics(self, text, calendar=None):
+        return self._add_all(parse_ics(text), calendar)
+
+    def import_csv(self, lines, calendar=None):
+        return self._add_all(parse_csv(lines), calendar)
+
+def _ics_unescape(text):
+    return text.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+def parse_ics(text):
+    # Yields (title, A.D. date, repeat) for each VEVENT; a yearly RRULE repeats on the A.D. date.
+    unfolded = []
+    for line in text.splitlines():
+        if line[:1] in (" ", "\t") and unfolded:
+            unfolded[-1] += line[1:]
+        else:
+            unfolded.append(line)
+    event = None
+    for line in unfolded:
+        name, _, value = line.partition(":")
+        name = name.split(";")[0].upper()
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {}
+        elif event is None:
+            continue
+        elif name == "DTSTART":
+            event["date"] = value[:8]
+        elif name == "SUMMARY":
+            event["title"] = _ics_unescape(value).strip()
+        elif name == "RRULE":
+            event["yearly"] = "FREQ=YEARLY" in value.upper()
+        elif name == "END" and value.upper() == "VEVENT":
+            try:
+                date_str = datetime.strptime(event.get("date", ""), "%Y%m%d").strftime("%Y-%m-%d")
+            except ValueError:
+                date_str = None
+            if date_str and event.get("title"):
+                yield event["title"], date_str, "yearly_ad" if event.get("yearly") else "none"
+            event = None
+
+def parse_csv(lines):
+    # Columns: date (A.D. YYYY-MM-DD), title and optionally repeat (none, yearly_ad, yearly_bs).
+    # A header row is skipped.
+    for row in csv.reader(lines):
+        if len(row) < 2:
+            continue
+        date_str, title = row[0].strip(), row[1].strip()
+        repeat = row[2].strip() if len(row) > 2 and row[2].strip() else "none"
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            continue
+        yield title, date_str, repeat
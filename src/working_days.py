@@ -0,0 +1,91 @@
+import bisect
+from array import array
+
+# Working day = not a Saturday and not flagged is_holiday. prefix[i] is the number of working
+# days among the first i loaded dates, so counting over a range is two lookups and stepping N
+# working days is a binary search over prefix.
+class WorkingDayCalendar:
+    def __init__(self):
+        self.dates = []
+        self.positions = {}
+        self.working = bytearray()
+        self.prefix = array('q', [0])
+
+    @staticmethod
+    def _is_working(data):
+        return not data.get('is_holiday') and data.get('weekday') != "Saturday"
+
+    def rebuild(self, sorted_dates, calendar_data):
+        # Builds into fresh containers and swaps them in at the end, since the GUI thread may be
+        # reading while the sync thread reloads.
+        working = bytearray(self._is_working(calendar_data[date_str]) for date_str in sorted_dates)
+        dates, positions = self.dates, self.positions
+        if sorted_dates == dates:
+            # Same days as before (the usual case after a sync): only the prefix sums from the
+            # first changed holiday flag onwards need recomputing.
+            first_change = next((i for i, (old, new) in enumerate(zip(self.working, working)) if old != new), None)
+            if first_change is None:
+                return 0
+            prefix = array('q', self.prefix)
+        else:
+            dates = list(sorted_dates)
+            positions = {date_str: i for i, date_str in enumerate(dates)}
+            prefix = array('q', [0]) * (len(dates) + 1)
+            first_change = 0
+
+        total = prefix[first_change]
+        for i in range(first_change, len(working)):
+            total += working[i]
+            prefix[i + 1] = total
+        self.dates, self.positions, self.working, self.prefix = dates, positions, working, prefix
+        return len(working) - first_change
+
+    def is_working_day(self, date_str):
+        position = self.positions.get(date_str)
+        return None if position is None else bool(self.working[position])
+
+    def working_days_between(self, start_date_str, end_date_str):
+        # Inclusive of both ends; negative when end comes before start. None if out of range.
+        start, end = self.positions.get(start_date_str), self.positions.get(end_date_str)
+        if start is None or end is None:
+            return None
+        if start > end:
+            return -(self.prefix[start + 1] - self.prefix[end])
+        return self.prefix[end + 1] - self.prefix[start]
+
+    def add_working_days(self, date_str, count):
+        # The count-th working day after (or before, for negative counts) date_str.
+        position = self.positions.get(date_str)
+        if position is None:
+            return None
+        if count == 0:
+            return date_str
+        target = self.prefix[position + 1] + count if count > 0 else self.prefix[position] + count + 1
+        if target <= 0:
+            return None
+        index = bisect.bisect_left(self.prefix, target) - 1
+        return self.dates[index] if index < len(self.dates) else None
+
+    def working_days_between_many(self, start_dates, end_dates):
+        import numpy as np
+        prefix = np.frombuffer(self.prefix, dtype=np.int64)
+        starts = np.array([self.positions.get(d, -1) for d in start_dates], dtype=np.int64)
+        ends = np.array([self.positions.get(d, -1) for d in end_dates], dtype=np.int64)
+        valid = (starts >= 0) & (ends >= 0)
+        low, high = np.minimum(starts, ends), np.maximum(starts, ends)
+        counts = prefix[np.where(valid, high, 0) + 1] - prefix[np.where(valid, low, 0)]
+        counts = np.where(starts > ends, -counts, counts)
+        return [int(c) if ok else None for c, ok in zip(counts, valid)]
+
+    def add_working_days_many(self, dates, counts):
+        import numpy as np
+        prefix = np.frombuffer(self.prefix, dtype=np.int64)
+        positions = np.array([self.positions.get(d, -1) for d in dates], dtype=np.int64)
+        counts = np.broadcast_to(np.asarray(counts, dtype=np.int64), positions.shape)
+        valid = positions >= 0
+        safe = np.where(valid, positions, 0)
+        targets = np.where(counts > 0, prefix[safe + 1] + counts, prefix[safe] + counts + 1)
+        indexes = np.searchsorted(prefix, targets, side='left') - 1
+        valid &= (targets > 0) & (indexes < len(self.dates))
+        indexes = np.where(counts == 0, safe, indexes)
+        return [self.dates[i] if ok else None for i, ok in zip(indexes.tolist(), valid.tolist())]